@@ -0,0 +1,291 @@
+"""
+Almacén local SQLite de issues, comentarios y commits
+Guarda los datos descargados en tablas normalizadas (un comentario es una
+fila, no parte de un texto unido) indexadas por repositorio, número,
+fecha de actualización, autor y estado. Los reportes y la interfaz pueden
+regenerarse con consultas locales en lugar de volver a descargar todo
+"""
+
+import os
+import sqlite3
+import threading
+
+from modelo import formatear_fecha, parsear_fecha
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    repo TEXT NOT NULL,
+    numero INTEGER NOT NULL,
+    es_pr INTEGER NOT NULL,
+    titulo TEXT,
+    cuerpo TEXT,
+    estado TEXT,
+    autor TEXT,
+    asignado TEXT,
+    creado TEXT,
+    actualizado TEXT,
+    cerrado TEXT,
+    url TEXT,
+    num_comentarios INTEGER,
+    PRIMARY KEY (repo, numero)
+);
+CREATE INDEX IF NOT EXISTS issues_actualizado ON issues (repo, actualizado);
+CREATE INDEX IF NOT EXISTS issues_estado ON issues (repo, estado);
+CREATE INDEX IF NOT EXISTS issues_autor ON issues (repo, autor);
+
+CREATE TABLE IF NOT EXISTS comentarios (
+    repo TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    numero INTEGER NOT NULL,
+    autor TEXT,
+    cuerpo TEXT,
+    creado TEXT,
+    actualizado TEXT,
+    PRIMARY KEY (repo, id)
+);
+CREATE INDEX IF NOT EXISTS comentarios_numero ON comentarios (repo, numero);
+CREATE INDEX IF NOT EXISTS comentarios_actualizado ON comentarios (repo, actualizado);
+CREATE INDEX IF NOT EXISTS comentarios_autor ON comentarios (repo, autor);
+
+CREATE TABLE IF NOT EXISTS commits (
+    repo TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    autor TEXT,
+    correo TEXT,
+    fecha TEXT,
+    committer TEXT,
+    correo_committer TEXT,
+    fecha_committer TEXT,
+    mensaje TEXT,
+    url TEXT,
+    agregadas INTEGER,
+    eliminadas INTEGER,
+    PRIMARY KEY (repo, sha)
+);
+-- Fecha del committer o, si falta, la del autor (como la sincronización incremental)
+CREATE INDEX IF NOT EXISTS commits_fecha ON commits (repo, COALESCE(fecha_committer, fecha));
+CREATE INDEX IF NOT EXISTS commits_autor ON commits (repo, autor);
+
+-- Marca de issues de la última ejecución completada: los hilos de
+-- comentarios guardados están al día para los items no actualizados después
+CREATE TABLE IF NOT EXISTS ejecuciones (
+    repo TEXT PRIMARY KEY,
+    marca TEXT
+);
+"""
+
+# Issues por consulta al leer hilos concretos (límite de parámetros de SQLite)
+BLOQUE_CONSULTA = 500
+
+
+def _login(usuario):
+    return usuario["login"] if usuario else None
+
+
+def _utc(fecha):
+    # Fechas guardadas en UTC con el formato de la API ("...Z"): así el texto
+    # se ordena como los instantes y MAX/ORDER BY no dependen del desfase
+    return formatear_fecha(parsear_fecha(fecha))
+
+
+def _agrupar_comentarios(filas, por_numero):
+    for fila in filas:
+        por_numero.setdefault(fila["numero"], []).append({
+            "id": fila["id"],
+            "user": {"login": fila["autor"]},
+            "body": fila["cuerpo"],
+            "created_at": fila["creado"],
+            "updated_at": fila["actualizado"]
+        })
+    return por_numero
+
+
+class AlmacenLocal:
+    def __init__(self, ruta):
+        """
+        Abre (o crea) la base de datos del almacén
+        Args:
+            ruta: Archivo SQLite; se comparte entre repositorios
+        """
+        os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+        self.ruta = ruta
+        # Una conexión compartida por los hilos de descarga, protegida por el lock
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.row_factory = sqlite3.Row
+        with self._lock, self._conexion:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.executescript(ESQUEMA)
+
+    def cerrar(self):
+        with self._lock:
+            self._conexion.close()
+
+    def _escribir(self, sql, filas, previo=None):
+        with self._lock, self._conexion:
+            if previo:
+                self._conexion.execute(*previo)
+            self._conexion.executemany(sql, filas)
+
+    def _consultar(self, sql, parametros):
+        with self._lock:
+            return self._conexion.execute(sql, parametros).fetchall()
+
+    # === ESCRITURA ===
+
+    def guardar_issues(self, repo, issues):
+        """Inserta o actualiza issues y PRs con la forma de la API REST"""
+        self._escribir("""
+            INSERT OR REPLACE INTO issues VALUES
+            (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", [
+            (repo, i["number"], "pull_request" in i, i["title"], i.get("body"),
+             i["state"], _login(i.get("user")), _login(i.get("assignee")),
+             _utc(i["created_at"]), _utc(i.get("updated_at")), _utc(i.get("closed_at")),
+             i["html_url"], i.get("comments"))
+            for i in issues])
+
+    def guardar_comentarios(self, repo, numero, comentarios, completo=True):
+        """
+        Guarda los comentarios de un issue
+        Con completo=True la lista es el hilo entero y reemplaza al guardado
+        (así desaparecen los comentarios borrados en GitHub)
+        """
+        previo = None
+        if completo:
+            previo = ("DELETE FROM comentarios WHERE repo = ? AND numero = ?", (repo, numero))
+        self._escribir("""
+            INSERT OR REPLACE INTO comentarios VALUES (?, ?, ?, ?, ?, ?, ?)""", [
+            (repo, c["id"], numero, _login(c.get("user")), c.get("body"),
+             _utc(c.get("created_at")), _utc(c.get("updated_at")))
+            for c in comentarios], previo)
+
+    def guardar_commits(self, repo, commits):
+        """Inserta o actualiza commits con la forma del endpoint /commits"""
+        filas = []
+        for commit in commits:
+            datos = commit["commit"]
+            autor = datos.get("author") or {}
+            committer = datos.get("committer") or {}
+            stats = commit.get("stats")
+            filas.append((
+                repo, commit["sha"], autor.get("name"), autor.get("email"), _utc(autor.get("date")),
+                committer.get("name"), committer.get("email"), _utc(committer.get("date")),
+                datos["message"], commit.get("html_url"),
+                stats["additions"] if stats else None, stats["deletions"] if stats else None))
+        self._escribir("""
+            INSERT OR REPLACE INTO commits VALUES
+            (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", filas)
+
+    # === LECTURA ===
+
+    def issues(self, repo, estado=None, autor=None):
+        """Issues y PRs con la forma de la API, en orden de creación"""
+        sql = "SELECT * FROM issues WHERE repo = ?"
+        parametros = [repo]
+        if estado:
+            sql += " AND estado = ?"
+            parametros.append(estado)
+        if autor:
+            sql += " AND autor = ?"
+            parametros.append(autor)
+        sql += " ORDER BY creado, numero"
+
+        issues = []
+        for fila in self._consultar(sql, parametros):
+            issue = {
+                "number": fila["numero"],
+                "title": fila["titulo"],
+                "body": fila["cuerpo"],
+                "state": fila["estado"],
+                "user": {"login": fila["autor"]} if fila["autor"] else None,
+                "assignee": {"login": fila["asignado"]} if fila["asignado"] else None,
+                "created_at": fila["creado"],
+                "updated_at": fila["actualizado"],
+                "closed_at": fila["cerrado"],
+                "html_url": fila["url"],
+                "comments": fila["num_comentarios"]
+            }
+            if fila["es_pr"]:
+                issue["pull_request"] = {}
+            issues.append(issue)
+        return issues
+
+    def comentarios(self, repo, numero=None):
+        """Comentarios agrupados por issue: {numero: [comentario, ...]}"""
+        sql = "SELECT * FROM comentarios WHERE repo = ?"
+        parametros = [repo]
+        if numero is not None:
+            sql += " AND numero = ?"
+            parametros.append(numero)
+        sql += " ORDER BY numero, creado, id"
+        return _agrupar_comentarios(self._consultar(sql, parametros), {})
+
+    def hilos(self, repo, numeros):
+        """Comentarios de los issues indicados, como comentarios(): {numero: [comentario, ...]}"""
+        numeros = list(numeros)
+        por_numero = {}
+        for inicio in range(0, len(numeros), BLOQUE_CONSULTA):
+            bloque = numeros[inicio:inicio + BLOQUE_CONSULTA]
+            sql = (f"SELECT * FROM comentarios WHERE repo = ? AND numero IN ({', '.join('?' * len(bloque))})"
+                   " ORDER BY numero, creado, id")
+            _agrupar_comentarios(self._consultar(sql, [repo, *bloque]), por_numero)
+        return por_numero
+
+    def commits(self, repo, autor=None):
+        """Commits con la forma del endpoint /commits, más recientes primero"""
+        sql = "SELECT * FROM commits WHERE repo = ?"
+        parametros = [repo]
+        if autor:
+            sql += " AND autor = ?"
+            parametros.append(autor)
+        sql += " ORDER BY COALESCE(fecha_committer, fecha) DESC, rowid"
+
+        commits = []
+        for fila in self._consultar(sql, parametros):
+            commit = {
+                "sha": fila["sha"],
+                "commit": {
+                    "message": fila["mensaje"],
+                    "author": {"name": fila["autor"], "email": fila["correo"],
+                               "date": fila["fecha"]}
+                },
+                "html_url": fila["url"]
+            }
+            if fila["committer"] or fila["fecha_committer"]:
+                commit["commit"]["committer"] = {
+                    "name": fila["committer"], "email": fila["correo_committer"],
+                    "date": fila["fecha_committer"]}
+            if fila["agregadas"] is not None:
+                commit["stats"] = {
+                    "additions": fila["agregadas"],
+                    "deletions": fila["eliminadas"],
+                    "total": fila["agregadas"] + fila["eliminadas"]
+                }
+            commits.append(commit)
+        return commits
+
+    def marcas(self, repo):
+        """
+        Última fecha de actualización guardada de cada tabla (en UTC), para pedir
+        a la API solo lo posterior: {"issues": ..., "commits": ..., "comentarios": ...}
+        """
+        consultas = {
+            "issues": "SELECT MAX(actualizado) FROM issues WHERE repo = ?",
+            "commits": "SELECT MAX(COALESCE(fecha_committer, fecha)) FROM commits WHERE repo = ?",
+            "comentarios": "SELECT MAX(actualizado) FROM comentarios WHERE repo = ?"
+        }
+        return {clave: self._consultar(sql, (repo,))[0][0] for clave, sql in consultas.items()}
+
+    def registrar_ejecucion(self, repo):
+        """
+        Anota que una ejecución terminó: todos los hilos de los issues
+        guardados hasta la marca actual de issues están en el almacén
+        """
+        self._escribir("""
+            INSERT OR REPLACE INTO ejecuciones
+            SELECT ?, MAX(actualizado) FROM issues WHERE repo = ?""", [(repo, repo)])
+
+    def ultima_ejecucion(self, repo):
+        """Marca de issues de la última ejecución completada (None si no hay)"""
+        filas = self._consultar("SELECT marca FROM ejecuciones WHERE repo = ?", (repo,))
+        return filas[0][0] if filas else None
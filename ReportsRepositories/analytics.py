@@ -16,21 +16,55 @@ from datetime import datetime, timedelta
 import os
 from collections import Counter
 import re
+from referencias import extraer_referencias, OTRO_REPO
+from modelo import DatasetReporte
+
+# Las instantáneas Parquet necesitan pyarrow (dependencia opcional)
+try:
+    import pyarrow.parquet as pq
+    PARQUET_DISPONIBLE = True
+except ImportError:
+    PARQUET_DISPONIBLE = False
+
+# Columnas de listas: se leen directamente como listas de Python
+COLUMNAS_LISTA = ('Etiquetas_Lista', 'Autores_Lista', 'Issues')
+
+
+def _escribir_parquet(df, ruta):
+    # Escritura atómica: una instantánea a medias no debe reemplazar a la anterior
+    temporal = f"{ruta}.tmp"
+    df.to_parquet(temporal, index=False)
+    os.replace(temporal, ruta)
+
+
+def _leer_parquet(ruta):
+    tabla = pq.read_table(ruta)
+    # pandas las convertiría en arrays de numpy, que no se comportan como listas
+    listas = [c for c in COLUMNAS_LISTA if c in tabla.column_names]
+    df = tabla.drop_columns(listas).to_pandas()
+    for columna in listas:
+        df[columna] = tabla.column(columna).to_pylist()
+    return df[tabla.column_names]
 
 # Configurar estilo para matplotlib
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
 class GitHubAnalytics:
-    def __init__(self, data=None):
+    def __init__(self, data=None, commits=None, repo=None):
         """
         Inicializa el analizador con datos de issues y PRs
         Args:
-            data: Lista de diccionarios con información de issues/PRs (opcional)
+            data: DatasetReporte, filas del reporte o lista de diccionarios
+                  con información de issues/PRs (opcional)
+            commits: Commits con forma de la API; con stats (git --numstat o
+                     historial GraphQL) se calculan líneas agregadas/eliminadas
+            repo: Repositorio usuario/repositorio para resolver referencias
         """
         self.df = None
         if data:
             self.df = self.prepare_data(data)
+        self.df_commits = self.preparar_commits(commits, repo) if commits else pd.DataFrame()
     
     def prepare_data(self, data=None):
         """Prepara y limpia los datos para análisis"""
@@ -38,7 +72,8 @@ class GitHubAnalytics:
             return pd.DataFrame()
         
         if data:
-            df = pd.DataFrame(data)
+            # Copia superficial: las columnas nuevas no tocan el dataset compartido
+            df = DatasetReporte.desde(data).df.copy(deep=False)
         else:
             df = self.df.copy() if self.df is not None else pd.DataFrame()
         
@@ -62,10 +97,10 @@ class GitHubAnalytics:
                 df[new_col] = df[old_col]
         
         # Convertir fechas a datetime (sin timezone para compatibilidad con Excel)
-        if 'Creado' in df.columns:
-            df['Creado'] = pd.to_datetime(df['Creado'], errors='coerce', utc=True).dt.tz_localize(None)
-        if 'Cerrado' in df.columns:
-            df['Cerrado'] = pd.to_datetime(df['Cerrado'], errors='coerce', utc=True).dt.tz_localize(None)
+        # (el dataset ya las trae convertidas; solo columnas de otros orígenes)
+        for columna in ('Creado', 'Cerrado'):
+            if columna in df.columns and not pd.api.types.is_datetime64_any_dtype(df[columna]):
+                df[columna] = pd.to_datetime(df[columna], errors='coerce', utc=True).dt.tz_localize(None)
         
         # Calcular tiempo de resolución en días
         if 'Creado' in df.columns and 'Cerrado' in df.columns:
@@ -90,6 +125,107 @@ class GitHubAnalytics:
         
         return df
     
+    def save_snapshot(self, directorio):
+        """
+        Guarda el DataFrame preparado (con las columnas derivadas) y la tabla
+        de commits en Parquet, para reabrirlos sin API ni prepare_data
+        Returns:
+            Carpeta de la instantánea
+        """
+        if not PARQUET_DISPONIBLE:
+            raise ImportError("Las instantáneas Parquet necesitan pyarrow: pip install pyarrow")
+        os.makedirs(directorio, exist_ok=True)
+        _escribir_parquet(self.df, os.path.join(directorio, "items.parquet"))
+        ruta_commits = os.path.join(directorio, "commits.parquet")
+        if not self.df_commits.empty:
+            _escribir_parquet(self.df_commits, ruta_commits)
+        elif os.path.exists(ruta_commits):
+            # No dejar commits de una instantánea anterior
+            os.remove(ruta_commits)
+        return directorio
+
+    @classmethod
+    def load_snapshot(cls, directorio):
+        """Crea un analizador con los DataFrames ya preparados de una instantánea"""
+        if not PARQUET_DISPONIBLE:
+            raise ImportError("Las instantáneas Parquet necesitan pyarrow: pip install pyarrow")
+        analytics = cls()
+        analytics.df = _leer_parquet(os.path.join(directorio, "items.parquet"))
+        ruta_commits = os.path.join(directorio, "commits.parquet")
+        if os.path.exists(ruta_commits):
+            analytics.df_commits = _leer_parquet(ruta_commits)
+        return analytics
+
+    def preparar_commits(self, commits, repo=None):
+        """
+        Construye una tabla columnar de commits: una columna por campo en
+        lugar de un diccionario por commit, lista para agrupar sin bucles
+        """
+        shas, autores, fechas, agregadas, eliminadas, con_stats, issues = [], [], [], [], [], [], []
+        for commit in commits:
+            datos = commit["commit"]
+            stats = commit.get("stats")
+            shas.append(commit["sha"])
+            autores.append(datos["author"]["name"])
+            fechas.append(datos["author"]["date"])
+            con_stats.append(stats is not None)
+            agregadas.append(stats["additions"] if stats else 0)
+            eliminadas.append(stats["deletions"] if stats else 0)
+            issues.append([
+                int(clave) for clave, tipo in extraer_referencias(datos["message"], repo).items()
+                if tipo != OTRO_REPO])
+
+        df = pd.DataFrame({
+            'SHA': shas,
+            'Autor': autores,
+            'Fecha': pd.to_datetime(fechas, errors='coerce', utc=True).tz_localize(None),
+            'Agregadas': np.array(agregadas, dtype=np.int64),
+            'Eliminadas': np.array(eliminadas, dtype=np.int64),
+            'Con_Estadisticas': np.array(con_stats, dtype=bool),
+            'Issues': issues
+        })
+        df['Cambios'] = df['Agregadas'] + df['Eliminadas']
+        df['Mes_Año'] = df['Fecha'].dt.to_period('M')
+        return df
+
+    def _commits_con_estadisticas(self):
+        if self.df_commits.empty:
+            return self.df_commits
+        return self.df_commits[self.df_commits['Con_Estadisticas']]
+
+    @staticmethod
+    def _agregar_churn(agrupado):
+        return agrupado.agg(
+            Commits=('SHA', 'size'),
+            Agregadas=('Agregadas', 'sum'),
+            Eliminadas=('Eliminadas', 'sum'),
+            Cambios=('Cambios', 'sum'))
+
+    def churn_por_autor(self):
+        """Commits y líneas agregadas/eliminadas por autor, de mayor a menor"""
+        commits = self._commits_con_estadisticas()
+        if commits.empty:
+            return pd.DataFrame()
+        return self._agregar_churn(commits.groupby('Autor')).sort_values('Cambios', ascending=False)
+
+    def churn_por_mes(self):
+        """Commits y líneas agregadas/eliminadas por mes"""
+        commits = self._commits_con_estadisticas()
+        if commits.empty:
+            return pd.DataFrame()
+        return self._agregar_churn(commits.groupby('Mes_Año')).sort_index()
+
+    def churn_por_issue(self):
+        """Commits y líneas cambiadas por issue/PR vinculado, de mayor a menor"""
+        commits = self._commits_con_estadisticas()
+        if commits.empty:
+            return pd.DataFrame()
+        vinculados = commits.explode('Issues').dropna(subset=['Issues'])
+        if vinculados.empty:
+            return pd.DataFrame()
+        vinculados = vinculados.astype({'Issues': np.int64})
+        return self._agregar_churn(vinculados.groupby('Issues')).sort_values('Cambios', ascending=False)
+
     def _extraer_etiquetas(self, row):
         """Extrae etiquetas del título o descripción"""
         etiquetas = []
@@ -255,6 +391,7 @@ class GitHubAnalytics:
                         <h2>📋 Issues vs Pull Requests</h2>
                         <div id="tipos">{fig_tipos.to_html(include_plotlyjs=False, div_id="tipos")}</div>
                     </div>
+                    {self._generar_paneles_churn()}
                 </div>
             </div>
         </body>
@@ -268,6 +405,31 @@ class GitHubAnalytics:
         
         return dashboard_path
     
+    def _generar_paneles_churn(self):
+        """Paneles de líneas cambiadas; vacío si los commits no traen estadísticas"""
+        if self._commits_con_estadisticas().empty:
+            return ""
+
+        fig_mensual = self.grafico_churn_mensual()
+        fig_autores = self.grafico_churn_autores()
+        fig_issues = self.grafico_churn_issues()
+        return f"""
+                    <div class="chart-container full-width">
+                        <h2>🧮 Líneas Cambiadas por Mes</h2>
+                        <div id="churn_mensual">{fig_mensual.to_html(include_plotlyjs=False, div_id="churn_mensual")}</div>
+                    </div>
+
+                    <div class="chart-container">
+                        <h2>✍️ Líneas Cambiadas por Autor</h2>
+                        <div id="churn_autores">{fig_autores.to_html(include_plotlyjs=False, div_id="churn_autores")}</div>
+                    </div>
+
+                    <div class="chart-container">
+                        <h2>🔗 Issues con Más Cambios</h2>
+                        <div id="churn_issues">{fig_issues.to_html(include_plotlyjs=False, div_id="churn_issues")}</div>
+                    </div>
+        """
+
     def _generar_estadisticas_resumen(self):
         """Genera las estadísticas de resumen para el dashboard"""
         total_items = len(self.df)
@@ -531,6 +693,92 @@ class GitHubAnalytics:
         
         return fig
     
+    def grafico_churn_mensual(self):
+        """Genera gráfico de líneas agregadas y eliminadas por mes"""
+        churn = self.churn_por_mes()
+        if churn.empty:
+            return go.Figure()
+
+        meses = churn.index.astype(str)
+        fig = go.Figure()
+        fig.add_trace(go.Bar(x=meses, y=churn['Agregadas'], name='Agregadas',
+                             marker_color='#27ae60'))
+        fig.add_trace(go.Bar(x=meses, y=-churn['Eliminadas'], name='Eliminadas',
+                             marker_color='#e74c3c', customdata=churn['Eliminadas'],
+                             hovertemplate='%{customdata}'))
+        fig.add_trace(go.Scatter(x=meses, y=churn['Commits'], name='Commits',
+                                 mode='lines+markers', yaxis='y2',
+                                 line=dict(color='#3498db', width=2)))
+
+        fig.update_layout(
+            title="Líneas Agregadas y Eliminadas por Mes",
+            xaxis_title="Mes",
+            yaxis_title="Líneas",
+            yaxis2=dict(title="Commits", overlaying='y', side='right'),
+            barmode='relative',
+            hovermode='x unified',
+            template='plotly_white',
+            height=400
+        )
+
+        return fig
+
+    def grafico_churn_autores(self, top_n=10):
+        """Genera gráfico de líneas cambiadas por los autores más activos"""
+        churn = self.churn_por_autor().head(top_n)
+        if churn.empty:
+            return go.Figure()
+
+        fig = go.Figure()
+        fig.add_trace(go.Bar(x=churn.index, y=churn['Agregadas'], name='Agregadas',
+                             marker_color='#27ae60'))
+        fig.add_trace(go.Bar(x=churn.index, y=churn['Eliminadas'], name='Eliminadas',
+                             marker_color='#e74c3c'))
+
+        fig.update_layout(
+            title=f"Top {top_n} Autores por Líneas Cambiadas",
+            xaxis_title="Autores",
+            yaxis_title="Líneas",
+            barmode='stack',
+            template='plotly_white',
+            height=400
+        )
+
+        return fig
+
+    def grafico_churn_issues(self, top_n=10):
+        """Genera gráfico de los issues/PRs cuyos commits cambiaron más líneas"""
+        churn = self.churn_por_issue().head(top_n)
+        if churn.empty:
+            return go.Figure()
+
+        # Mostrar el título del issue si está en los datos cargados
+        titulos = {}
+        if self.df is not None and {'ID', 'Titulo'} <= set(self.df.columns):
+            titulos = dict(zip(self.df['ID'], self.df['Titulo']))
+        etiquetas = [f"#{numero} {titulos.get(numero, '')}".strip()[:50] for numero in churn.index]
+
+        fig = go.Figure(data=[
+            go.Bar(
+                y=etiquetas,
+                x=churn['Cambios'],
+                orientation='h',
+                text=churn['Commits'].astype(str) + ' commits',
+                textposition='auto',
+                marker_color='#9b59b6'
+            )
+        ])
+
+        fig.update_layout(
+            title=f"Top {top_n} Issues por Líneas Cambiadas",
+            xaxis_title="Líneas cambiadas",
+            yaxis=dict(autorange='reversed'),
+            template='plotly_white',
+            height=400
+        )
+
+        return fig
+
     def filter_data(self, data, filters):
         """Filtrar datos según criterios especificados"""
         # Preparar DataFrame si es necesario
@@ -647,6 +895,16 @@ class GitHubAnalytics:
           # Período de datos
         fecha_min = self.df['Creado'].min() if 'Creado' in self.df.columns else None
         fecha_max = self.df['Creado'].max() if 'Creado' in self.df.columns else None
+
+        # Líneas cambiadas (solo con commits que traen estadísticas)
+        commits = self._commits_con_estadisticas()
+        churn = {}
+        if not commits.empty:
+            churn = {
+                'lineas_agregadas': int(commits['Agregadas'].sum()),
+                'lineas_eliminadas': int(commits['Eliminadas'].sum()),
+                'commits_analizados': len(commits)
+            }
         
         return {
             'total_items': total_items,
@@ -661,5 +919,6 @@ class GitHubAnalytics:
             'contribuidores_unicos': contribuidores_unicos,
             'fecha_min': fecha_min.strftime('%Y-%m-%d') if fecha_min else None,
             'fecha_max': fecha_max.strftime('%Y-%m-%d') if fecha_max else None,
-            'periodo_dias': (fecha_max - fecha_min).days if fecha_min and fecha_max else 0
+            'periodo_dias': (fecha_max - fecha_min).days if fecha_min and fecha_max else 0,
+            **churn
         }
@@ -6,9 +6,9 @@ import threading
 from pathlib import Path
 import subprocess
 from datetime import datetime, timedelta
-import numpy as np
 import reporte_issues
 from analytics import GitHubAnalytics
+from modelo import DatasetReporte
 
 ctk.set_appearance_mode("system")  # Puede ser "dark", "light" o "system"
 ctk.set_default_color_theme("blue")
@@ -199,7 +199,7 @@ class GithubReportApp(ctk.CTk):
             sticky="w")
         ctk.CTkLabel(
             form,
-            text="Para PDF: pip install reportlab markdown2",
+            text="Para PDF: pip install reportlab",
             text_color="#888").grid(
             row=3,
             column=2,
@@ -266,6 +266,15 @@ class GithubReportApp(ctk.CTk):
             side="left",
             padx=10,
             pady=10)
+        ctk.CTkButton(
+            control_frame,
+            text="⚡ Abrir Instantánea",
+            command=self.load_snapshot_data,
+            fg_color="#6a1b9a",
+            hover_color="#4a148c").pack(
+            side="left",
+            padx=10,
+            pady=10)
         ctk.CTkButton(
             control_frame,
             text="📈 Generar Dashboard",
@@ -809,7 +818,7 @@ Especifique el repositorio como 'usuario/repositorio':
 ## 🛠️ Problemas comunes
 
 ### Para PDFs:
-pip install reportlab markdown2
+pip install reportlab
 
 ### Para Analytics:
 pip install matplotlib seaborn plotly numpy
@@ -846,15 +855,22 @@ Para más información, consulte README.md o REPORTLAB_INSTRUCCIONES.md.
             # Configurar variables de entorno
             os.environ["GITHUB_TOKEN"] = self.github_token.get()
             os.environ["REPO"] = self.repo.get()
+            reporte_issues.configurar_cliente(
+                self.github_token.get(), self.repo.get())
 
-            # Obtener datos
-            issues_y_prs = reporte_issues.obtener_issues_y_prs()
-            commits = reporte_issues.obtener_commits()
-            self.datos_actuales = reporte_issues.procesar_reporte(
-                issues_y_prs, commits)
+            # Obtener datos (del almacén local si se trabaja sin conexión)
+            if reporte_issues.SIN_CONEXION:
+                issues_y_prs, commits, comentarios = reporte_issues.leer_almacen()
+            else:
+                issues_y_prs = reporte_issues.obtener_issues_y_prs()
+                commits = reporte_issues.obtener_commits()
+                comentarios = None
+            self.datos_actuales = DatasetReporte(reporte_issues.procesar_reporte(
+                issues_y_prs, commits, comentarios=comentarios))
+            reporte_issues.finalizar_punto_control()
 
-            # Inicializar analytics
-            self.analytics = GitHubAnalytics(self.datos_actuales)
+            # Inicializar analytics sobre el mismo dataset
+            self.analytics = self.preparar_analytics(commits)
 
             # Actualizar estadísticas
             self.update_quick_stats()
@@ -888,45 +904,54 @@ Para más información, consulte README.md o REPORTLAB_INSTRUCCIONES.md.
             messagebox.showerror(
                 "Error", f"No se pudieron cargar los datos: {e}")
 
+    def preparar_analytics(self, commits):
+        """Prepara analytics sobre el dataset actual y guarda la instantánea"""
+        analytics = None
+        if reporte_issues.GUARDAR_SNAPSHOT:
+            analytics = reporte_issues.guardar_snapshot(
+                self.datos_actuales, commits, self.repo.get())
+        return analytics or GitHubAnalytics(
+            self.datos_actuales, commits=commits, repo=self.repo.get())
+
+    def load_snapshot_data(self):
+        """Abrir la última instantánea guardada sin llamar a la API"""
+        if not self.repo.get():
+            messagebox.showerror(
+                "Error", "Debe configurar el repositorio primero.")
+            return
+
+        try:
+            snapshot = reporte_issues.cargar_snapshot(self.repo.get())
+            if snapshot is None:
+                messagebox.showwarning(
+                    "Advertencia",
+                    "No hay una instantánea guardada para este repositorio (requiere pyarrow).")
+                return
+            self.datos_actuales, self.analytics = snapshot
+            self.update_quick_stats()
+            self.status_text.set(
+                f"Instantánea cargada: {len(self.datos_actuales)} elementos.")
+            self.progress.set(1.0)
+        except Exception as e:
+            self.status_text.set(f"Error al abrir la instantánea: {e}")
+            messagebox.showerror(
+                "Error", f"No se pudo abrir la instantánea: {e}")
+
     def update_quick_stats(self):
         """Actualizar estadísticas rápidas"""
         if not self.datos_actuales:
             return
 
-        issues = [d for d in self.datos_actuales if d.get("Tipo") == "Issue"]
-        prs = [d for d in self.datos_actuales if d.get(
-            "Tipo") == "Pull Request"]
-
-        # Contar contribuyentes únicos
-        autores = set()
-        for item in self.datos_actuales:
-            if item.get("Autor"):
-                autores.add(item["Autor"])
-
-        # Calcular tiempo promedio de resolución
-        tiempos_resolucion = []
-        for item in self.datos_actuales:
-            if item.get("Estado") == "closed" and item.get(
-                    "Fecha_Cerrado") and item.get("Fecha_Creacion"):
-                try:
-                    creado = datetime.fromisoformat(
-                        item["Fecha_Creacion"].replace('Z', '+00:00'))
-                    cerrado = datetime.fromisoformat(
-                        item["Fecha_Cerrado"].replace('Z', '+00:00'))
-                    dias = (cerrado - creado).days
-                    if dias >= 0:
-                        tiempos_resolucion.append(dias)
-                except BaseException:
-                    continue
-
-        avg_resolution = np.mean(
-            tiempos_resolucion) if tiempos_resolucion else 0
+        # Se calculan sobre el DataFrame del dataset, sin recorrer las filas
+        stats = self.analytics.obtener_estadisticas_resumen() if self.analytics else {}
 
         # Actualizar variables
-        self.total_issues_var.set(str(len(issues)))
-        self.total_prs_var.set(str(len(prs)))
-        self.active_contributors_var.set(str(len(autores)))
-        self.avg_resolution_time_var.set(f"{avg_resolution:.1f} días")
+        self.total_issues_var.set(str(stats.get('total_issues', 0)))
+        self.total_prs_var.set(str(stats.get('total_prs', 0)))
+        self.active_contributors_var.set(
+            str(stats.get('contribuidores_unicos', 0)))
+        self.avg_resolution_time_var.set(
+            f"{stats.get('tiempo_promedio_resolucion', 0):.1f} días")
 
     def generate_dashboard(self):
         """Generar dashboard interactivo"""
@@ -1201,6 +1226,8 @@ Para más información, consulte README.md o REPORTLAB_INSTRUCCIONES.md.
         os.environ["GITHUB_TOKEN"] = self.github_token.get()
         os.environ["REPO"] = self.repo.get()
         os.environ["ENABLE_PDF"] = "true" if self.enable_pdf.get() else "false"
+        reporte_issues.configurar_cliente(
+            self.github_token.get(), self.repo.get())
         os.makedirs(self.output_dir.get(), exist_ok=True)
         self.status_text.set("Generando reportes... Por favor espere.")
         self.progress.set(0.2)
@@ -1210,25 +1237,35 @@ Para más información, consulte README.md o REPORTLAB_INSTRUCCIONES.md.
 
     def run_report_generation(self):
         try:
-            self.after(0, lambda: self.update_status(
-                "Obteniendo issues y PRs..."))
-            issues_y_prs = reporte_issues.obtener_issues_y_prs()
-            self.after(0, lambda: self.update_status("Obteniendo commits..."))
-            commits = reporte_issues.obtener_commits()
+            comentarios = None
+            if reporte_issues.SIN_CONEXION:
+                self.after(0, lambda: self.update_status(
+                    "Leyendo el almacén local..."))
+                issues_y_prs, commits, comentarios = reporte_issues.leer_almacen()
+            else:
+                self.after(0, lambda: self.update_status(
+                    "Obteniendo issues y PRs..."))
+                issues_y_prs = reporte_issues.obtener_issues_y_prs()
+                self.after(0, lambda: self.update_status("Obteniendo commits..."))
+                commits = reporte_issues.obtener_commits()
             self.after(0, lambda: self.update_status("Procesando datos..."))
-            filas = reporte_issues.procesar_reporte(issues_y_prs, commits)
+            filas = reporte_issues.procesar_reporte(
+                issues_y_prs, commits, comentarios=comentarios)
+            reporte_issues.finalizar_punto_control()
 
-            # Guardar datos para analytics
-            self.datos_actuales = filas
+            # Un único dataset para los reportes y para analytics
+            self.datos_actuales = DatasetReporte(filas)
 
             self.after(0, lambda: self.update_status("Generando Excel..."))
-            reporte_issues.generar_excel(filas)
+            reporte_issues.generar_excel(self.datos_actuales)
             self.after(0, lambda: self.update_status("Generando Markdown..."))
-            reporte_issues.generar_markdown(filas)
+            reporte_issues.generar_markdown(self.datos_actuales)
+            # Analytics reutiliza el dataset ya construido (y el PDF, sus estadísticas)
+            self.analytics = self.preparar_analytics(commits)
             if self.enable_pdf.get():
                 self.after(0, lambda: self.update_status("Generando PDF..."))
                 pdf_generado = reporte_issues.generar_pdf_desde_markdown(
-                    self.datos_actuales)
+                    self.datos_actuales, self.analytics)
                 if not pdf_generado:
                     self.after(
                         0,
@@ -1236,10 +1273,6 @@ Para más información, consulte README.md o REPORTLAB_INSTRUCCIONES.md.
                             "Advertencia",
                             "No se pudo generar el archivo PDF. Revise si tiene instalado ReportLab."))
 
-            # Generar analytics automáticamente si está disponible
-            if not self.analytics:
-                self.analytics = GitHubAnalytics()
-
             self.after(0, lambda: self.show_results(len(issues_y_prs), filas))
         except Exception as e:
             self.after(0, lambda: self.handle_error(str(e)))
@@ -1288,7 +1321,7 @@ Para más información, consulte README.md o REPORTLAB_INSTRUCCIONES.md.
                                  f"  - Excel: {os.path.join(self.output_dir.get(),
                                                             'reporte_completo.xlsx')}\n")
         self.results_area.insert(
-            "end", f"  - Markdown: {os.path.join(self.output_dir.get(), 'reporte_completo.md')}\n")
+            "end", f"  - Markdown: {reporte_issues.ruta_markdown(self.output_dir.get())}\n")
         if self.enable_pdf.get():
             self.results_area.insert(
                 "end", f"  - PDF: {os.path.join(self.output_dir.get(), 'reporte_completo.pdf')}\n")
@@ -1301,8 +1334,7 @@ Para más información, consulte README.md o REPORTLAB_INSTRUCCIONES.md.
                 file_path = os.path.join(
                     self.output_dir.get(), "reporte_completo.xlsx")
             elif file_type == "markdown":
-                file_path = os.path.join(
-                    self.output_dir.get(), "reporte_completo.md")
+                file_path = reporte_issues.ruta_markdown(self.output_dir.get())
             else:
                 file_path = os.path.join(
                     self.output_dir.get(), "reporte_completo.pdf")
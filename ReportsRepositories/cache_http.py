@@ -0,0 +1,109 @@
+"""
+Caché HTTP persistente en disco para las respuestas de la API de GitHub
+Guarda el cuerpo junto con ETag / Last-Modified para revalidar con
+peticiones condicionales, y expulsa las entradas menos usadas (LRU)
+cuando supera el tamaño máximo
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+# Cabeceras de la respuesta original que se conservan en la caché
+CABECERAS_GUARDADAS = ("Content-Type", "Link", "ETag", "Last-Modified")
+
+
+class CacheHTTP:
+    def __init__(self, directorio, max_bytes=200 * 1024 * 1024):
+        """
+        Inicializa la caché sobre un directorio
+        Args:
+            directorio: Carpeta donde se guardan las entradas
+            max_bytes: Tamaño máximo total antes de expulsar entradas
+        """
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directorio, exist_ok=True)
+
+        # Tamaño de cada entrada existente para controlar el total
+        self._tamanos = {}
+        for entrada in os.scandir(directorio):
+            if entrada.name.endswith(".json"):
+                self._tamanos[entrada.path] = entrada.stat().st_size
+        self._total = sum(self._tamanos.values())
+
+    def _ruta(self, url):
+        clave = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directorio, f"{clave}.json")
+
+    def leer(self, url):
+        """Devuelve la entrada guardada para la URL o None si no existe"""
+        ruta = self._ruta(url)
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                entrada = json.load(f)
+            # Actualizar la fecha de acceso para el orden LRU
+            os.utime(ruta)
+        except (OSError, ValueError):
+            return None
+        return entrada if entrada.get("url") == url else None
+
+    def guardar(self, url, respuesta):
+        """Guarda una respuesta 200 que trae ETag o Last-Modified"""
+        cabeceras = {
+            nombre: respuesta.headers[nombre]
+            for nombre in CABECERAS_GUARDADAS if nombre in respuesta.headers
+        }
+        if "ETag" not in cabeceras and "Last-Modified" not in cabeceras:
+            return
+
+        datos = json.dumps({
+            "url": url,
+            "cabeceras": cabeceras,
+            "contenido": respuesta.text
+        }).encode("utf-8")
+
+        ruta = self._ruta(url)
+        temporal = f"{ruta}.{threading.get_ident()}.tmp"
+        with open(temporal, "wb") as f:
+            f.write(datos)
+        os.replace(temporal, ruta)
+
+        with self._lock:
+            self._total += len(datos) - self._tamanos.get(ruta, 0)
+            self._tamanos[ruta] = len(datos)
+            if self._total > self.max_bytes:
+                self._expulsar()
+
+    def _expulsar(self):
+        """Elimina las entradas usadas hace más tiempo hasta bajar del 90% del límite"""
+        limite = self.max_bytes * 0.9
+        por_uso = []
+        for ruta in self._tamanos:
+            try:
+                por_uso.append((os.path.getmtime(ruta), ruta))
+            except OSError:
+                por_uso.append((0, ruta))
+        por_uso.sort()
+
+        for _, ruta in por_uso:
+            if self._total <= limite:
+                break
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+            self._total -= self._tamanos.pop(ruta)
+
+    def limpiar(self):
+        """Elimina todas las entradas de la caché"""
+        with self._lock:
+            for ruta in list(self._tamanos):
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    pass
+            self._tamanos.clear()
+            self._total = 0
@@ -0,0 +1,92 @@
+"""
+Puntos de control para reanudar descargas interrumpidas
+Guarda en disco cada página completada de los endpoints paginados y
+cada hilo de comentarios descargado, para que una ejecución reiniciada
+continúe donde se quedó la anterior
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+
+def _escribir_json(ruta, datos):
+    """Escribe un JSON de forma atómica (no deja archivos a medias)"""
+    temporal = f"{ruta}.{os.getpid()}.{time.monotonic_ns()}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(datos, f)
+    os.replace(temporal, ruta)
+
+
+def _leer_json(ruta):
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class PuntoControl:
+    def __init__(self, directorio, repo, max_horas=24):
+        """
+        Abre (o crea) el punto de control de un repositorio
+        Args:
+            directorio: Carpeta base de los puntos de control
+            repo: Repositorio en formato usuario/repositorio
+            max_horas: Antigüedad máxima para reanudar; uno más viejo se descarta
+        """
+        self.directorio = os.path.join(directorio, repo.replace("/", "__"))
+        self._ruta_meta = os.path.join(self.directorio, "meta.json")
+
+        meta = _leer_json(self._ruta_meta)
+        if meta and time.time() - meta.get("creado", 0) > max_horas * 3600:
+            # Datos demasiado antiguos para mezclarlos con los actuales
+            shutil.rmtree(self.directorio, ignore_errors=True)
+            meta = None
+
+        os.makedirs(os.path.join(self.directorio, "paginas"), exist_ok=True)
+        os.makedirs(os.path.join(self.directorio, "comentarios"), exist_ok=True)
+        if meta is None:
+            _escribir_json(self._ruta_meta, {"repo": repo, "creado": time.time()})
+
+    def anclar(self, nombre, valor):
+        """
+        Devuelve el valor guardado con ese nombre o, si aún no hay ninguno,
+        guarda y devuelve valor. Fija parámetros que deben repetirse igual
+        al reanudar (p. ej. el until de /commits)
+        """
+        meta = _leer_json(self._ruta_meta) or {}
+        anclas = meta.setdefault("anclas", {})
+        if nombre not in anclas:
+            anclas[nombre] = valor
+            _escribir_json(self._ruta_meta, meta)
+        return anclas[nombre]
+
+    def _ruta_pagina(self, clave, pagina):
+        endpoint = hashlib.sha1(clave.encode("utf-8")).hexdigest()
+        return os.path.join(self.directorio, "paginas", f"{endpoint}_{pagina}.json")
+
+    def leer_pagina(self, clave, pagina):
+        """Devuelve {"datos": [...], "ultima": n} de una página completada o None"""
+        return _leer_json(self._ruta_pagina(clave, pagina))
+
+    def guardar_pagina(self, clave, pagina, datos, ultima=None):
+        """Marca una página como completada junto con sus elementos"""
+        _escribir_json(self._ruta_pagina(clave, pagina), {"datos": datos, "ultima": ultima})
+
+    def _ruta_comentarios(self, numero):
+        return os.path.join(self.directorio, "comentarios", f"{numero}.json")
+
+    def leer_comentarios(self, numero):
+        """Devuelve el hilo de comentarios ya descargado o None"""
+        return _leer_json(self._ruta_comentarios(numero))
+
+    def guardar_comentarios(self, numero, comentarios):
+        """Marca el hilo de comentarios de un item como descargado"""
+        _escribir_json(self._ruta_comentarios(numero), comentarios)
+
+    def limpiar(self):
+        """Elimina el punto de control tras una ejecución completada"""
+        shutil.rmtree(self.directorio, ignore_errors=True)
@@ -0,0 +1,140 @@
+"""
+Control de límites de peticiones de la API de GitHub
+Sigue la cuota restante (X-RateLimit-*), adapta el número de peticiones
+simultáneas, espera al reinicio de la cuota cuando se agota y decide
+cuándo reintentar respuestas 403/429/5xx
+"""
+
+import random
+import threading
+import time
+
+# Códigos que se reintentan siempre (errores temporales del servidor)
+CODIGOS_REINTENTABLES = {429, 500, 502, 503, 504}
+# Cuota reservada antes de pausar: una fracción del límite (X-RateLimit-Limit),
+# como mucho RESERVA_MAXIMA; con 60 peticiones/hora sin token se reserva 1
+FRACCION_RESERVA = 0.02
+RESERVA_MAXIMA = 50
+
+
+class ControlLimites:
+    def __init__(self, max_concurrencia=16, reserva=None, max_reintentos=5, espera_base=1.0):
+        """
+        Inicializa el control de límites
+        Args:
+            max_concurrencia: Peticiones simultáneas con la cuota holgada
+            reserva: Cuota que se deja sin usar antes de pausar hasta el reinicio
+                (None: FRACCION_RESERVA del límite, como mucho RESERVA_MAXIMA)
+            max_reintentos: Reintentos por petición antes de rendirse
+            espera_base: Segundos de la primera espera del backoff exponencial
+        """
+        self.max_concurrencia = max_concurrencia
+        self.reserva = reserva
+        self.max_reintentos = max_reintentos
+        self.espera_base = espera_base
+
+        self.restantes = None
+        self.limite = None
+        self.reinicio = None
+        self.concurrencia = max_concurrencia
+        self._en_curso = 0
+        self._pausa_hasta = 0.0
+        self._condicion = threading.Condition()
+
+    def reserva_actual(self):
+        """Cuota que se deja sin usar según el límite conocido"""
+        if self.reserva is not None:
+            return self.reserva
+        if not self.limite:
+            return RESERVA_MAXIMA
+        return min(RESERVA_MAXIMA, int(self.limite * FRACCION_RESERVA))
+
+    def adquirir(self):
+        """Bloquea hasta que haya hueco y cuota para una nueva petición"""
+        with self._condicion:
+            while True:
+                espera = self._pausa_hasta - time.time()
+                if espera > 0:
+                    self._condicion.wait(timeout=espera)
+                    continue
+                if self._en_curso < self.concurrencia:
+                    self._en_curso += 1
+                    return
+                self._condicion.wait()
+
+    def liberar(self, respuesta=None):
+        """Registra el fin de una petición y actualiza la cuota conocida"""
+        with self._condicion:
+            self._en_curso -= 1
+            if respuesta is not None:
+                self._actualizar(respuesta)
+            self._condicion.notify_all()
+
+    def _actualizar(self, respuesta):
+        cabeceras = respuesta.headers
+        if "X-RateLimit-Remaining" in cabeceras:
+            self.restantes = int(cabeceras["X-RateLimit-Remaining"])
+        if "X-RateLimit-Limit" in cabeceras:
+            self.limite = int(cabeceras["X-RateLimit-Limit"])
+        if "X-RateLimit-Reset" in cabeceras:
+            self.reinicio = float(cabeceras["X-RateLimit-Reset"])
+
+        # Cuota casi agotada: pausar a todos hasta el reinicio
+        if (self.restantes is not None and self.restantes <= self.reserva_actual()
+                and self.reinicio and self.reinicio > time.time()):
+            self._pausa_hasta = max(self._pausa_hasta, self.reinicio + 1)
+
+        if self.es_limite_superado(respuesta):
+            # Límite secundario o cuota agotada: reducir a la mitad
+            self.concurrencia = max(1, self.concurrencia // 2)
+        elif self.restantes is not None and self.limite:
+            # Adaptar la concurrencia a la fracción de cuota que queda
+            fraccion = self.restantes / self.limite
+            if fraccion < 0.1:
+                objetivo = 1
+            elif fraccion < 0.25:
+                objetivo = max(1, self.max_concurrencia // 4)
+            else:
+                objetivo = self.max_concurrencia
+            # Subir de uno en uno tras una reducción, bajar de golpe
+            self.concurrencia = min(objetivo, self.concurrencia + 1)
+
+    @staticmethod
+    def es_limite_superado(respuesta):
+        """Indica si la respuesta es un rechazo por límite de peticiones"""
+        if respuesta.status_code == 429:
+            return True
+        if respuesta.status_code != 403:
+            return False
+        if "Retry-After" in respuesta.headers:
+            return True
+        if respuesta.headers.get("X-RateLimit-Remaining") == "0":
+            return True
+        return "rate limit" in respuesta.text.lower()
+
+    def debe_reintentar(self, respuesta, intento):
+        """Indica si una respuesta fallida debe reintentarse"""
+        if intento >= self.max_reintentos:
+            return False
+        return (respuesta.status_code in CODIGOS_REINTENTABLES
+                or self.es_limite_superado(respuesta))
+
+    def espera_reintento(self, respuesta, intento):
+        """
+        Calcula los segundos a esperar antes de reintentar
+        Usa Retry-After o el reinicio de la cuota si vienen en la respuesta
+        y si no, un backoff exponencial con jitter
+        """
+        if respuesta is not None:
+            retry_after = respuesta.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+            if (respuesta.headers.get("X-RateLimit-Remaining") == "0"
+                    and "X-RateLimit-Reset" in respuesta.headers):
+                return max(0.0, float(respuesta.headers["X-RateLimit-Reset"]) - time.time()) + 1
+        return self.espera_base * (2 ** intento) + random.uniform(0, self.espera_base)
+
+    def pausar(self, segundos):
+        """Detiene el envío de nuevas peticiones durante unos segundos"""
+        with self._condicion:
+            self._pausa_hasta = max(self._pausa_hasta, time.time() + segundos)
@@ -0,0 +1,252 @@
+"""
+Escritores de reportes que reciben las filas de una en una
+Permiten ir volcando el reporte mientras todavía se descargan datos
+"""
+
+import gzip
+import os
+from datetime import datetime, timezone
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+from modelo import COLUMNAS, Fila, parsear_fecha
+
+ENCABEZADO_MARKDOWN = "# Reporte de Issues y Pull Requests\n\n"
+# Búfer del archivo Markdown: las secciones se acumulan y se escriben en bloques
+BUFFER_MARKDOWN = 1024 * 1024
+
+# Hoja del reporte (el nombre que usaba pandas) y hoja auxiliar para textos largos
+HOJA_REPORTE = "Sheet1"
+HOJA_DESBORDAMIENTO = "Desbordamiento"
+# Máximo de caracteres por celda que admite Excel
+LIMITE_CELDA = 32767
+MARCA_DESBORDAMIENTO = f"… [texto completo en la hoja {HOJA_DESBORDAMIENTO}]"
+
+# Libro normalizado: cada hoja es una tabla filtrable y lista para tablas dinámicas
+HOJA_ITEMS = "Items"
+HOJA_COMENTARIOS = "Comentarios"
+HOJA_COMMITS = "Commits"
+HOJA_ENLACES = "Enlaces"
+COLUMNAS_ITEMS = (
+    "ID", "Tipo", "Título", "Descripción", "Estado", "Asignado a", "Creado",
+    "Cerrado", "Comentarios", "Commits", "URL"
+)
+COLUMNAS_COMENTARIOS = ("ID", "ID Item", "Autor", "Creado", "Texto")
+COLUMNAS_COMMITS = ("SHA", "Autor", "Fecha", "Mensaje", "Agregadas", "Eliminadas", "URL")
+COLUMNAS_ENLACES = ("ID Item", "SHA", "Tipo")
+
+
+def formatear_seccion_markdown(item):
+    """Devuelve la sección Markdown de un issue o pull request"""
+    return f"""
+## [{item['Tipo']} #{item['ID']}]({item['URL']}) - {item['Título']}
+
+**Estado:** {item['Estado']}
+**Asignado a:** {item['Asignado a']}
+**Creado:** {item['Creado']}
+**Cerrado:** {item['Cerrado']}
+
+### Descripción
+{item['Descripción']}
+
+### Commits Vinculados
+{item['Commits Vinculados']}
+
+### Autores de Commits
+{item['Autores Commits']}
+
+### Commits que lo Cierran
+{item['Commits de Cierre']}
+
+### Comentarios
+{item['Comentarios']}
+
+---
+
+"""
+
+
+def abrir_markdown(ruta, modo="r"):
+    """Abre un Markdown en modo texto, descomprimiéndolo si termina en .gz"""
+    if ruta.endswith(".gz"):
+        return gzip.open(ruta, modo + "t", encoding="utf-8")
+    return open(ruta, modo, encoding="utf-8", buffering=BUFFER_MARKDOWN)
+
+
+class EscritorMarkdown:
+    def __init__(self, ruta):
+        """
+        Abre el archivo Markdown y escribe el encabezado del reporte
+        Args:
+            ruta: Archivo de salida; si termina en .gz se escribe comprimido
+        """
+        os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+        self.ruta = ruta
+        self._archivo = abrir_markdown(ruta, "w")
+        self._archivo.write(ENCABEZADO_MARKDOWN)
+
+    def escribir(self, fila):
+        """Añade la sección de una fila (Fila o diccionario) al final del archivo"""
+        self._archivo.write(formatear_seccion_markdown(fila))
+
+    def escribir_todas(self, filas):
+        """Escribe las filas de cualquier iterable a medida que llegan"""
+        for fila in filas:
+            self.escribir(fila)
+
+    def cerrar(self):
+        self._archivo.close()
+
+
+class _HojaExcel:
+    def __init__(self, libro, nombre, columnas):
+        """Hoja de solo escritura con encabezado fijo y autofiltro sobre lo escrito"""
+        self.nombre = nombre
+        self.columnas = tuple(columnas)
+        self.hoja = libro.create_sheet(nombre)
+        self.hoja.freeze_panes = "A2"
+        encabezado = []
+        for titulo in self.columnas:
+            celda = WriteOnlyCell(self.hoja, value=titulo)
+            celda.font = Font(bold=True)
+            encabezado.append(celda)
+        self.hoja.append(encabezado)
+        self.filas = 1
+
+    def agregar(self, celdas):
+        self.hoja.append(celdas)
+        self.filas += 1
+
+    def cerrar(self):
+        if self.columnas:
+            self.hoja.auto_filter.ref = f"A1:{get_column_letter(len(self.columnas))}{self.filas}"
+
+
+class _LibroExcel:
+    def __init__(self, ruta):
+        """
+        Libro en modo de solo escritura de openpyxl: cada fila se vuelca a
+        disco al escribirla, sin mantener el libro en memoria
+        """
+        os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+        self.ruta = ruta
+        self._libro = Workbook(write_only=True)
+        self._hojas = []
+        self._desbordamiento = None
+
+    def _crear_hoja(self, nombre, columnas):
+        hoja = _HojaExcel(self._libro, nombre, columnas)
+        self._hojas.append(hoja)
+        return hoja
+
+    def _escribir(self, hoja, valores, id_fila=None):
+        hoja.agregar([
+            self._valor_celda(valor, hoja.nombre, columna, id_fila)
+            for valor, columna in zip(valores, hoja.columnas)])
+
+    def _valor_celda(self, valor, nombre_hoja, columna, id_fila):
+        if isinstance(valor, datetime):
+            # Excel no admite zonas horarias: las fechas van en UTC sin zona
+            if valor.tzinfo is not None:
+                valor = valor.astimezone(timezone.utc).replace(tzinfo=None)
+            return valor
+        if not isinstance(valor, str):
+            return valor
+        # Los caracteres de control dejan el archivo ilegible para Excel
+        valor = ILLEGAL_CHARACTERS_RE.sub("", valor)
+        if len(valor) <= LIMITE_CELDA:
+            return valor
+        self._desbordar(nombre_hoja, id_fila, columna, valor)
+        return valor[:LIMITE_CELDA - len(MARCA_DESBORDAMIENTO)] + MARCA_DESBORDAMIENTO
+
+    def _desbordar(self, nombre_hoja, id_fila, columna, texto):
+        """Guarda el texto completo en la hoja auxiliar, en trozos que caben en una celda"""
+        if self._desbordamiento is None:
+            self._desbordamiento = self._crear_hoja(
+                HOJA_DESBORDAMIENTO, ("Hoja", "ID", "Columna", "Parte", "Texto"))
+        for parte, inicio in enumerate(range(0, len(texto), LIMITE_CELDA), start=1):
+            self._desbordamiento.agregar(
+                [nombre_hoja, id_fila, columna, parte, texto[inicio:inicio + LIMITE_CELDA]])
+
+    def cerrar(self):
+        for hoja in self._hojas:
+            hoja.cerrar()
+        self._libro.save(self.ruta)
+
+
+class EscritorExcel(_LibroExcel):
+    def __init__(self, ruta, columnas=COLUMNAS):
+        """
+        Abre el reporte Excel de una sola hoja
+        Args:
+            ruta: Archivo .xlsx de salida
+            columnas: Encabezados, en el orden de los valores de cada fila
+        """
+        super().__init__(ruta)
+        self.columnas = tuple(columnas)
+        self._hoja = self._crear_hoja(HOJA_REPORTE, self.columnas)
+        self._id = self.columnas.index("ID") if "ID" in self.columnas else None
+
+    def escribir(self, fila):
+        """Escribe un objeto Fila o un diccionario con los nombres de columna"""
+        if isinstance(fila, Fila) and self.columnas == COLUMNAS:
+            self.escribir_valores(fila.como_valores())
+        else:
+            self.escribir_valores(tuple(fila.get(c) for c in self.columnas))
+
+    def escribir_valores(self, valores):
+        """Escribe una fila con los valores en el orden de self.columnas"""
+        id_fila = valores[self._id] if self._id is not None else None
+        self._escribir(self._hoja, valores, id_fila)
+
+
+class EscritorExcelNormalizado(_LibroExcel):
+    def __init__(self, ruta):
+        """
+        Abre el libro normalizado: una hoja de items sin textos unidos, una
+        fila por comentario, una por commit y una por enlace issue↔commit
+        """
+        super().__init__(ruta)
+        self._items = self._crear_hoja(HOJA_ITEMS, COLUMNAS_ITEMS)
+        self._comentarios = self._crear_hoja(HOJA_COMENTARIOS, COLUMNAS_COMENTARIOS)
+        self._commits = self._crear_hoja(HOJA_COMMITS, COLUMNAS_COMMITS)
+        self._enlaces = self._crear_hoja(HOJA_ENLACES, COLUMNAS_ENLACES)
+
+    def escribir_item(self, item, num_comentarios, num_commits):
+        """
+        Escribe un issue o PR
+        Args:
+            item: Objeto Fila o diccionario con los nombres de columna del reporte
+            num_comentarios: Comentarios del item en la hoja de comentarios
+            num_commits: Commits enlazados en la hoja de enlaces
+        """
+        if isinstance(item, Fila):
+            item = dict(zip(COLUMNAS, item.como_valores()))
+        valores = [item.get(c) for c in COLUMNAS_ITEMS[:-3]]
+        valores += [num_comentarios, num_commits, item.get("URL")]
+        self._escribir(self._items, valores, item.get("ID"))
+
+    def escribir_comentario(self, numero, comentario):
+        """Escribe un comentario con la forma de la API"""
+        self._escribir(self._comentarios, [
+            comentario["id"], numero, (comentario.get("user") or {}).get("login"),
+            parsear_fecha(comentario.get("created_at")),
+            comentario.get("body") or ""], comentario["id"])
+
+    def escribir_commit(self, commit):
+        """Escribe un commit con la forma del endpoint /commits"""
+        datos = commit["commit"]
+        autor = datos.get("author") or {}
+        stats = commit.get("stats")
+        self._escribir(self._commits, [
+            commit["sha"], autor.get("name"), parsear_fecha(autor.get("date")),
+            datos["message"],
+            stats["additions"] if stats else None, stats["deletions"] if stats else None,
+            commit.get("html_url")], commit["sha"])
+
+    def escribir_enlace(self, numero, sha, tipo):
+        self._escribir(self._enlaces, [numero, sha, tipo])
@@ -0,0 +1,129 @@
+"""
+Fuente de commits a partir de un clon local del repositorio
+Lee el historial de todas las ramas con `git log --all` en streaming y
+devuelve cada commit con la misma forma que el endpoint REST /commits,
+sin consumir cuota de la API ni limitarse a la rama principal
+"""
+
+import os
+import subprocess
+import tempfile
+
+# Separadores de registro y de campo que no aparecen en los mensajes
+SEPARADOR_COMMIT = b"\x1e"
+SEPARADOR_CAMPO = "\x1f"
+FORMATO = SEPARADOR_CAMPO.join(["%H", "%an", "%ae", "%ad", "%cn", "%ce", "%cd", "%B"]) + SEPARADOR_CAMPO
+# git escribe las fechas directamente en UTC con el formato de la API
+FORMATO_FECHA = "--date=format-local:%Y-%m-%dT%H:%M:%SZ"
+TAM_BLOQUE = 1 << 16
+
+
+def _numstat(lineas):
+    """Convierte las líneas de --numstat en los campos stats/files de la API"""
+    archivos = []
+    for linea in lineas:
+        partes = linea.split("\t", 2)
+        if len(partes) != 3:
+            continue
+        # Los archivos binarios aparecen como "-\t-\truta"
+        agregadas = int(partes[0]) if partes[0].isdigit() else 0
+        eliminadas = int(partes[1]) if partes[1].isdigit() else 0
+        archivos.append({
+            "filename": partes[2],
+            "additions": agregadas,
+            "deletions": eliminadas,
+            "changes": agregadas + eliminadas
+        })
+    agregadas = sum(a["additions"] for a in archivos)
+    eliminadas = sum(a["deletions"] for a in archivos)
+    return {"additions": agregadas, "deletions": eliminadas, "total": agregadas + eliminadas}, archivos
+
+
+def _commit(registro, numstat, url_base):
+    campos = registro.decode("utf-8", errors="replace").split(SEPARADOR_CAMPO)
+    sha, autor, correo, fecha, committer, correo_committer, fecha_committer, mensaje = campos[:8]
+    commit = {
+        "sha": sha,
+        "commit": {
+            "message": mensaje.rstrip("\n"),
+            "author": {"name": autor, "email": correo, "date": fecha},
+            "committer": {"name": committer, "email": correo_committer,
+                          "date": fecha_committer}
+        },
+        "html_url": f"{url_base}/commit/{sha}" if url_base else None
+    }
+    if numstat:
+        commit["stats"], commit["files"] = _numstat(campos[8].strip("\n").splitlines())
+    return commit
+
+
+def iterar_commits_locales(ruta, since=None, numstat=False, tam_pagina=1000, url_base=None):
+    """
+    Genera páginas de commits leídas de un clon local
+    Args:
+        ruta: Carpeta del clon (o cualquier subcarpeta)
+        since: Fecha ISO 8601; solo commits posteriores
+        numstat: Añadir líneas agregadas/eliminadas por archivo (stats y files)
+        tam_pagina: Commits por página generada
+        url_base: URL web del repositorio para construir html_url
+    """
+    comando = ["git", "-C", ruta, "-c", "log.showSignature=false", "log", "--all",
+               "--no-color", FORMATO_FECHA, f"--format={SEPARADOR_COMMIT.decode()}{FORMATO}"]
+    if since:
+        comando.append(f"--since={since}")
+    if numstat:
+        comando.append("--numstat")
+
+    # stderr a un archivo: una tubería llena bloquearía a git mientras se lee stdout
+    errores = tempfile.TemporaryFile()
+    try:
+        proceso = subprocess.Popen(comando, stdout=subprocess.PIPE, stderr=errores,
+                                   env={**os.environ, "TZ": "UTC"})
+    except FileNotFoundError:
+        errores.close()
+        raise RuntimeError("No se encontró el ejecutable git en el PATH")
+
+    pagina = []
+    pendiente = b""
+    completo = False
+    try:
+        while True:
+            bloque = proceso.stdout.read(TAM_BLOQUE)
+            if not bloque:
+                break
+            registros = (pendiente + bloque).split(SEPARADOR_COMMIT)
+            # El último registro puede estar incompleto hasta el siguiente bloque
+            pendiente = registros.pop()
+            for registro in registros:
+                if not registro:
+                    continue
+                pagina.append(_commit(registro, numstat, url_base))
+                if len(pagina) >= tam_pagina:
+                    yield pagina
+                    pagina = []
+        if pendiente:
+            pagina.append(_commit(pendiente, numstat, url_base))
+        completo = True
+        if pagina:
+            yield pagina
+    finally:
+        proceso.stdout.close()
+        if not completo:
+            # El consumidor dejó de leer antes del final
+            proceso.kill()
+        codigo = proceso.wait()
+        errores.seek(0)
+        error = errores.read().decode("utf-8", errors="replace").strip()
+        errores.close()
+
+    if codigo != 0:
+        raise RuntimeError(f"git log falló en {ruta}: {error}")
+
+
+def obtener_commits_locales(ruta, since=None, numstat=False, url_base=None):
+    """Devuelve la lista completa de commits de un clon local"""
+    return [
+        commit
+        for pagina in iterar_commits_locales(ruta, since, numstat, url_base=url_base)
+        for commit in pagina
+    ]
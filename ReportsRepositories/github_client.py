@@ -0,0 +1,261 @@
+"""
+Cliente HTTP compartido para la API de GitHub
+Mantiene una sesión persistente con un pool de conexiones reutilizables
+"""
+
+import time
+import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from control_limites import ControlLimites
+
+API_URL = "https://api.github.com"
+
+
+class GitHubClient:
+    def __init__(self, token=None, repo=None, api_url=API_URL, pool_size=16, timeout=30, cache=None,
+                 limites=None):
+        """
+        Inicializa el cliente con una sesión keep-alive
+        Args:
+            token: Token de acceso personal de GitHub (opcional)
+            repo: Repositorio en formato usuario/repositorio
+            api_url: URL base de la API de GitHub
+            pool_size: Conexiones simultáneas que se mantienen abiertas
+            timeout: Segundos máximos de espera por petición
+            cache: CacheHTTP para revalidar respuestas con ETag (opcional)
+            limites: ControlLimites por el que pasan todas las peticiones
+        """
+        self.token = token
+        self.repo = repo
+        self.api_url = api_url.rstrip('/')
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.cache = cache
+        self.limites = limites or ControlLimites(max_concurrencia=pool_size)
+        self.session = self._crear_sesion()
+
+    def _crear_sesion(self):
+        """Crea la sesión HTTP con pool de conexiones y compresión gzip"""
+        session = requests.Session()
+
+        # pool_block evita abrir conexiones extra (sin reutilizar) cuando
+        # hay más hilos que conexiones disponibles
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            pool_block=True
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        session.headers.update({
+            "Accept": "application/vnd.github.v3+json",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive"
+        })
+        if self.token:
+            session.headers["Authorization"] = f"token {self.token}"
+        return session
+
+    def url_repo(self, ruta=""):
+        """Construye la URL de un endpoint del repositorio configurado"""
+        return f"{self.api_url}/repos/{self.repo}{ruta}"
+
+    def obtener(self, url, params=None):
+        """
+        Realiza una petición GET reutilizando las conexiones del pool
+        Si hay caché, envía una petición condicional y las respuestas 304
+        se sirven desde disco
+        """
+        if self.cache is None:
+            return self._enviar("GET", url, params=params)
+
+        url = self._url_completa(url, params)
+        entrada = self.cache.leer(url)
+        condicionales = {}
+        if entrada:
+            cabeceras = entrada["cabeceras"]
+            if "ETag" in cabeceras:
+                condicionales["If-None-Match"] = cabeceras["ETag"]
+            if "Last-Modified" in cabeceras:
+                condicionales["If-Modified-Since"] = cabeceras["Last-Modified"]
+
+        r = self._enviar("GET", url, headers=condicionales)
+        if r.status_code == 304 and entrada:
+            return self._respuesta_desde_cache(entrada, r)
+        if r.status_code == 200:
+            self.cache.guardar(url, r)
+        return r
+
+    def _enviar(self, metodo, url, **kwargs):
+        """
+        Envía una petición a través del control de límites
+        Reintenta con espera los rechazos por cuota y los errores 429/5xx
+        y de red; tras agotar los reintentos devuelve la última respuesta
+        """
+        intento = 0
+        while True:
+            self.limites.adquirir()
+            respuesta = None
+            try:
+                respuesta = self.session.request(
+                    metodo, url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if intento >= self.limites.max_reintentos:
+                    raise
+            finally:
+                self.limites.liberar(respuesta)
+
+            if respuesta is not None and not self.limites.debe_reintentar(respuesta, intento):
+                return respuesta
+
+            espera = self.limites.espera_reintento(respuesta, intento)
+            if respuesta is not None and self.limites.es_limite_superado(respuesta):
+                # Detener también al resto de hilos hasta que pase la espera
+                self.limites.pausar(espera)
+            else:
+                time.sleep(espera)
+            intento += 1
+
+    @staticmethod
+    def _lista(respuesta):
+        """Devuelve los elementos de una página o lanza un error si la petición falló"""
+        if respuesta.status_code == 409:
+            # Repositorio vacío (sin commits)
+            return []
+        respuesta.raise_for_status()
+        datos = respuesta.json()
+        if not isinstance(datos, list):
+            raise requests.HTTPError(
+                f"Respuesta inesperada de {respuesta.url}: {datos}", response=respuesta)
+        return datos
+
+    @staticmethod
+    def _url_completa(url, params):
+        """Añade los parámetros a la URL para usarla como clave de caché"""
+        preparada = requests.models.PreparedRequest()
+        preparada.prepare_url(url, params)
+        return preparada.url
+
+    @staticmethod
+    def _respuesta_desde_cache(entrada, respuesta_304):
+        """Reconstruye una respuesta 200 a partir de la entrada guardada"""
+        respuesta = requests.Response()
+        respuesta.status_code = 200
+        respuesta.url = entrada["url"]
+        respuesta.encoding = "utf-8"
+        respuesta._content = entrada["contenido"].encode("utf-8")
+        respuesta.headers = CaseInsensitiveDict(entrada["cabeceras"])
+        # Conservar las cabeceras de límite de peticiones actualizadas
+        for nombre, valor in respuesta_304.headers.items():
+            if nombre.lower().startswith("x-ratelimit"):
+                respuesta.headers[nombre] = valor
+        respuesta.from_cache = True
+        return respuesta
+
+    def obtener_paginado(self, url, params=None, max_workers=8, per_page=100, checkpoint=None):
+        """
+        Descarga todas las páginas de un endpoint paginado
+        Devuelve la lista completa de elementos en orden (ver iterar_paginas)
+        """
+        return [
+            elemento
+            for pagina in self.iterar_paginas(url, params, max_workers, per_page, checkpoint)
+            for elemento in pagina
+        ]
+
+    def iterar_paginas(self, url, params=None, max_workers=8, per_page=100, checkpoint=None):
+        """
+        Genera las páginas de un endpoint paginado a medida que llegan
+        Lee la cabecera Link (rel="last") de la primera página y descarga
+        el resto en paralelo, con como mucho 2 x max_workers páginas en
+        memoria, entregándolas en orden.
+        Con un PuntoControl, las páginas ya completadas no se vuelven a pedir
+        """
+        params = dict(params or {})
+        params["per_page"] = per_page
+        clave = self._url_completa(url, params)
+
+        datos, ultima = self._obtener_pagina(url, params, 1, clave, checkpoint)
+        if not datos:
+            return
+        yield datos
+
+        if ultima is None:
+            # Sin cabecera Link: recorrer una a una hasta una página incompleta
+            pagina = 2
+            while len(datos) >= per_page:
+                datos = self._obtener_pagina(url, params, pagina, clave, checkpoint)[0]
+                if not datos:
+                    break
+                yield datos
+                pagina += 1
+            return
+
+        trabajadores = max(1, min(max_workers, self.pool_size))
+        with ThreadPoolExecutor(max_workers=trabajadores) as executor:
+            pendientes = deque()
+            siguiente = 2
+            try:
+                while siguiente <= ultima or pendientes:
+                    while siguiente <= ultima and len(pendientes) < trabajadores * 2:
+                        pendientes.append(executor.submit(
+                            self._obtener_pagina, url, params, siguiente, clave, checkpoint))
+                        siguiente += 1
+                    yield pendientes.popleft().result()[0]
+            finally:
+                # Si el consumidor se detiene, no descargar el resto
+                for futuro in pendientes:
+                    futuro.cancel()
+
+    def _obtener_pagina(self, url, params, pagina, clave, checkpoint):
+        """Devuelve (elementos, última página) desde el punto de control o la API"""
+        if checkpoint is not None:
+            guardada = checkpoint.leer_pagina(clave, pagina)
+            if guardada is not None:
+                return guardada["datos"], guardada["ultima"]
+
+        respuesta = self.obtener(url, params={**params, "page": pagina})
+        datos = self._lista(respuesta)
+        ultima = self._ultima_pagina(respuesta) if pagina == 1 else None
+        if checkpoint is not None:
+            checkpoint.guardar_pagina(clave, pagina, datos, ultima)
+        return datos, ultima
+
+    @staticmethod
+    def _ultima_pagina(respuesta):
+        """Extrae el número de la última página de la cabecera Link"""
+        enlace = respuesta.links.get("last", {}).get("url")
+        if not enlace:
+            return None
+        pagina = parse_qs(urlparse(enlace).query).get("page")
+        return int(pagina[0]) if pagina else None
+
+    def consultar_graphql(self, consulta, variables=None):
+        """Ejecuta una consulta contra la API GraphQL y devuelve su campo data"""
+        intento = 0
+        while True:
+            r = self._enviar(
+                "POST", f"{self.api_url}/graphql",
+                json={"query": consulta, "variables": variables or {}})
+            r.raise_for_status()
+            datos = r.json()
+            limitado = any(
+                e.get("type") == "RATE_LIMITED" for e in datos.get("errors") or [])
+            if not limitado or intento >= self.limites.max_reintentos:
+                break
+            self.limites.pausar(self.limites.espera_reintento(r, intento))
+            intento += 1
+
+        if datos.get("errors"):
+            mensajes = "; ".join(e.get("message", str(e)) for e in datos["errors"])
+            raise RuntimeError(f"Error en la consulta GraphQL: {mensajes}")
+        return datos["data"]
+
+    def cerrar(self):
+        """Cierra todas las conexiones abiertas de la sesión"""
+        self.session.close()
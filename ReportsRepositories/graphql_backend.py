@@ -0,0 +1,243 @@
+"""
+Backend de descarga basado en la API GraphQL de GitHub
+Obtiene issues y PRs junto con asignado, etiquetas y comentarios en
+consultas paginadas de 100 nodos, y los devuelve con la misma forma que
+el endpoint REST /issues para reutilizar procesar_reporte. También lee el
+historial de commits con las líneas agregadas/eliminadas de cada uno
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+CAMPOS_ITEM = """
+    id
+    number
+    title
+    body
+    state
+    url
+    createdAt
+    updatedAt
+    closedAt
+    assignees(first: 1) { nodes { login } }
+    labels(first: 20) { nodes { name } }
+    comments(first: $maxComentarios) {
+        totalCount
+        pageInfo { hasNextPage endCursor }
+        nodes { databaseId body createdAt updatedAt author { login } }
+    }
+"""
+
+CONSULTA_ITEMS = """
+query($owner: String!, $name: String!, $cursor: String, $maxComentarios: Int!) {
+    repository(owner: $owner, name: $name) {
+        %(conexion)s(first: 100, after: $cursor,
+                     orderBy: {field: CREATED_AT, direction: DESC}) {
+            pageInfo { hasNextPage endCursor }
+            nodes { %(campos)s }
+        }
+    }
+}
+"""
+
+CONSULTA_MAS_COMENTARIOS = """
+query($id: ID!, $cursor: String) {
+    node(id: $id) {
+        ... on Issue { comments(first: 100, after: $cursor) { %(campos)s } }
+        ... on PullRequest { comments(first: 100, after: $cursor) { %(campos)s } }
+    }
+}
+""" % {"campos": """
+    pageInfo { hasNextPage endCursor }
+    nodes { databaseId body createdAt updatedAt author { login } }
+"""}
+
+# Historial de la rama principal con líneas agregadas/eliminadas por commit:
+# 100 commits por consulta en lugar de una petición REST por commit
+CONSULTA_HISTORIAL = """
+query($owner: String!, $name: String!, $cursor: String, $since: GitTimestamp) {
+    repository(owner: $owner, name: $name) {
+        defaultBranchRef {
+            target {
+                ... on Commit {
+                    history(first: 100, after: $cursor, since: $since) {
+                        pageInfo { hasNextPage endCursor }
+                        nodes {
+                            oid
+                            message
+                            url
+                            additions
+                            deletions
+                            author { name email date }
+                            committer { name email date }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+"""
+
+
+def _fecha_utc(fecha):
+    """Normaliza una fecha GraphQL (con zona horaria) al formato UTC de REST"""
+    if not fecha:
+        return fecha
+    instante = datetime.fromisoformat(fecha.replace("Z", "+00:00"))
+    return instante.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _persona_rest(persona):
+    persona = persona or {}
+    return {"name": persona.get("name"), "email": persona.get("email"),
+            "date": _fecha_utc(persona.get("date"))}
+
+
+def _commit_rest(nodo):
+    """Convierte un commit GraphQL al formato REST, con stats como /commits/{sha}"""
+    return {
+        "sha": nodo["oid"],
+        "commit": {
+            "message": nodo["message"],
+            "author": _persona_rest(nodo["author"]),
+            "committer": _persona_rest(nodo["committer"])
+        },
+        "html_url": nodo["url"],
+        "stats": {
+            "additions": nodo["additions"],
+            "deletions": nodo["deletions"],
+            "total": nodo["additions"] + nodo["deletions"]
+        }
+    }
+
+
+def _comentario_rest(nodo, issue_url):
+    """Convierte un comentario GraphQL al formato del endpoint REST"""
+    autor = nodo.get("author") or {}
+    return {
+        "id": nodo["databaseId"],
+        "user": {"login": autor.get("login") or "ghost"},
+        "body": nodo["body"],
+        "created_at": nodo["createdAt"],
+        "updated_at": nodo["updatedAt"],
+        "issue_url": issue_url
+    }
+
+
+def _issue_rest(nodo, es_pr):
+    """Convierte un issue/PR GraphQL al formato del endpoint REST /issues"""
+    asignados = nodo["assignees"]["nodes"]
+    issue = {
+        "number": nodo["number"],
+        "title": nodo["title"],
+        "body": nodo["body"],
+        # Los PRs fusionados aparecen como "closed" en REST
+        "state": "open" if nodo["state"] == "OPEN" else "closed",
+        "created_at": nodo["createdAt"],
+        "updated_at": nodo["updatedAt"],
+        "closed_at": nodo["closedAt"],
+        "assignee": {"login": asignados[0]["login"]} if asignados else None,
+        "labels": [{"name": e["name"]} for e in nodo["labels"]["nodes"]],
+        "comments": nodo["comments"]["totalCount"],
+        "html_url": nodo["url"]
+    }
+    if es_pr:
+        issue["pull_request"] = {"html_url": nodo["url"]}
+    return issue
+
+
+class BackendGraphQL:
+    def __init__(self, cliente, max_comentarios=50):
+        """
+        Inicializa el backend
+        Args:
+            cliente: GitHubClient configurado con token y repositorio
+            max_comentarios: Comentarios por item incluidos en la consulta principal
+        """
+        self.cliente = cliente
+        self.max_comentarios = max_comentarios
+        self.owner, self.name = cliente.repo.split("/", 1)
+
+    def _descargar_conexion(self, conexion):
+        """Recorre todas las páginas de issues o pullRequests"""
+        consulta = CONSULTA_ITEMS % {"conexion": conexion, "campos": CAMPOS_ITEM}
+        nodos = []
+        cursor = None
+        while True:
+            datos = self.cliente.consultar_graphql(consulta, {
+                "owner": self.owner,
+                "name": self.name,
+                "cursor": cursor,
+                "maxComentarios": self.max_comentarios
+            })
+            pagina = datos["repository"][conexion]
+            nodos.extend(pagina["nodes"])
+            if not pagina["pageInfo"]["hasNextPage"]:
+                return nodos
+            cursor = pagina["pageInfo"]["endCursor"]
+
+    def iterar_historial_commits(self, since=None):
+        """
+        Genera páginas de commits de la rama principal con sus estadísticas
+        Args:
+            since: Fecha ISO 8601; solo commits posteriores
+        """
+        cursor = None
+        while True:
+            datos = self.cliente.consultar_graphql(CONSULTA_HISTORIAL, {
+                "owner": self.owner,
+                "name": self.name,
+                "cursor": cursor,
+                "since": since
+            })
+            rama = datos["repository"]["defaultBranchRef"]
+            if rama is None:
+                # Repositorio vacío
+                return
+            historial = rama["target"]["history"]
+            if historial["nodes"]:
+                yield [_commit_rest(nodo) for nodo in historial["nodes"]]
+            if not historial["pageInfo"]["hasNextPage"]:
+                return
+            cursor = historial["pageInfo"]["endCursor"]
+
+    def _comentarios_restantes(self, nodo):
+        """Descarga los comentarios que no entraron en la consulta principal"""
+        restantes = []
+        info = nodo["comments"]["pageInfo"]
+        while info["hasNextPage"]:
+            datos = self.cliente.consultar_graphql(
+                CONSULTA_MAS_COMENTARIOS, {"id": nodo["id"], "cursor": info["endCursor"]})
+            pagina = datos["node"]["comments"]
+            restantes.extend(pagina["nodes"])
+            info = pagina["pageInfo"]
+        return restantes
+
+    def obtener_issues_y_comentarios(self):
+        """
+        Descarga issues, PRs y sus comentarios
+        Returns:
+            (issues, comentarios): lista de items en formato REST ordenada como
+            el endpoint /issues (por fecha de creación) y {numero: [comentario, ...]}
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futuro_issues = executor.submit(self._descargar_conexion, "issues")
+            futuro_prs = executor.submit(self._descargar_conexion, "pullRequests")
+            nodos = ([(n, False) for n in futuro_issues.result()] +
+                     [(n, True) for n in futuro_prs.result()])
+
+        issues = []
+        comentarios = {}
+        for nodo, es_pr in nodos:
+            issue = _issue_rest(nodo, es_pr)
+            issue_url = self.cliente.url_repo(f"/issues/{nodo['number']}")
+            nodos_comentarios = nodo["comments"]["nodes"] + self._comentarios_restantes(nodo)
+            if nodos_comentarios:
+                comentarios[nodo["number"]] = [
+                    _comentario_rest(c, issue_url) for c in nodos_comentarios]
+            issues.append(issue)
+
+        # Mismo orden que REST /issues con sort=created&direction=asc
+        issues.sort(key=lambda i: (i["created_at"], i["number"]))
+        return issues, comentarios
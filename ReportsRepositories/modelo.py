@@ -0,0 +1,268 @@
+"""
+Modelo compacto de las filas del reporte
+Cada issue o PR se guarda en un objeto con __slots__, con tipo y estado
+como enumerados compartidos y fechas ya interpretadas, en lugar de un
+diccionario de 12 claves con textos. Las columnas del reporte
+("ID", "Tipo", "Título"...) se obtienen con fila["Columna"]
+DatasetReporte reúne todas las filas en columnas tipadas para los reportes
+y FilasEnDisco las guarda en un archivo temporal cuando no deben quedar en memoria
+"""
+
+import json
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+
+import pandas as pd
+
+# Formato de fecha de la API de GitHub, usado también en los reportes
+FORMATO_FECHA = "%Y-%m-%dT%H:%M:%SZ"
+
+
+class Tipo(str, Enum):
+    ISSUE = "Issue"
+    PULL_REQUEST = "Pull Request"
+
+
+class Estado(str, Enum):
+    ABIERTO = "open"
+    CERRADO = "closed"
+
+
+# Columnas del reporte en orden
+COLUMNAS = (
+    "ID", "Tipo", "Título", "Descripción", "Estado", "Asignado a", "Creado",
+    "Cerrado", "Comentarios", "Commits Vinculados", "Autores Commits",
+    "Commits de Cierre", "URL"
+)
+
+
+def parsear_fecha(texto):
+    """
+    Convierte una fecha ISO 8601 de la API (o un datetime) en datetime UTC (o None)
+    Las fechas sin zona horaria se asumen en UTC, como las de GitHub
+    """
+    if not texto:
+        return None
+    fecha = texto if isinstance(texto, datetime) else datetime.fromisoformat(texto.replace("Z", "+00:00"))
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return fecha.astimezone(timezone.utc)
+
+
+def formatear_fecha(fecha):
+    return fecha.strftime(FORMATO_FECHA) if fecha else None
+
+
+def _internar(texto):
+    # Asignados y autores se repiten en muchas filas: una sola copia de cada uno
+    return sys.intern(texto) if texto else texto
+
+
+@dataclass(slots=True)
+class Fila:
+    numero: int
+    tipo: Tipo
+    titulo: str
+    descripcion: str
+    estado: Estado
+    asignado: str | None
+    creado: datetime | None
+    cerrado: datetime | None
+    comentarios: str = ""
+    commits: str = ""
+    autores: str = ""
+    cierres: str = ""
+    url: str = ""
+
+    @classmethod
+    def desde_issue(cls, issue, comentarios="", commits="", autores="", cierres=""):
+        """Crea la fila de un issue o PR con forma de la API REST"""
+        asignado = issue.get("assignee")
+        return cls(
+            numero=issue["number"],
+            tipo=Tipo.PULL_REQUEST if "pull_request" in issue else Tipo.ISSUE,
+            titulo=issue["title"],
+            descripcion=(issue.get("body") or "").strip(),
+            estado=Estado(issue["state"]),
+            asignado=_internar(asignado["login"]) if asignado else None,
+            creado=parsear_fecha(issue["created_at"]),
+            cerrado=parsear_fecha(issue.get("closed_at")),
+            comentarios=comentarios,
+            commits=commits,
+            autores=_internar(autores),
+            cierres=cierres,
+            url=issue["html_url"]
+        )
+
+    def __getitem__(self, columna):
+        """Valor de una columna del reporte, con el mismo texto de siempre"""
+        return _COLUMNAS[columna](self)
+
+    def get(self, columna, defecto=None):
+        try:
+            return self[columna]
+        except KeyError:
+            return defecto
+
+    def keys(self):
+        return COLUMNAS
+
+    def como_tupla(self):
+        return tuple(_COLUMNAS[columna](self) for columna in COLUMNAS)
+
+    def como_dict(self):
+        return dict(zip(COLUMNAS, self.como_tupla()))
+
+    def como_valores(self):
+        """Como como_tupla, pero con las fechas como datetime"""
+        return tuple(extraer(self) for extraer in _COLUMNAS_TIPADAS.values())
+
+
+# Adaptador de cada columna del reporte a los campos de Fila
+_COLUMNAS = {
+    "ID": lambda f: f.numero,
+    "Tipo": lambda f: f.tipo.value,
+    "Título": lambda f: f.titulo,
+    "Descripción": lambda f: f.descripcion,
+    "Estado": lambda f: f.estado.value,
+    "Asignado a": lambda f: f.asignado or "No asignado",
+    "Creado": lambda f: formatear_fecha(f.creado),
+    "Cerrado": lambda f: formatear_fecha(f.cerrado),
+    "Comentarios": lambda f: f.comentarios or "Sin comentarios",
+    "Commits Vinculados": lambda f: f.commits or "Ninguno",
+    "Autores Commits": lambda f: f.autores or "Ninguno",
+    "Commits de Cierre": lambda f: f.cierres or "Ninguno",
+    "URL": lambda f: f.url,
+}
+
+# Igual que _COLUMNAS pero con las fechas como datetime, para el dataset
+_COLUMNAS_TIPADAS = {**_COLUMNAS, "Creado": lambda f: f.creado, "Cerrado": lambda f: f.cerrado}
+
+
+# Columnas con pocos valores distintos: se guardan como categóricas
+CATEGORICAS = ("Tipo", "Estado", "Asignado a")
+FECHAS = ("Creado", "Cerrado")
+
+
+def _columna_fecha(valores):
+    """Serie datetime64 sin zona horaria (UTC) a partir de datetimes o textos"""
+    return pd.to_datetime(pd.Series(valores, dtype=object), errors="coerce", utc=True).dt.tz_localize(None)
+
+
+def _fechas_a_texto(serie):
+    """Texto de la API para cada fecha; None donde no hay fecha"""
+    textos = serie.dt.strftime(FORMATO_FECHA).astype(object)
+    return textos.where(serie.notna(), None)
+
+
+class DatasetReporte:
+    """
+    Conjunto de filas del reporte en formato columnar, construido una sola vez
+    Las fechas se guardan como datetime64 y Tipo, Estado y Asignado a como
+    categóricas. Excel, Markdown, PDF y GitHubAnalytics leen el mismo
+    DataFrame (self.df) sin volver a convertir ni copiar los datos
+    """
+
+    def __init__(self, filas=(), df=None):
+        if df is not None:
+            # DataFrame ya tipado (p. ej. leído de una instantánea): sin conversión
+            self.df = df
+            return
+        filas = filas if isinstance(filas, list) else list(filas)
+        if filas and isinstance(filas[0], Fila):
+            self.df = self._desde_filas(filas)
+        else:
+            # Diccionarios con los nombres de columna (llamadas antiguas)
+            self.df = self._tipar(pd.DataFrame(filas))
+
+    @classmethod
+    def desde(cls, datos):
+        """Devuelve el mismo dataset si ya lo es; si no, lo construye"""
+        return datos if isinstance(datos, cls) else cls(datos)
+
+    @staticmethod
+    def _desde_filas(filas):
+        columnas = {
+            columna: [extraer(fila) for fila in filas]
+            for columna, extraer in _COLUMNAS_TIPADAS.items()
+        }
+        columnas["ID"] = pd.Series(columnas["ID"], dtype="int64")
+        for columna in FECHAS:
+            columnas[columna] = _columna_fecha(columnas[columna])
+        for columna in CATEGORICAS:
+            columnas[columna] = pd.Categorical(columnas[columna])
+        return pd.DataFrame(columnas, columns=COLUMNAS)
+
+    @staticmethod
+    def _tipar(df):
+        for columna in FECHAS:
+            if columna in df.columns:
+                df[columna] = _columna_fecha(df[columna])
+        for columna in CATEGORICAS:
+            if columna in df.columns:
+                df[columna] = df[columna].astype("category")
+        return df
+
+    def __len__(self):
+        return len(self.df)
+
+    def __iter__(self):
+        return self.iterar_textos()
+
+    def iterar_textos(self):
+        """
+        Genera cada fila como {columna: valor} con los textos del reporte
+        (fechas con el formato de la API), para Markdown y PDF
+        """
+        columnas = list(self.df.columns)
+        valores = [
+            _fechas_a_texto(self.df[c]) if c in FECHAS else self.df[c]
+            for c in columnas
+        ]
+        for fila in zip(*(v.tolist() for v in valores)):
+            yield dict(zip(columnas, fila))
+
+    def iterar_valores(self):
+        """
+        Genera cada fila como tupla en el orden de self.df.columns, con las
+        fechas como Timestamp (None si falta), para escritores tipados como Excel
+        """
+        valores = [
+            self.df[c].astype(object).where(self.df[c].notna(), None) if c in FECHAS else self.df[c]
+            for c in self.df.columns
+        ]
+        return zip(*(v.tolist() for v in valores))
+
+
+class FilasEnDisco:
+    """
+    Filas del reporte volcadas a un archivo temporal (una línea JSON por
+    fila) a medida que se generan, para recorrerlas de nuevo sin haberlas
+    mantenido en memoria. El archivo se elimina al cerrar
+    """
+
+    def __init__(self, directorio=None):
+        self._archivo = tempfile.TemporaryFile("w+", encoding="utf-8", dir=directorio)
+        self.total = 0
+
+    def agregar(self, fila):
+        self._archivo.seek(0, os.SEEK_END)
+        self._archivo.write(json.dumps(fila.como_tupla(), ensure_ascii=False) + "\n")
+        self.total += 1
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        """Genera cada fila como {columna: valor}, con los textos de Fila.como_dict"""
+        self._archivo.flush()
+        self._archivo.seek(0)
+        for linea in self._archivo:
+            yield dict(zip(COLUMNAS, json.loads(linea)))
+
+    def cerrar(self):
+        self._archivo.close()
@@ -0,0 +1,120 @@
+"""
+Pipeline por etapas conectadas con colas acotadas
+Cada etapa corre en su propio hilo y pasa sus resultados a la siguiente
+a través de una cola de tamaño limitado, de modo que la descarga, el
+procesamiento y la escritura se solapan y la memoria máxima depende de
+la profundidad de las colas y no del tamaño del repositorio
+"""
+
+import queue
+import threading
+
+# Marca de fin de datos que recorre todas las colas
+_FIN = object()
+# Segundos entre comprobaciones de cancelación mientras se espera en una cola
+_INTERVALO = 0.1
+
+
+class _Estado:
+    """Cancelación y primer error compartidos por todas las etapas"""
+
+    def __init__(self):
+        self.detener = threading.Event()
+        self.error = None
+
+    def fallar(self, error):
+        if self.error is None:
+            self.error = error
+        self.detener.set()
+
+
+def _poner(cola, elemento, estado):
+    """Encola esperando hueco; devuelve False si el pipeline se canceló"""
+    while not estado.detener.is_set():
+        try:
+            cola.put(elemento, timeout=_INTERVALO)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _tomar(cola, estado):
+    """Desencola esperando datos; devuelve _FIN si el pipeline se canceló"""
+    while not estado.detener.is_set():
+        try:
+            return cola.get(timeout=_INTERVALO)
+        except queue.Empty:
+            continue
+    return _FIN
+
+
+def _producir(fuente, salida, estado):
+    try:
+        for elemento in fuente:
+            if not _poner(salida, elemento, estado):
+                break
+        else:
+            _poner(salida, _FIN, estado)
+    except BaseException as e:
+        estado.fallar(e)
+    finally:
+        # Un generador detenido a medias libera sus recursos (p. ej. descargas)
+        cerrar = getattr(fuente, "close", None)
+        if cerrar is not None:
+            cerrar()
+
+
+def _transformar(etapa, entrada, salida, estado):
+    try:
+        while True:
+            elemento = _tomar(entrada, estado)
+            if elemento is _FIN:
+                _poner(salida, _FIN, estado)
+                return
+            for resultado in etapa(elemento):
+                if not _poner(salida, resultado, estado):
+                    return
+    except BaseException as e:
+        estado.fallar(e)
+
+
+def ejecutar_pipeline(fuente, etapas, destino, profundidad=4):
+    """
+    Ejecuta fuente -> etapas -> destino con una cola acotada entre cada paso
+    Args:
+        fuente: Iterable de elementos (p. ej. un generador de páginas)
+        etapas: Funciones elemento -> iterable de resultados, cada una en su hilo
+        destino: Función que consume cada resultado final en el hilo llamante
+        profundidad: Elementos máximos en espera en cada cola
+    Si cualquier paso falla, se detienen todos y se relanza el primer error
+    """
+    estado = _Estado()
+    colas = [queue.Queue(maxsize=profundidad) for _ in range(len(etapas) + 1)]
+
+    hilos = [threading.Thread(
+        target=_producir, args=(fuente, colas[0], estado),
+        name="pipeline-fuente", daemon=True)]
+    for i, etapa in enumerate(etapas):
+        hilos.append(threading.Thread(
+            target=_transformar, args=(etapa, colas[i], colas[i + 1], estado),
+            name=f"pipeline-etapa-{i + 1}", daemon=True))
+    for hilo in hilos:
+        hilo.start()
+
+    try:
+        while True:
+            elemento = _tomar(colas[-1], estado)
+            if elemento is _FIN:
+                break
+            destino(elemento)
+    except BaseException as e:
+        estado.fallar(e)
+    finally:
+        if estado.error is not None:
+            estado.detener.set()
+        for hilo in hilos:
+            hilo.join()
+
+    if estado.error is not None:
+        raise estado.error
@@ -0,0 +1,90 @@
+"""
+Planificador de peticiones de seguimiento a la API de GitHub
+Decide qué hilos de comentarios hay que descargar a partir de los datos
+que ya vienen en el listado de issues y PRs
+"""
+
+from modelo import parsear_fecha
+
+TIPOS_TODOS = ("Issue", "Pull Request")
+
+
+def _sin_cambios(issue, corte):
+    """Indica si el item no se ha actualizado desde la fecha de corte"""
+    actualizado = parsear_fecha(issue.get("updated_at"))
+    return actualizado is not None and actualizado <= corte
+
+
+class PlanComentarios:
+    def __init__(self):
+        """
+        Resultado de la planificación
+        Attributes:
+            descargar: Números de los items cuyos comentarios hay que pedir
+            resueltos: {numero: texto} de los items que no necesitan petición
+            omitidos: Conteo de peticiones evitadas por motivo
+        """
+        self.descargar = []
+        self.resueltos = {}
+        self.omitidos = {'sin_comentarios': 0, 'sin_cambios': 0, 'tipo_excluido': 0}
+        # Peticiones de los planes acumulados con sumar()
+        self._sumadas = 0
+
+    @property
+    def total_necesarias(self):
+        return len(self.descargar) + self._sumadas
+
+    @property
+    def total_omitidos(self):
+        return sum(self.omitidos.values())
+
+    def sumar(self, otro):
+        """Acumula los conteos de otro plan (p. ej. el de cada página) sin guardar sus items"""
+        self._sumadas += otro.total_necesarias
+        for motivo, cantidad in otro.omitidos.items():
+            self.omitidos[motivo] += cantidad
+
+    def resumen(self):
+        """Devuelve un texto con las peticiones necesarias y omitidas"""
+        return (
+            f"Comentarios: {self.total_necesarias} peticiones necesarias, "
+            f"{self.total_omitidos} omitidas "
+            f"({self.omitidos['sin_comentarios']} sin comentarios, "
+            f"{self.omitidos['sin_cambios']} sin cambios, "
+            f"{self.omitidos['tipo_excluido']} por tipo)")
+
+
+def planificar_comentarios(issues, ultima_ejecucion=None, comentarios_previos=None, tipos=TIPOS_TODOS):
+    """
+    Planifica las descargas de comentarios
+    Args:
+        issues: Items devueltos por el endpoint /issues
+        ultima_ejecucion: Fecha de la ejecución anterior (ISO 8601 o datetime)
+        comentarios_previos: {numero: texto} obtenidos en la ejecución anterior
+        tipos: Tipos de item ("Issue", "Pull Request") cuyos comentarios se piden
+    Returns:
+        PlanComentarios con las peticiones a realizar
+    """
+    plan = PlanComentarios()
+    corte = parsear_fecha(ultima_ejecucion)
+    comentarios_previos = comentarios_previos or {}
+
+    for issue in issues:
+        numero = issue["number"]
+        tipo = "Pull Request" if "pull_request" in issue else "Issue"
+
+        if tipo not in tipos:
+            plan.resueltos[numero] = ""
+            plan.omitidos['tipo_excluido'] += 1
+        elif issue.get("comments") == 0:
+            plan.resueltos[numero] = ""
+            plan.omitidos['sin_comentarios'] += 1
+        elif (corte is not None and numero in comentarios_previos
+              and _sin_cambios(issue, corte)):
+            # Sin actividad desde la última ejecución: reutilizar
+            plan.resueltos[numero] = comentarios_previos[numero]
+            plan.omitidos['sin_cambios'] += 1
+        else:
+            plan.descargar.append(numero)
+
+    return plan
@@ -0,0 +1,132 @@
+"""
+Extracción de referencias a issues en mensajes de commit
+Reconoce #N, GH-N, usuario/repo#N y URLs completas de issues o PRs, y
+distingue las referencias que cierran el issue (fixes #N, closes #N...)
+de las simples menciones y de las que apuntan a otros repositorios
+"""
+
+import re
+
+# Tipos de referencia
+CIERRA = "cierra"
+MENCIONA = "menciona"
+OTRO_REPO = "otro_repo"
+
+# Cada patrón empieza por un literal, así la búsqueda solo se detiene
+# donde puede haber una referencia
+PATRON_NUMERO = re.compile(r"#(\d+)\b")
+PATRON_GH = re.compile(r"\bGH-(\d+)\b", re.IGNORECASE)
+PATRON_URL = re.compile(
+    r"https?://github\.com/([\w.-]+/[\w.-]+)/(?:issues|pull)/(\d+)\b", re.IGNORECASE)
+
+# Palabras clave con las que GitHub cierra un issue al fusionar el commit.
+# Como en GitHub, solo afectan a la referencia que les sigue inmediatamente
+PALABRAS_CIERRE = {
+    "close", "closes", "closed",
+    "fix", "fixes", "fixed",
+    "resolve", "resolves", "resolved"
+}
+
+
+def _es_palabra(caracter):
+    return caracter.isalnum() or caracter == "_"
+
+
+def _repo_previo(mensaje, inicio):
+    """Devuelve el usuario/repo pegado a un #N (p. ej. "otro/repo#4") o None"""
+    j = inicio
+    while j > 0 and (_es_palabra(mensaje[j - 1]) or mensaje[j - 1] in "./-"):
+        j -= 1
+    partes = mensaje[j:inicio].split("/")
+    if len(partes) >= 2 and partes[-2] and partes[-1]:
+        return f"{partes[-2]}/{partes[-1]}"
+    return None
+
+
+def _precedida_de_cierre(mensaje, inicio):
+    """Indica si antes de la posición hay "fixes ", "Closes: "..."""
+    j = inicio
+    while j > 0 and mensaje[j - 1].isspace():
+        j -= 1
+    if j > 0 and mensaje[j - 1] == ":":
+        j -= 1
+        while j > 0 and mensaje[j - 1].isspace():
+            j -= 1
+    if j == inicio:
+        # La palabra clave debe ir separada de la referencia
+        return False
+    k = j
+    while k > 0 and mensaje[k - 1].isalpha():
+        k -= 1
+    if k > 0 and _es_palabra(mensaje[k - 1]):
+        return False
+    return mensaje[k:j].lower() in PALABRAS_CIERRE
+
+
+def _coincidencias(mensaje):
+    """Genera (inicio, repo o None, número) de cada referencia del mensaje"""
+    if "#" in mensaje:
+        for coincidencia in PATRON_NUMERO.finditer(mensaje):
+            inicio = coincidencia.start()
+            destino = _repo_previo(mensaje, inicio)
+            if destino:
+                inicio -= len(destino)
+            yield inicio, destino, coincidencia.group(1)
+    if "-" in mensaje:
+        for coincidencia in PATRON_GH.finditer(mensaje):
+            yield coincidencia.start(), None, coincidencia.group(1)
+    if "://" in mensaje:
+        for coincidencia in PATRON_URL.finditer(mensaje):
+            yield coincidencia.start(), coincidencia.group(1), coincidencia.group(2)
+
+
+def extraer_referencias(mensaje, repo=None):
+    """
+    Devuelve las referencias de un mensaje como {clave: tipo}
+    La clave es el número ("12") para el repositorio actual y
+    "usuario/repo#12" para otros repositorios. Si un mismo issue aparece
+    como mención y como cierre, prevalece el cierre
+    """
+    propio = repo.lower() if repo else None
+    referencias = {}
+    for inicio, destino, numero in _coincidencias(mensaje):
+        if destino and destino.lower() != propio:
+            clave, tipo = f"{destino}#{numero}", OTRO_REPO
+        else:
+            clave = numero
+            tipo = CIERRA if _precedida_de_cierre(mensaje, inicio) else MENCIONA
+
+        if referencias.get(clave) != CIERRA:
+            referencias[clave] = tipo
+    return referencias
+
+
+def indexar_referencias(commits, repo=None):
+    """
+    Recorre los commits una sola vez y agrupa por issue referenciado
+    Returns:
+        {clave: [(primera línea del mensaje, autor, tipo), ...]} en el orden
+        de los commits; cada commit aparece una vez por issue
+    """
+    indice = {}
+    for commit in commits:
+        mensaje = commit["commit"]["message"]
+        referencias = extraer_referencias(mensaje, repo)
+        if not referencias:
+            continue
+        linea = mensaje.splitlines()[0]
+        autor = commit["commit"]["author"]["name"]
+        for clave, tipo in referencias.items():
+            indice.setdefault(clave, []).append((linea, autor, tipo))
+    return indice
+
+
+def enlazar_commits(commits, repo=None):
+    """
+    Genera un enlace (número, sha, tipo) por cada issue del repositorio
+    actual que referencia cada commit, para tablas normalizadas
+    """
+    for commit in commits:
+        for clave, tipo in extraer_referencias(commit["commit"]["message"], repo).items():
+            if tipo != OTRO_REPO:
+                yield int(clave), commit["sha"], tipo
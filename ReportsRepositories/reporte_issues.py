@@ -1,12 +1,25 @@
 import requests
-import pandas as pd
-import re
 import os
-import sys
+import threading
+from contextlib import closing
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 # Importar GitHubAnalytics para estadísticas
-from analytics import GitHubAnalytics
+from analytics import GitHubAnalytics, PARQUET_DISPONIBLE
+from github_client import GitHubClient, API_URL
+from cache_http import CacheHTTP
+from planificador import planificar_comentarios, PlanComentarios, TIPOS_TODOS
+from sincronizacion import EstadoSincronizacion
+from graphql_backend import BackendGraphQL
+from checkpoint import PuntoControl
+from referencias import enlazar_commits, indexar_referencias, CIERRA
+from fuente_git import iterar_commits_locales
+from modelo import COLUMNAS, DatasetReporte, Fila, FilasEnDisco, formatear_fecha
+from pipeline import ejecutar_pipeline
+from escritores import EscritorExcel, EscritorExcelNormalizado, EscritorMarkdown
+from almacen import AlmacenLocal
 
 # Cargar variables de entorno
 # Primero intenta cargar desde el directorio actual
@@ -21,6 +34,54 @@ if not env_loaded:
 # === CONFIGURACIÓN ===
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 REPO = os.getenv("REPO")  # Ejemplo: openai/chatgpt
+# URL base de la API (p. ej. la de servidor_simulado.py para pruebas sin red)
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", API_URL)
+# Número de descargas simultáneas contra la API
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", "8"))
+# Descarga de comentarios: "por_issue" (una petición por item) o
+# "masivo" (todos los comentarios del repositorio en bloque)
+MODO_COMENTARIOS = os.getenv("MODO_COMENTARIOS", "por_issue")
+# Tipos de item cuyos comentarios se descargan ("Issue", "Pull Request")
+COMENTARIOS_TIPOS = tuple(
+    t.strip() for t in os.getenv("COMENTARIOS_TIPOS", ",".join(TIPOS_TODOS)).split(",") if t.strip())
+# Caché HTTP en disco con revalidación por ETag
+CACHE_HTTP = os.getenv("CACHE_HTTP", "true").lower() == "true"
+CACHE_DIR = os.getenv(
+    "CACHE_DIR", str(Path(__file__).resolve().parent.parent / ".cache"))
+CACHE_MAX_MB = int(os.getenv("CACHE_MAX_MB", "200"))
+# Sincronización incremental: solo se piden los cambios desde la última ejecución
+MODO_INCREMENTAL = os.getenv("MODO_INCREMENTAL", "false").lower() == "true"
+# Backend de descarga de issues y comentarios: "rest" o "graphql"
+MODO_API = os.getenv("MODO_API", "rest")
+# Guardar el progreso de las descargas para reanudar ejecuciones interrumpidas
+CHECKPOINT = os.getenv("CHECKPOINT", "true").lower() == "true"
+# Descargar, procesar y escribir a la vez, página a página
+MODO_PIPELINE = os.getenv("MODO_PIPELINE", "false").lower() == "true"
+# Páginas en espera entre etapas del pipeline
+PIPELINE_PROFUNDIDAD = int(os.getenv("PIPELINE_PROFUNDIDAD", "4"))
+# Clon local del repositorio: los commits se leen con git log --all en
+# lugar de paginar /commits (incluye todas las ramas)
+GIT_REPO_LOCAL = os.getenv("GIT_REPO_LOCAL")
+# Añadir a cada commit local las líneas agregadas/eliminadas por archivo
+GIT_NUMSTAT = os.getenv("GIT_NUMSTAT", "false").lower() == "true"
+# Almacén local SQLite: las descargas se guardan en tablas consultables
+ALMACEN_LOCAL = os.getenv("ALMACEN_LOCAL", "false").lower() == "true"
+ALMACEN_RUTA = os.getenv("ALMACEN_RUTA", os.path.join(CACHE_DIR, "almacen.sqlite3"))
+# Generar los reportes solo con los datos del almacén, sin llamar a la API
+SIN_CONEXION = os.getenv("SIN_CONEXION", "false").lower() == "true"
+# Instantánea Parquet del último reporte (requiere pyarrow): guardarla al
+# terminar y, con USAR_SNAPSHOT, abrirla en lugar de descargar y preparar
+GUARDAR_SNAPSHOT = os.getenv("GUARDAR_SNAPSHOT", "true").lower() == "true"
+USAR_SNAPSHOT = os.getenv("USAR_SNAPSHOT", "false").lower() == "true"
+# Excel normalizado: hojas Items, Comentarios, Commits y Enlaces en lugar
+# de comentarios y commits unidos en textos dentro de una sola hoja
+EXCEL_NORMALIZADO = os.getenv("EXCEL_NORMALIZADO", "false").lower() == "true"
+# Markdown comprimido con gzip (reporte_completo.md.gz)
+MARKDOWN_GZIP = os.getenv("MARKDOWN_GZIP", "false").lower() == "true"
+# PDF en paralelo: procesos de renderizado (1 = un solo proceso, 0 = uno por
+# núcleo) e issues/PRs por parte; las partes se unen con pypdf
+PDF_PROCESOS = int(os.getenv("PDF_PROCESOS", "1"))
+PDF_ITEMS_POR_PARTE = int(os.getenv("PDF_ITEMS_POR_PARTE", "500"))
 
 HEADERS = {
     "Authorization": f"token {GITHUB_TOKEN}",
@@ -28,715 +89,320 @@ HEADERS = {
 }
 BASE_URL = f"https://github.com/{REPO}"
 
+# Cliente HTTP compartido por todas las llamadas a la API
+_cliente = None
+# Punto de control de la ejecución en curso
+_punto_control = None
+# Almacén local compartido por los hilos de descarga
+_almacen = None
+_lock_almacen = threading.Lock()
+
 # Importaciones opcionales para generación de PDF
 PDF_DISPONIBLE = False
 try:
-    # Solo verificamos si las dependencias están disponibles al inicio
-    import markdown2
-    import reportlab
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.pdfgen import canvas
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle, Image
-    from reportlab.lib.units import inch, cm
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT
-    from reportlab.lib import colors
+    from reporte_pdf import RenderizadorPDF
     PDF_DISPONIBLE = os.getenv("ENABLE_PDF", "").lower() == "true"
 except ImportError:
     print("Nota: Algunas dependencias para generar PDF no están disponibles.")
     print("Para instalar las dependencias necesarias ejecute:")
-    print("pip install reportlab markdown2")
-
-
-def obtener_issues_y_prs():
-    resultados = []
-    page = 1
-    while True:
-        url = f"https://api.github.com/repos/{REPO}/issues?state=all&per_page=100&page={page}"
-        r = requests.get(url, headers=HEADERS)
-        data = r.json()
-        if not data:
-            break
-        resultados.extend(data)
-        page += 1
-    return resultados
-
-
-def obtener_commits():
-    commits = []
-    page = 1
-    while True:
-        url = f"https://api.github.com/repos/{REPO}/commits?per_page=100&page={page}"
-        r = requests.get(url, headers=HEADERS)
-        data = r.json()
-        if not data or "message" in data:
-            break
-        commits.extend(data)
-        page += 1
-    return commits
-
-
-def vincular_commits(issue_number, commits):
-    vinculados = []
-    autores = set()
-    patron = re.compile(rf"#({issue_number})\b")
-
-    for commit in commits:
-        mensaje = commit["commit"]["message"]
-        if patron.search(mensaje):
-            vinculados.append(mensaje.splitlines()[0])
-            autor = commit["commit"]["author"]["name"]
-            autores.add(autor)
-
-    return "; ".join(vinculados), ", ".join(autores)
+    print("pip install reportlab")
+
+
+def configurar_cliente(token=None, repo=None):
+    # Reemplaza el cliente compartido (p. ej. cuando la GUI cambia de repo)
+    global _cliente, _punto_control, GITHUB_TOKEN, REPO, HEADERS, BASE_URL
+    if token is not None:
+        GITHUB_TOKEN = token
+    if repo is not None:
+        REPO = repo
+    HEADERS = {
+        "Authorization": f"token {GITHUB_TOKEN}",
+        "Accept": "application/vnd.github.v3+json"
+    }
+    BASE_URL = f"https://github.com/{REPO}"
+
+    if _cliente is not None:
+        _cliente.cerrar()
+    _punto_control = None
+    cache = None
+    if CACHE_HTTP:
+        cache = CacheHTTP(
+            os.path.join(CACHE_DIR, "http"),
+            max_bytes=CACHE_MAX_MB * 1024 * 1024)
+    _cliente = GitHubClient(GITHUB_TOKEN, REPO, api_url=GITHUB_API_URL, cache=cache)
+    return _cliente
+
+
+def obtener_cliente():
+    if _cliente is None:
+        return configurar_cliente()
+    return _cliente
+
+
+def obtener_punto_control():
+    # Progreso de la ejecución actual (None si CHECKPOINT está desactivado)
+    global _punto_control
+    if CHECKPOINT and _punto_control is None:
+        _punto_control = PuntoControl(os.path.join(CACHE_DIR, "checkpoint"), REPO)
+    return _punto_control
+
+
+def finalizar_punto_control():
+    # La ejecución terminó bien: la próxima empieza desde cero y reutiliza
+    # los hilos guardados en el almacén de los items que no cambien
+    global _punto_control
+    if _punto_control is not None:
+        _punto_control.limpiar()
+        _punto_control = None
+    almacen = obtener_almacen()
+    if almacen is not None and not SIN_CONEXION:
+        almacen.registrar_ejecucion(REPO)
+
+
+def obtener_almacen():
+    # Almacén local SQLite (None si ALMACEN_LOCAL y SIN_CONEXION están desactivados)
+    global _almacen
+    if not (ALMACEN_LOCAL or SIN_CONEXION):
+        return None
+    with _lock_almacen:
+        if _almacen is None:
+            _almacen = AlmacenLocal(ALMACEN_RUTA)
+    return _almacen
+
+
+def _guardar_paginas(paginas, guardar):
+    # Guarda cada página en el almacén local a medida que pasa hacia el consumidor
+    with closing(paginas):
+        for pagina in paginas:
+            guardar(REPO, pagina)
+            yield pagina
+
+
+def iterar_issues_y_prs(since=None):
+    # Genera las páginas de issues y PRs a medida que se descargan, los
+    # creados primero antes: los items nuevos van al final y no desplazan
+    # las páginas ya guardadas en el punto de control
+    cliente = obtener_cliente()
+    params = {"state": "all", "sort": "created", "direction": "asc"}
+    if since:
+        params["since"] = since
+    paginas = cliente.iterar_paginas(
+        cliente.url_repo("/issues"),
+        params=params,
+        max_workers=MAX_WORKERS,
+        checkpoint=obtener_punto_control())
+    almacen = obtener_almacen()
+    return _guardar_paginas(paginas, almacen.guardar_issues) if almacen else paginas
+
+
+def iterar_commits(since=None):
+    # Genera las páginas de commits a medida que se descargan
+    if GIT_REPO_LOCAL:
+        paginas = iterar_commits_locales(
+            GIT_REPO_LOCAL, since, GIT_NUMSTAT, url_base=BASE_URL)
+    elif MODO_API == "graphql":
+        # Historial en lotes de 100 con líneas agregadas/eliminadas
+        paginas = BackendGraphQL(obtener_cliente()).iterar_historial_commits(since)
+    else:
+        cliente = obtener_cliente()
+        params = {"since": since} if since else {}
+        punto_control = obtener_punto_control()
+        if punto_control is not None:
+            # /commits lista los más recientes primero: el until guardado deja
+            # fuera los commits posteriores al inicio y las páginas no se desplazan
+            params["until"] = punto_control.anclar(
+                "commits_until", formatear_fecha(datetime.now(timezone.utc)))
+        paginas = cliente.iterar_paginas(
+            cliente.url_repo("/commits"),
+            params=params,
+            max_workers=MAX_WORKERS,
+            checkpoint=punto_control)
+    almacen = obtener_almacen()
+    return _guardar_paginas(paginas, almacen.guardar_commits) if almacen else paginas
+
+
+def obtener_issues_y_prs(since=None):
+    return [issue for pagina in iterar_issues_y_prs(since) for issue in pagina]
+
+
+def obtener_commits(since=None):
+    return [commit for pagina in iterar_commits(since) for commit in pagina]
+
+
+def indexar_commits(commits):
+    # Recorre los commits una sola vez y agrupa por issue referenciado
+    # (#N, GH-N, URLs, fixes #N...): {"N": [(línea, autor, tipo), ...]}
+    return indexar_referencias(commits, REPO)
+
+
+def vincular_commits(issue_number, indice):
+    # Consulta en el índice los commits de un issue. Devuelve los commits
+    # que lo referencian, sus autores y los que lo cierran
+    vinculados = indice.get(str(issue_number), [])
+    autores = dict.fromkeys(autor for _, autor, _ in vinculados)
+    cierres = [linea for linea, _, tipo in vinculados if tipo == CIERRA]
+    return ("; ".join(linea for linea, _, _ in vinculados), ", ".join(autores),
+            "; ".join(cierres))
+
+
+def formatear_comentarios(comentarios):
+    return "\n".join(
+        [f"- {c['user']['login']}: {c['body']}" for c in comentarios])
+
+
+def descargar_comentarios(numero):
+    # Hilo de comentarios sin formatear; reutiliza el punto de control
+    punto_control = obtener_punto_control()
+    comentarios = None
+    if punto_control is not None:
+        comentarios = punto_control.leer_comentarios(numero)
+
+    if comentarios is None:
+        cliente = obtener_cliente()
+        try:
+            comentarios = cliente.obtener_paginado(
+                cliente.url_repo(f"/issues/{numero}/comments"),
+                max_workers=MAX_WORKERS)
+        except requests.HTTPError as e:
+            # Issue eliminado o transferido: sin comentarios
+            if e.response is None or e.response.status_code not in (404, 410):
+                raise
+            comentarios = []
+        if punto_control is not None:
+            punto_control.guardar_comentarios(numero, comentarios)
+
+    # También los hilos del punto de control: se borra al terminar la ejecución
+    almacen = obtener_almacen()
+    if almacen is not None:
+        almacen.guardar_comentarios(REPO, numero, comentarios)
+    return comentarios
 
 
 def obtener_comentarios(numero):
-    url = f"https://api.github.com/repos/{REPO}/issues/{numero}/comments"
-    r = requests.get(url, headers=HEADERS)
-    if r.status_code == 200:
-        comentarios = r.json()
-        return "\n".join(
-            [f"- {c['user']['login']}: {c['body']}" for c in comentarios])
-    return ""
+    return formatear_comentarios(descargar_comentarios(numero))
 
 
-def generar_excel(filas):
-    # Crear directorio de reportes si no existe
-    carpeta_reportes = "reportes"
-    os.makedirs(carpeta_reportes, exist_ok=True)
+def descargar_comentarios_concurrente(numeros, max_workers=None):
+    # Descarga los hilos de comentarios en paralelo: {numero: [comentario, ...]}
+    numeros = list(numeros)
+    if not numeros:
+        return {}
+    trabajadores = max(1, max_workers or MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=trabajadores) as executor:
+        hilos = executor.map(descargar_comentarios, numeros)
+        return dict(zip(numeros, hilos))
 
-    df = pd.DataFrame(filas)
-    df.to_excel(
-        os.path.join(
-            carpeta_reportes,
-            "reporte_completo.xlsx"),
-        index=False)
 
+def obtener_comentarios_concurrente(numeros, max_workers=None):
+    # Descarga los hilos de comentarios en paralelo: {numero: texto}
+    return {
+        numero: formatear_comentarios(lista)
+        for numero, lista in descargar_comentarios_concurrente(numeros, max_workers).items()}
 
-def generar_markdown(filas):
+
+def generar_excel(filas):
     # Crear directorio de reportes si no existe
     carpeta_reportes = "reportes"
     os.makedirs(carpeta_reportes, exist_ok=True)
 
-    markdown = "# Reporte de Issues y Pull Requests\n\n"
-    for item in filas:
-        markdown += f"""
-## [{item['Tipo']} #{item['ID']}]({item['URL']}) - {item['Título']}
-
-**Estado:** {item['Estado']}
-**Asignado a:** {item['Asignado a']}
-**Creado:** {item['Creado']}
-**Cerrado:** {item['Cerrado']}
+    # Escritura en streaming: el libro no se mantiene en memoria y las
+    # fechas quedan como celdas de fecha de Excel
+    dataset = DatasetReporte.desde(filas)
+    escritor = EscritorExcel(
+        os.path.join(carpeta_reportes, "reporte_completo.xlsx"),
+        columnas=dataset.df.columns)
+    try:
+        for valores in dataset.iterar_valores():
+            escritor.escribir_valores(valores)
+    finally:
+        escritor.cerrar()
 
-### Descripción
-{item['Descripción']}
 
-### Commits Vinculados
-{item['Commits Vinculados']}
+def generar_excel_normalizado(filas, commits, comentarios):
+    # Libro con una fila por item, por comentario, por commit y por enlace
+    # issue↔commit, escrito en streaming como generar_excel
+    carpeta_reportes = "reportes"
+    os.makedirs(carpeta_reportes, exist_ok=True)
 
-### Autores de Commits
-{item['Autores Commits']}
+    dataset = DatasetReporte.desde(filas)
+    enlaces = list(enlazar_commits(commits, REPO))
+    commits_por_item = {}
+    for numero, _, _ in enlaces:
+        commits_por_item[numero] = commits_por_item.get(numero, 0) + 1
 
-### Comentarios
-{item['Comentarios']}
+    escritor = EscritorExcelNormalizado(
+        os.path.join(carpeta_reportes, "reporte_completo.xlsx"))
+    try:
+        columnas = list(dataset.df.columns)
+        for valores in dataset.iterar_valores():
+            item = dict(zip(columnas, valores))
+            escritor.escribir_item(
+                item, len(comentarios.get(item["ID"], ())), commits_por_item.get(item["ID"], 0))
+        for numero, lista in comentarios.items():
+            for comentario in lista:
+                escritor.escribir_comentario(numero, comentario)
+        for commit in commits:
+            escritor.escribir_commit(commit)
+        for numero, sha, tipo in enlaces:
+            escritor.escribir_enlace(numero, sha, tipo)
+    finally:
+        escritor.cerrar()
+
+
+def ruta_markdown(carpeta="reportes"):
+    # Archivo Markdown del reporte, con extensión .gz si se escribe comprimido
+    nombre = "reporte_completo.md.gz" if MARKDOWN_GZIP else "reporte_completo.md"
+    return os.path.join(carpeta, nombre)
 
----
 
-"""
-    with open(os.path.join(carpeta_reportes, "reporte_completo.md"), "w", encoding="utf-8") as f:
-        f.write(markdown)
+def generar_markdown(filas):
+    # Escribe cada sección en el archivo en cuanto se lee su fila, sin
+    # reunir el documento en memoria. Acepta el dataset, una lista o
+    # cualquier iterador de filas (Fila o diccionarios con las columnas)
+    escritor = EscritorMarkdown(ruta_markdown())
+    try:
+        escritor.escribir_todas(filas)
+    finally:
+        escritor.cerrar()
 
 
-def generar_pdf_desde_markdown(filas=None):
+def generar_pdf_desde_markdown(filas=None, analytics=None):
+    # Genera el PDF directamente desde las filas (el nombre se mantiene por
+    # compatibilidad: ya no se relee el Markdown ni se convierte a HTML).
+    # Sin filas usa el DataFrame del analytics recibido (p. ej. de una instantánea)
     if not PDF_DISPONIBLE:
         print("No se puede generar PDF: Faltan dependencias necesarias.")
         print("Consulta el archivo REPORTLAB_INSTRUCCIONES.md para más información.")
         return
 
     try:
-        # Crear directorio de reportes si no existe
         carpeta_reportes = "reportes"
         os.makedirs(carpeta_reportes, exist_ok=True)
 
-        # Leer el archivo markdown
-        with open(os.path.join(carpeta_reportes, "reporte_completo.md"), "r", encoding="utf-8") as f:
-            md_text = f.read()
-
-        # Convertir markdown a HTML
-        html = markdown2.markdown(md_text)
-
-        # Extraer nombre de repositorio y organización
-        repo_parts = REPO.split('/')
-        org_name = repo_parts[0] if len(repo_parts) > 0 else ""
-        repo_name = repo_parts[1] if len(repo_parts) > 1 else ""
-
-        # Crear función para encabezado y pie de página
-        def add_page_number(canvas, doc):
-            # Guardar estado
-            canvas.saveState()
-
-            # Dibujar encabezado
-            canvas.setFillColor(colors.darkblue)
-            canvas.setFont('Helvetica-Bold', 8)
-            canvas.drawString(
-                doc.leftMargin,
-                doc.height + doc.topMargin - 10,
-                f"Reporte GitHub: {REPO}")
-
-            # Dibujar una línea separadora
-            canvas.setStrokeColor(colors.darkblue)
-            canvas.line(
-                doc.leftMargin,
-                doc.height + doc.topMargin - 15,
-                doc.width + doc.leftMargin,
-                doc.height + doc.topMargin - 15)
-
-            # Dibujar fecha en esquina superior derecha
-            current_date = pd.Timestamp.now().strftime('%d-%m-%Y')
-            date_width = canvas.stringWidth(current_date, 'Helvetica', 8)
-            canvas.setFont('Helvetica', 8)
-            canvas.drawString(doc.width + doc.leftMargin - date_width,
-                              doc.height + doc.topMargin - 10, current_date)
-
-            # Dibujar pie de página con número de página
-            page_num = canvas.getPageNumber()
-            canvas.setFont('Helvetica', 8)
-            canvas.drawString(
-                doc.leftMargin,
-                doc.bottomMargin - 20,
-                f"Página {page_num}")
-
-            # Línea separadora en pie de página
-            canvas.line(doc.leftMargin, doc.bottomMargin - 15,
-                        doc.width + doc.leftMargin, doc.bottomMargin - 15)
-
-            # Restaurar estado
-            canvas.restoreState()
-
-        # Crear un documento PDF
-        pdf_path = os.path.join(carpeta_reportes, "reporte_completo.pdf")
-        doc = SimpleDocTemplate(
-            pdf_path,
-            pagesize=A4,
-            rightMargin=50,
-            leftMargin=50,
-            topMargin=60,
-            bottomMargin=50
-        )
-
-        # Definir paleta de colores personalizada
-        GITHUB_BLUE = colors.Color(0.125, 0.416, 0.702)   # Azul de GitHub
-        GITHUB_GREEN = colors.Color(0.157, 0.675, 0.235)  # Verde de GitHub
-        GITHUB_RED = colors.Color(0.835, 0.243, 0.309)    # Rojo de GitHub
-        GITHUB_PURPLE = colors.Color(0.584, 0.345, 0.698)  # Púrpura de GitHub
-        GITHUB_GRAY = colors.Color(0.6, 0.6, 0.6)         # Gris de GitHub
-
-        # Definir estilos personalizados
-        styles = getSampleStyleSheet()
-
-        # Estilo para el título principal
-        styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=styles['Title'],
-            fontSize=28,
-            textColor=GITHUB_BLUE,
-            spaceAfter=16,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        ))
-
-        # Estilo para el subtítulo en la portada
-        styles.add(ParagraphStyle(
-            name='CoverSubtitle',
-            parent=styles['Heading2'],
-            fontSize=20,
-            textColor=GITHUB_BLUE,
-            spaceBefore=10,
-            spaceAfter=16,
-            alignment=TA_CENTER,
-        ))
-
-        # Estilo para subtítulos
-        styles.add(ParagraphStyle(
-            name='CustomHeading2',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=GITHUB_BLUE,
-            spaceBefore=14,
-            spaceAfter=8,
-            borderWidth=1,
-            borderColor=colors.lightgrey,
-            borderPadding=6,
-            borderRadius=6,
-            leading=20
-        ))
-
-        # Estilo para sub-subtítulos
-        styles.add(ParagraphStyle(
-            name='CustomHeading3',
-            parent=styles['Heading3'],
-            fontSize=14,
-            textColor=GITHUB_PURPLE,
-            spaceBefore=10,
-            spaceAfter=6,
-            leading=16
-        ))
-
-        # Estilo para el texto normal
-        styles.add(ParagraphStyle(
-            name='CustomNormal',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceBefore=4,
-            spaceAfter=6,
-            leading=14
-        ))
-
-        # Estilo para fecha
-        styles.add(ParagraphStyle(
-            name='DateStyle',
-            parent=styles['Normal'],
-            fontSize=12,
-            textColor=GITHUB_GRAY,
-            alignment=TA_CENTER
-        ))
-
-        # Estilo para issue abierto
-        styles.add(ParagraphStyle(
-            name='IssueOpen',
-            parent=styles['CustomHeading2'],
-            backColor=colors.Color(0.95, 0.95, 1.0),  # Lavender claro
-            borderColor=GITHUB_PURPLE,
-        ))
-
-        # Estilo para PR abierto
-        styles.add(ParagraphStyle(
-            name='PROpen',
-            parent=styles['CustomHeading2'],
-            backColor=colors.Color(0.9, 1.0, 0.9),  # Verde claro
-            borderColor=GITHUB_GREEN,
-        ))
-
-        # Estilo para issue/PR cerrado
-        styles.add(ParagraphStyle(
-            name='Closed',
-            parent=styles['CustomHeading2'],
-            backColor=colors.Color(0.95, 0.95, 0.95),  # Gris claro
-            borderColor=GITHUB_GRAY,
-        ))
-
-        # Elementos que formarán el PDF
-        elements = []
-
-        # === PORTADA ===
-
-        # Añadir un espacio al principio
-        elements.append(Spacer(1, 1.5 * inch))
-
-        # Logo de GitHub (simulado con texto estilizado)
-        elements.append(Paragraph(
-            '<font size="38" color="#333333"><b>GitHub</b></font>',
-            styles['Title']
-        ))
-        elements.append(Spacer(1, 0.5 * inch))
-
-        # Título del reporte
-        elements.append(Paragraph(
-            f"Reporte de Issues y Pull Requests",
-            styles['CustomTitle']
-        ))
-        elements.append(Spacer(1, 0.25 * inch))
-
-        # Subtítulo con nombre del repositorio
-        repo_display = f"{org_name}/<b>{repo_name}</b>"
-        elements.append(Paragraph(
-            repo_display,
-            styles['CoverSubtitle']
-        ))
-
-        # Añadir fecha de generación
-        elements.append(Spacer(1, 0.5 * inch))
-        elements.append(
-            Paragraph(
-                f"Generado el {
-                    pd.Timestamp.now().strftime('%d de %B de %Y, %H:%M')}",
-                styles['DateStyle']))
-
-        elements.append(Spacer(1, 1.5 * inch))
-
-        # Extraer texto del HTML
-        import re
-        text = re.sub(r'<[^>]*>', '', html)
-
-        # Procesar el contenido
-        lines = text.split('\n')
-        current_section = None
-        issue_count = {
-            'issue_open': 0,
-            'issue_closed': 0,
-            'pr_open': 0,
-            'pr_closed': 0}
-
-        # Primera pasada: contar tipos de issues para el resumen
-        for line in lines:
-            if line.strip() and "Issue #" in line and "state: open" in line.lower():
-                issue_count['issue_open'] += 1
-            elif line.strip() and "Issue #" in line and "state: closed" in line.lower():
-                issue_count['issue_closed'] += 1
-            elif line.strip() and "Pull Request #" in line and "state: open" in line.lower():
-                issue_count['pr_open'] += 1
-            elif line.strip() and "Pull Request #" in line and "state: closed" in line.lower():
-                issue_count['pr_closed'] += 1
-          # === TABLA RESUMEN ===
-
-        # Título de la sección de resumen
-        elements.append(
-            Paragraph(
-                "Resumen del Repositorio",
-                styles['CustomHeading3']))
-        elements.append(Spacer(1, 0.2 * inch))
-
-        # Generar estadísticas avanzadas con analytics si hay datos disponibles
-        stats_avanzadas = {}
-        if filas:
-            try:
-                # Inicializar GitHubAnalytics con los datos
+        if filas is None and analytics is None:
+            print("No hay datos para generar el PDF.")
+            return False
+        if filas is None:
+            filas = DatasetReporte(df=analytics.df[[c for c in COLUMNAS if c in analytics.df.columns]])
+
+        # Estadísticas avanzadas (se reutiliza el analytics ya preparado)
+        estadisticas = {}
+        try:
+            if analytics is None:
+                filas = DatasetReporte.desde(filas)
                 analytics = GitHubAnalytics(filas)
-                # Obtener estadísticas detalladas
-                stats_avanzadas = analytics.obtener_estadisticas_resumen()
-                print(
-                    f"Estadísticas generadas con GitHubAnalytics: {
-                        len(stats_avanzadas)} métricas")
-            except Exception as e:
-                print(f"Error al generar estadísticas avanzadas: {e}")
-
-        # Si tenemos estadísticas avanzadas, usarlas
-        if stats_avanzadas:
-            # Usar los valores de GitHubAnalytics
-            issue_count['issue_open'] = stats_avanzadas.get(
-                'issues_abiertos', issue_count['issue_open'])
-            issue_count['issue_closed'] = stats_avanzadas.get(
-                'issues_cerrados', issue_count['issue_closed'])
-            issue_count['pr_open'] = stats_avanzadas.get(
-                'prs_abiertos', issue_count['pr_open'])
-            issue_count['pr_closed'] = stats_avanzadas.get(
-                'prs_cerrados', issue_count['pr_closed'])
-
-        # Tabla de resumen mejorada
-        table_data = [
-            ['', 'Abiertos', 'Cerrados', 'Total'],
-            ['Issues', issue_count['issue_open'], issue_count['issue_closed'],
-             issue_count['issue_open'] + issue_count['issue_closed']],
-            ['Pull Requests', issue_count['pr_open'], issue_count['pr_closed'],
-             issue_count['pr_open'] + issue_count['pr_closed']],
-            ['Total',
-             issue_count['issue_open'] + issue_count['pr_open'],
-             issue_count['issue_closed'] + issue_count['pr_closed'],
-             sum(issue_count.values())]
-        ]
-
-        # Crear tabla de resumen con mejor formato
-        table = Table(table_data, colWidths=[120, 80, 80, 80])
-        table.setStyle(TableStyle([
-            # Encabezados
-            ('BACKGROUND', (0, 0), (-1, 0), GITHUB_BLUE),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('TOPPADDING', (0, 0), (-1, 0), 10),
-
-            # Primera columna (tipos)
-            ('BACKGROUND', (0, 1), (0, -1), colors.Color(0.95, 0.95, 0.95)),
-            ('TEXTCOLOR', (0, 1), (0, -1), GITHUB_BLUE),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-
-            # Contenido - abiertos (verde)
-            ('BACKGROUND', (1, 1), (1, -2), colors.Color(0.9, 1.0, 0.9)),
-            ('TEXTCOLOR', (1, 1), (1, -1), GITHUB_GREEN),
-
-            # Contenido - cerrados (gris)
-            ('BACKGROUND', (2, 1), (2, -2), colors.Color(0.95, 0.95, 0.95)),
-            ('TEXTCOLOR', (2, 1), (2, -1), GITHUB_GRAY),
-
-            # Totales
-            ('BACKGROUND', (3, 1), (3, -2), colors.Color(0.95, 0.95, 1.0)),
-            ('BACKGROUND', (0, -1), (-1, -1), GITHUB_BLUE),
-            ('TEXTCOLOR', (0, -1), (-1, -1), colors.white),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-
-            # Bordes
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-            ('BOX', (0, 0), (-1, -1), 1, GITHUB_BLUE),
-        ]))
-        elements.append(table)
-        elements.append(Spacer(1, 0.3 * inch))
-
-        # Añadir estadísticas avanzadas si están disponibles
-        if stats_avanzadas and len(stats_avanzadas) > 4:
-            elements.append(
-                Paragraph(
-                    "Estadísticas Detalladas",
-                    styles['CustomHeading3']))
-            elements.append(Spacer(1, 0.15 * inch))
-
-            # Crear una tabla para las estadísticas avanzadas
-            advanced_stats_data = [
-                [
-                    'Métrica', 'Valor'], [
-                    'Tiempo promedio de resolución', f"{
-                        stats_avanzadas.get(
-                            'tiempo_promedio_resolucion', 0)} días"], [
-                        'Tiempo mediano de resolución', f"{
-                            stats_avanzadas.get(
-                                'tiempo_mediano_resolucion', 0)} días"], [
-                                    'Contribuidores únicos', f"{
-                                        stats_avanzadas.get(
-                                            'contribuidores_unicos', 0)}"], [
-                                                'Período de análisis', f"{
-                                                    stats_avanzadas.get(
-                                                        'fecha_min', 'N/A')} a {
-                                                            stats_avanzadas.get(
-                                                                'fecha_max', 'N/A')}"]]
-
-            # Crear tabla de estadísticas avanzadas
-            advanced_stats_table = Table(
-                advanced_stats_data, colWidths=[200, 160])
-            advanced_stats_table.setStyle(TableStyle([
-                # Encabezados
-                ('BACKGROUND', (0, 0), (-1, 0), GITHUB_BLUE),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 0), (-1, 0), 8),
-
-                # Primera columna (métricas)
-                ('BACKGROUND', (0, 1), (0, -1), colors.Color(0.95, 0.95, 0.95)),
-                ('TEXTCOLOR', (0, 1), (0, -1), GITHUB_BLUE),
-                ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-                ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 1), (1, -1), 'CENTER'),
-
-                # Bordes
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ]))
-
-            elements.append(advanced_stats_table)
-            elements.append(Spacer(1, 0.2 * inch))
-
-        # Información adicional
-        if sum(issue_count.values()) > 0:
-            # Cálculo de porcentajes
-            porcentaje_abiertos = (
-                issue_count['issue_open'] + issue_count['pr_open']) / sum(issue_count.values()) * 100
-            porcentaje_cerrados = (
-                issue_count['issue_closed'] + issue_count['pr_closed']) / sum(issue_count.values()) * 100
-
-            elements.append(
-                Paragraph(
-                    f"<b>Estado del repositorio:</b> {
-                        porcentaje_abiertos:.1f}% abiertos, {
-                        porcentaje_cerrados:.1f}% cerrados",
-                    styles['CustomNormal']))
-
-        # Añadir página nueva
-        elements.append(PageBreak())
-
-        # === ÍNDICE DE CONTENIDO ===
-        elements.append(
-            Paragraph(
-                "Índice de Contenido",
-                styles['CustomTitle']))
-        elements.append(Spacer(1, 0.25 * inch))
-
-        # Crear un índice simple
-        if issue_count['issue_open'] > 0:
-            elements.append(
-                Paragraph(
-                    "1. Issues Abiertos",
-                    styles['CustomHeading3']))
-        if issue_count['issue_closed'] > 0:
-            elements.append(
-                Paragraph(
-                    "2. Issues Cerrados",
-                    styles['CustomHeading3']))
-        if issue_count['pr_open'] > 0:
-            elements.append(
-                Paragraph(
-                    "3. Pull Requests Abiertos",
-                    styles['CustomHeading3']))
-        if issue_count['pr_closed'] > 0:
-            elements.append(
-                Paragraph(
-                    "4. Pull Requests Cerrados",
-                    styles['CustomHeading3']))
-
-        elements.append(PageBreak())
-
-        # === CONTENIDO DETALLADO ===
-
-        # Segunda pasada: procesar el contenido
-        in_issue_block = False
-        current_issue = {}
-        section_counter = 0
-        last_section = None
-
-        for line in lines:
-            if line.strip():
-                # Detectar inicio de un nuevo issue/PR
-                if line.startswith('# '):
-                    elements.append(Paragraph(line[2:], styles['CustomTitle']))
-                    elements.append(Spacer(1, 0.25 * inch))
-
-                elif line.startswith('## '):
-                    # Determinar tipo de sección
-                    current_section = None
-                    if "Issue #" in line and "state: open" in line.lower():
-                        current_section = "issue_open"
-                    elif "Issue #" in line and "state: closed" in line.lower():
-                        current_section = "issue_closed"
-                    elif "Pull Request #" in line and "state: open" in line.lower():
-                        current_section = "pr_open"
-                    elif "Pull Request #" in line and "state: closed" in line.lower():
-                        current_section = "pr_closed"
-
-                    # Si cambiamos de tipo de sección, agregar encabezado de
-                    # sección
-                    if current_section != last_section:
-                        section_counter += 1
-                        if current_section == "issue_open":
-                            elements.append(
-                                Paragraph(
-                                    f"{section_counter}. Issues Abiertos",
-                                    styles['CustomTitle']))
-                        elif current_section == "issue_closed":
-                            elements.append(
-                                Paragraph(
-                                    f"{section_counter}. Issues Cerrados",
-                                    styles['CustomTitle']))
-                        elif current_section == "pr_open":
-                            elements.append(
-                                Paragraph(
-                                    f"{section_counter}. Pull Requests Abiertos",
-                                    styles['CustomTitle']))
-                        elif current_section == "pr_closed":
-                            elements.append(
-                                Paragraph(
-                                    f"{section_counter}. Pull Requests Cerrados",
-                                    styles['CustomTitle']))
-
-                        elements.append(Spacer(1, 0.5 * inch))
-                        last_section = current_section
-
-                    if in_issue_block:
-                        # Añadir separador entre issues
-                        elements.append(Spacer(1, 0.25 * inch))
-                        elements.append(PageBreak())
-
-                    in_issue_block = True
-
-                    # Aplicar estilo según tipo
-                    if "Issue #" in line and "state: open" in line.lower():
-                        style_to_use = 'IssueOpen'
-                    elif "Pull Request #" in line and "state: open" in line.lower():
-                        style_to_use = 'PROpen'
-                    else:  # Cerrado
-                        style_to_use = 'Closed'
-
-                    # Extraer número para formato
-                    numero_match = re.search(r'#(\d+)', line)
-                    numero = numero_match.group(1) if numero_match else ""
-
-                    # Mejorar formato del título
-                    titulo_issue = line[3:]
-                    elementos_titulo = titulo_issue.split(" - ", 1)
-                    if len(elementos_titulo) > 1:
-                        identificador = elementos_titulo[0]
-                        titulo_real = elementos_titulo[1]
-                        titulo_formateado = f"{identificador}<br/><font size='14'>{titulo_real}</font>"
-                    else:
-                        titulo_formateado = titulo_issue
-
-                    p = Paragraph(titulo_formateado, styles[style_to_use])
-                    elements.append(p)
-
-                elif line.startswith('### '):
-                    elements.append(Spacer(1, 0.1 * inch))
-                    elements.append(
-                        Paragraph(line[4:], styles['CustomHeading3']))
-
-                elif line.startswith('**'):
-                    # Mejorar formato de metadatos
-                    metadata_text = line
-
-                    # Colorear según estado
-                    if "state: open" in metadata_text.lower():
-                        metadata_text = metadata_text.replace(
-                            "state: open",
-                            "<font color='#28a745'><b>state: OPEN</b></font>"
-                        )
-                    elif "state: closed" in metadata_text.lower():
-                        metadata_text = metadata_text.replace(
-                            "state: closed",
-                            "<font color='#cb2431'><b>state: CLOSED</b></font>"
-                        )
-
-                    # Estilo para metadatos
-                    metadata_style = ParagraphStyle(
-                        name='Metadata',
-                        parent=styles['CustomNormal'],
-                        backColor=colors.Color(
-                            0.97, 0.97, 0.97),  # Gris muy claro
-                        borderPadding=6,
-                        borderWidth=0.5,
-                        borderColor=colors.lightgrey,
-                        borderRadius=4
-                    )
-                    elements.append(Paragraph(metadata_text, metadata_style))
-
-                else:
-                    # Texto normal
-                    # Saltar líneas vacías o separadores
-                    if line.strip() == '---':
-                        elements.append(Spacer(1, 0.1 * inch))
-                    else:
-                        # Sanitizar texto con caracteres especiales
-                        line = line.replace("✅", "(Correcto)")
-                        line = line.replace("❌", "(Error)")
-                        line = line.replace("⚠️", "(Advertencia)")
-
-                        # Añadir formato para enlaces si existen - con mejor
-                        # manejo de caracteres especiales
-                        if "http://" in line or "https://" in line:
-                            try:
-                                # Patrón de URL más seguro
-                                pattern = r'(https?://[^\s"\'<>]+)'
-                                # Reemplazar URLs sin caracteres problemáticos
-                                line = re.sub(
-                                    pattern, lambda m: f'<link href="{
-                                        m.group(1).strip()}">{
-                                        m.group(1).strip()}</link>', line)
-                            except BaseException:
-                                # Si hay error en el procesamiento de enlaces,
-                                # mostrar texto plano
-                                pass
-
-                        elements.append(
-                            Paragraph(
-                                line, styles['CustomNormal']))
-                        elements.append(Spacer(1, 0.05 * inch))
-
-        # Construir el PDF con funciones de encabezado y pie de página
-        doc.build(
-            elements,
-            onFirstPage=add_page_number,
-            onLaterPages=add_page_number)
-
+            estadisticas = analytics.obtener_estadisticas_resumen()
+            print(f"Estadísticas generadas con GitHubAnalytics: {len(estadisticas)} métricas")
+        except Exception as e:
+            print(f"Error al generar estadísticas avanzadas: {e}")
+
+        renderizador = RenderizadorPDF(REPO)
+        ruta_pdf = os.path.join(carpeta_reportes, "reporte_completo.pdf")
+        if PDF_PROCESOS != 1:
+            renderizador.generar_en_paralelo(
+                ruta_pdf, filas, estadisticas, PDF_PROCESOS or None, PDF_ITEMS_POR_PARTE)
+        else:
+            renderizador.generar(ruta_pdf, filas, estadisticas)
         return True
     except Exception as e:
         print(f"Error al generar PDF: {str(e)}")
@@ -744,56 +410,320 @@ def generar_pdf_desde_markdown(filas=None):
         return False
 
 
-def procesar_reporte(issues, commits):
+def obtener_todos_comentarios(since=None):
+    # Descarga todos los comentarios del repositorio y los agrupa por
+    # número de issue: {numero: [comentario, ...]}
+    cliente = obtener_cliente()
+    params = {"sort": "created", "direction": "asc"}
+    if since:
+        params["since"] = since
+    comentarios = cliente.obtener_paginado(
+        cliente.url_repo("/issues/comments"),
+        params=params,
+        max_workers=MAX_WORKERS,
+        checkpoint=obtener_punto_control())
+
+    por_numero = {}
+    for comentario in comentarios:
+        numero = int(comentario["issue_url"].rstrip("/").rsplit("/", 1)[1])
+        por_numero.setdefault(numero, []).append(comentario)
+
+    almacen = obtener_almacen()
+    if almacen is not None:
+        # Con since solo llegan los cambios: se añaden a los hilos guardados
+        for numero, lista in por_numero.items():
+            almacen.guardar_comentarios(REPO, numero, lista, completo=False)
+    return por_numero
+
+
+def sincronizar_incremental():
+    # Pide solo lo actualizado desde la última ejecución y lo fusiona con
+    # el conjunto de datos guardado. Devuelve (issues, commits, comentarios)
+    almacen = obtener_almacen()
+    if almacen is not None:
+        # Las descargas se guardan solas en el almacén; sus marcas dicen desde cuándo pedir
+        marcas = almacen.marcas(REPO)
+        obtener_issues_y_prs(since=marcas['issues'])
+        obtener_commits(since=marcas['commits'])
+        obtener_todos_comentarios(since=marcas['comentarios'])
+        print(f"Sincronización incremental (almacén local): marcas {marcas}")
+        return leer_almacen()
+
+    estado = EstadoSincronizacion.cargar(os.path.join(CACHE_DIR, "sync"), REPO)
+    primera_vez = not estado.issues
+
+    estado.fusionar_issues(obtener_issues_y_prs(since=estado.marcas['issues']))
+    estado.fusionar_commits(obtener_commits(since=estado.marcas['commits']))
+    estado.fusionar_comentarios(
+        obtener_todos_comentarios(since=estado.marcas['comentarios']))
+    estado.guardar()
+
+    if not primera_vez:
+        print(f"Sincronización incremental: marcas {estado.marcas}")
+    return estado.issues_ordenados(), estado.commits, estado.comentarios
+
+
+def hilos_ejecucion_anterior(issues):
+    # Fecha de la última ejecución completada y los hilos que dejó en el
+    # almacén para los items dados: {numero: [comentario, ...]}. (None, None) sin almacén
+    almacen = obtener_almacen()
+    ultima = almacen.ultima_ejecucion(REPO) if almacen is not None else None
+    if ultima is None:
+        return None, None
+    return ultima, almacen.hilos(REPO, [i["number"] for i in issues if i.get("comments")])
+
+
+def descargar_comentarios_planificados(issues, max_workers=None, modo_comentarios=None,
+                                      ultima_ejecucion=None, comentarios_previos=None,
+                                      plan_total=None, todos_comentarios=None, hilos=None):
+    # Decidir qué hilos de comentarios hay que pedir realmente. Sin datos
+    # previos explícitos se usan los de la última ejecución en el almacén.
+    # Con plan_total (un PlanComentarios) el resumen se acumula en él en
+    # lugar de imprimirse, p. ej. para una sola línea por ejecución del pipeline.
+    # En modo masivo, todos_comentarios devuelve la descarga en bloque
+    # (por defecto obtener_todos_comentarios), p. ej. una sola para varias páginas.
+    # Con hilos (un diccionario) se guardan en él los comentarios sin formatear
+    # de cada hilo obtenido, p. ej. para el Excel normalizado
+    previos = {}
+    if ultima_ejecucion is None and comentarios_previos is None:
+        ultima_ejecucion, previos = hilos_ejecucion_anterior(issues)
+        previos = previos or {}
+        comentarios_previos = {numero: formatear_comentarios(lista) for numero, lista in previos.items()}
+    plan = planificar_comentarios(
+        issues, ultima_ejecucion, comentarios_previos, COMENTARIOS_TIPOS)
+    if plan_total is None:
+        print(plan.resumen())
+    else:
+        plan_total.sumar(plan)
+
+    descargados = {}
+    if plan.descargar and (modo_comentarios or MODO_COMENTARIOS) == "masivo":
+        pendientes = set(plan.descargar)
+        descargados = {
+            numero: lista
+            for numero, lista in (todos_comentarios or obtener_todos_comentarios)().items()
+            if numero in pendientes}
+    elif plan.descargar:
+        descargados = descargar_comentarios_concurrente(plan.descargar, max_workers)
+
+    if hilos is not None:
+        # Los reutilizados de la ejecución anterior y los recién descargados
+        hilos.update({numero: previos[numero] for numero, texto in plan.resueltos.items()
+                      if texto and numero in previos})
+        hilos.update({numero: lista for numero, lista in descargados.items() if lista})
+    comentarios_por_numero = dict(plan.resueltos)
+    comentarios_por_numero.update({
+        numero: formatear_comentarios(lista) for numero, lista in descargados.items()})
+    return comentarios_por_numero
+
+
+def obtener_issues_graphql():
+    # Issues, PRs y comentarios en consultas GraphQL de 100 nodos.
+    # Devuelve (issues, comentarios) con la misma forma que la API REST
+    issues, comentarios = BackendGraphQL(obtener_cliente()).obtener_issues_y_comentarios()
+    almacen = obtener_almacen()
+    if almacen is not None:
+        almacen.guardar_issues(REPO, issues)
+        for numero, lista in comentarios.items():
+            almacen.guardar_comentarios(REPO, numero, lista)
+    return issues, comentarios
+
+
+def leer_almacen():
+    # Issues, commits y comentarios guardados en el almacén local, sin
+    # llamar a la API. Devuelve (issues, commits, comentarios)
+    almacen = obtener_almacen() or AlmacenLocal(ALMACEN_RUTA)
+    return almacen.issues(REPO), almacen.commits(REPO), almacen.comentarios(REPO)
+
+
+def construir_fila(issue, indice_commits, comentarios):
+    # Fila del reporte de un issue o PR con sus comentarios ya formateados
+    commits_texto, autores, cierres = vincular_commits(issue["number"], indice_commits)
+    return Fila.desde_issue(issue, comentarios, commits_texto, autores, cierres)
+
+
+def procesar_reporte(issues, commits, max_workers=None, modo_comentarios=None,
+                     ultima_ejecucion=None, comentarios_previos=None,
+                     comentarios=None, hilos=None):
+    # Con hilos (un diccionario) se guardan en él los comentarios descargados
+    # sin formatear (ver descargar_comentarios_planificados)
     filas = []
 
+    # Obtener todos los comentarios antes de armar las filas
+    if comentarios is not None:
+        # Ya descargados (p. ej. por la sincronización incremental)
+        comentarios_por_numero = {
+            numero: formatear_comentarios(lista)
+            for numero, lista in comentarios.items()}
+    else:
+        comentarios_por_numero = descargar_comentarios_planificados(
+            issues, max_workers, modo_comentarios,
+            ultima_ejecucion, comentarios_previos, hilos=hilos)
+
+    indice_commits = indexar_commits(commits)
     for issue in issues:
-        tipo = "Pull Request" if "pull_request" in issue else "Issue"
-        numero = issue["number"]
-        titulo = issue["title"]
-        descripcion = issue.get("body", "").strip()
-        estado = issue["state"]
-        creado = issue["created_at"]
-        cerrado = issue.get("closed_at", "")
-        asignado = issue["assignee"]["login"] if issue["assignee"] else "No asignado"
-        url = issue["html_url"]
-        comentarios = obtener_comentarios(numero)
-        commits_texto, autores = vincular_commits(numero, commits)
-
-        filas.append({
-            "ID": numero,
-            "Tipo": tipo,
-            "Título": titulo,
-            "Descripción": descripcion,
-            "Estado": estado,
-            "Asignado a": asignado,
-            "Creado": creado,
-            "Cerrado": cerrado,
-            "Comentarios": comentarios or "Sin comentarios",
-            "Commits Vinculados": commits_texto or "Ninguno",
-            "Autores Commits": autores or "Ninguno",
-            "URL": url
-        })
+        filas.append(construir_fila(
+            issue, indice_commits, comentarios_por_numero.get(issue["number"], "")))
 
     return filas
 
 
-if __name__ == "__main__":
-    issues_y_prs = obtener_issues_y_prs()
-    commits = obtener_commits()
-    filas = procesar_reporte(issues_y_prs, commits)
+def generar_reportes_pipeline(max_workers=None, modo_comentarios=None):
+    # Descarga los issues página a página y escribe cada fila en los
+    # reportes en cuanto está lista. Los commits se descargan en paralelo
+    # mientras llegan las páginas; los comentarios pasan por el planificador
+    # igual que fuera del pipeline (en modo masivo, una sola descarga en bloque).
+    # Las filas no se acumulan en memoria: se vuelcan a un FilasEnDisco para
+    # los reportes que necesitan el conjunto completo (PDF, instantánea).
+    # Devuelve (filas, commits); el llamante debe cerrar las filas
+    carpeta_reportes = "reportes"
+    escritores = [
+        EscritorExcel(os.path.join(carpeta_reportes, "reporte_completo.xlsx")),
+        EscritorMarkdown(ruta_markdown(carpeta_reportes))
+    ]
+    plan_total = PlanComentarios()
+    # Descarga en bloque (modo masivo) compartida por todas las páginas; solo
+    # se hace si el planificador deja algún hilo por pedir
+    masivos = {}
+
+    def todos_comentarios():
+        if "todos" not in masivos:
+            masivos["todos"] = obtener_todos_comentarios()
+        return masivos["todos"]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        def commits_e_indice():
+            commits = obtener_commits()
+            return commits, indexar_commits(commits)
+
+        futuro_commits = executor.submit(commits_e_indice)
+
+        def enriquecer(pagina):
+            comentarios_por_numero = descargar_comentarios_planificados(
+                pagina, max_workers, modo_comentarios, plan_total=plan_total,
+                todos_comentarios=todos_comentarios)
+            indice_commits = futuro_commits.result()[1]
+            return [
+                construir_fila(issue, indice_commits, comentarios_por_numero.get(issue["number"], ""))
+                for issue in pagina]
+
+        filas = FilasEnDisco()
+
+        def escribir(fila):
+            filas.agregar(fila)
+            for escritor in escritores:
+                escritor.escribir(fila)
+
+        try:
+            ejecutar_pipeline(
+                iterar_issues_y_prs(), [enriquecer], escribir,
+                profundidad=PIPELINE_PROFUNDIDAD)
+        except BaseException:
+            filas.cerrar()
+            raise
+        finally:
+            for escritor in escritores:
+                escritor.cerrar()
+
+    print(plan_total.resumen())
+    return filas, futuro_commits.result()[0]
+
+
+def ruta_snapshot(repo=None):
+    # Carpeta de la última instantánea Parquet del repositorio
+    return os.path.join(CACHE_DIR, "snapshots", (repo or REPO).replace("/", "__"))
+
+
+def guardar_snapshot(dataset, commits=None, repo=None):
+    # Prepara el análisis del dataset y lo guarda como instantánea Parquet.
+    # Devuelve el GitHubAnalytics preparado (None si no hay datos o pyarrow)
+    if not PARQUET_DISPONIBLE:
+        print("Nota: instala pyarrow para guardar instantáneas Parquet del reporte.")
+        return None
+    if not len(dataset):
+        return None
+    repo = repo or REPO
+    analytics = GitHubAnalytics(dataset, commits=commits, repo=repo)
+    try:
+        analytics.save_snapshot(ruta_snapshot(repo))
+    except Exception as e:
+        # Los reportes ya están escritos: la instantánea no debe impedirlo
+        print(f"No se pudo guardar la instantánea: {e}")
+    return analytics
+
+
+def cargar_snapshot(repo=None):
+    # Abre la última instantánea sin API ni prepare_data.
+    # Devuelve (dataset, analytics) o None si no hay instantánea
+    ruta = ruta_snapshot(repo)
+    if not PARQUET_DISPONIBLE or not os.path.exists(os.path.join(ruta, "items.parquet")):
+        return None
+    analytics = GitHubAnalytics.load_snapshot(ruta)
+    columnas = [c for c in COLUMNAS if c in analytics.df.columns]
+    return DatasetReporte(df=analytics.df[columnas]), analytics
 
-    generar_excel(filas)
-    generar_markdown(filas)
+
+if __name__ == "__main__":
+    # El pipeline escribe el Excel y el Markdown mientras descarga
+    reportes_escritos = False
+    commits = None
+    comentarios = None
+    snapshot = cargar_snapshot() if USAR_SNAPSHOT else None
+    if snapshot is not None:
+        filas, analytics = snapshot
+        print(f"Instantánea cargada desde {ruta_snapshot()}")
+    elif SIN_CONEXION:
+        issues_y_prs, commits, comentarios = leer_almacen()
+        filas = procesar_reporte(issues_y_prs, commits, comentarios=comentarios)
+    elif MODO_INCREMENTAL:
+        issues_y_prs, commits, comentarios = sincronizar_incremental()
+        filas = procesar_reporte(issues_y_prs, commits, comentarios=comentarios)
+    elif MODO_API == "graphql":
+        issues_y_prs, comentarios = obtener_issues_graphql()
+        commits = obtener_commits()
+        filas = procesar_reporte(issues_y_prs, commits, comentarios=comentarios)
+    elif MODO_PIPELINE:
+        filas, commits = generar_reportes_pipeline()
+        reportes_escritos = True
+    else:
+        issues_y_prs = obtener_issues_y_prs()
+        commits = obtener_commits()
+        # El Excel normalizado necesita cada comentario: se conservan los
+        # hilos que obtiene el planificador (mismos tipos y reutilización)
+        comentarios = {} if EXCEL_NORMALIZADO else None
+        filas = procesar_reporte(issues_y_prs, commits, hilos=comentarios)
+    if snapshot is None:
+        finalizar_punto_control()
+    if EXCEL_NORMALIZADO and (commits is None or comentarios is None):
+        print("⚠️ EXCEL_NORMALIZADO no se aplica con la instantánea (USAR_SNAPSHOT) ni con "
+              "MODO_PIPELINE: se escribe el Excel en una sola hoja.")
+
+    # Un único dataset tipado para todos los reportes y las estadísticas. El
+    # pipeline ya escribió el Excel y el Markdown y dejó las filas en disco:
+    # solo se cargan si las necesitan la instantánea o el PDF
+    escribir_snapshot = snapshot is None and GUARDAR_SNAPSHOT and PARQUET_DISPONIBLE
+    dataset = None
+    if not reportes_escritos or escribir_snapshot or PDF_DISPONIBLE:
+        dataset = DatasetReporte.desde(filas)
+    if isinstance(filas, FilasEnDisco):
+        filas.cerrar()
+    if not reportes_escritos:
+        if EXCEL_NORMALIZADO and commits is not None and comentarios is not None:
+            generar_excel_normalizado(dataset, commits, comentarios)
+        else:
+            generar_excel(dataset)
+        generar_markdown(dataset)
+    if snapshot is None:
+        analytics = guardar_snapshot(dataset, commits) if GUARDAR_SNAPSHOT else None
 
     if PDF_DISPONIBLE:
-        generar_pdf_desde_markdown(filas)
+        generar_pdf_desde_markdown(dataset, analytics)
         print("✅ Archivos generados:")
         print("- reportes/reporte_completo.xlsx")
-        print("- reportes/reporte_completo.md")
+        print(f"- {ruta_markdown()}")
         print("- reportes/reporte_completo.pdf")
     else:
         print("✅ Archivos generados:")
         print("- reportes/reporte_completo.xlsx")
-        print("- reportes/reporte_completo.md")
+        print(f"- {ruta_markdown()}")
         print("⚠️ El archivo PDF no se generó debido a que falta instalar ReportLab.")
@@ -0,0 +1,601 @@
+"""
+Reporte PDF generado directamente desde las filas del reporte
+Los estilos se crean una sola vez y cada fila se convierte en sus
+elementos de ReportLab en una única pasada, sin volver a leer el
+Markdown ni convertirlo a HTML. Con varios procesos, el reporte se
+divide en partes independientes que se renderizan en paralelo y se
+unen con pypdf (opcional), con numeración continua y un único esquema
+"""
+
+import io
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
+
+from modelo import Estado, Tipo
+
+# Importación opcional para unir las partes renderizadas en paralelo
+UNION_DISPONIBLE = False
+try:
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject
+    UNION_DISPONIBLE = True
+except ImportError:
+    pass
+
+# Márgenes de todas las páginas (también los usa el sello de numeración)
+MARGENES = {"rightMargin": 50, "leftMargin": 50, "topMargin": 60, "bottomMargin": 50}
+
+# Paleta de colores de GitHub
+GITHUB_BLUE = colors.Color(0.125, 0.416, 0.702)
+GITHUB_GREEN = colors.Color(0.157, 0.675, 0.235)
+GITHUB_PURPLE = colors.Color(0.584, 0.345, 0.698)
+GITHUB_GRAY = colors.Color(0.6, 0.6, 0.6)
+
+# Secciones del contenido en el orden del índice, con el estilo del título de cada item
+SECCIONES = {
+    "issue_open": ("Issues Abiertos", "IssueOpen"),
+    "issue_closed": ("Issues Cerrados", "Closed"),
+    "pr_open": ("Pull Requests Abiertos", "PROpen"),
+    "pr_closed": ("Pull Requests Cerrados", "Closed"),
+}
+
+# Bloques de texto de cada item: (columna, título en el PDF)
+BLOQUES = (
+    ("Descripción", "Descripción"),
+    ("Commits Vinculados", "Commits Vinculados"),
+    ("Autores Commits", "Autores de Commits"),
+    ("Commits de Cierre", "Commits que lo Cierran"),
+    ("Comentarios", "Comentarios"),
+)
+
+# Símbolos que las fuentes estándar del PDF no pueden dibujar
+REEMPLAZOS = {"✅": "(Correcto)", "❌": "(Error)", "⚠️": "(Advertencia)"}
+PATRON_URL = re.compile(r'(https?://[^\s"\'<>]+)')
+
+
+def seccion_de(fila):
+    """Clave de SECCIONES según el tipo y el estado de la fila"""
+    prefijo = "pr" if fila["Tipo"] == Tipo.PULL_REQUEST.value else "issue"
+    sufijo = "open" if fila["Estado"] == Estado.ABIERTO.value else "closed"
+    return f"{prefijo}_{sufijo}"
+
+
+def marcado(texto):
+    """Escapa un texto para Paragraph y convierte sus URL en enlaces"""
+    texto = "N/A" if texto is None else str(texto)
+    for simbolo, reemplazo in REEMPLAZOS.items():
+        texto = texto.replace(simbolo, reemplazo)
+    # split con un grupo deja las URL en las posiciones impares
+    partes = PATRON_URL.split(texto)
+    for i, parte in enumerate(partes):
+        parte = escape(parte)
+        partes[i] = f'<link href="{parte}">{parte}</link>' if i % 2 else parte
+    return "".join(partes)
+
+
+def crear_estilos():
+    """Hoja de estilos del reporte; se crea una vez por documento"""
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Title'],
+        fontSize=28,
+        textColor=GITHUB_BLUE,
+        spaceAfter=16,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+    styles.add(ParagraphStyle(
+        name='CoverSubtitle',
+        parent=styles['Heading2'],
+        fontSize=20,
+        textColor=GITHUB_BLUE,
+        spaceBefore=10,
+        spaceAfter=16,
+        alignment=TA_CENTER,
+    ))
+    styles.add(ParagraphStyle(
+        name='CustomHeading2',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=GITHUB_BLUE,
+        spaceBefore=14,
+        spaceAfter=8,
+        borderWidth=1,
+        borderColor=colors.lightgrey,
+        borderPadding=6,
+        borderRadius=6,
+        leading=20,
+        keepWithNext=1
+    ))
+    styles.add(ParagraphStyle(
+        name='CustomHeading3',
+        parent=styles['Heading3'],
+        fontSize=14,
+        textColor=GITHUB_PURPLE,
+        spaceBefore=10,
+        spaceAfter=6,
+        leading=16
+    ))
+    styles.add(ParagraphStyle(
+        name='CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceBefore=4,
+        spaceAfter=6,
+        leading=14
+    ))
+    styles.add(ParagraphStyle(
+        name='DateStyle',
+        parent=styles['Normal'],
+        fontSize=12,
+        textColor=GITHUB_GRAY,
+        alignment=TA_CENTER
+    ))
+    styles.add(ParagraphStyle(
+        name='Metadata',
+        parent=styles['CustomNormal'],
+        backColor=colors.Color(0.97, 0.97, 0.97),
+        borderPadding=6,
+        borderWidth=0.5,
+        borderColor=colors.lightgrey,
+        borderRadius=4
+    ))
+    # Título de cada item según su tipo y estado
+    styles.add(ParagraphStyle(
+        name='IssueOpen',
+        parent=styles['CustomHeading2'],
+        backColor=colors.Color(0.95, 0.95, 1.0),
+        borderColor=GITHUB_PURPLE,
+    ))
+    styles.add(ParagraphStyle(
+        name='PROpen',
+        parent=styles['CustomHeading2'],
+        backColor=colors.Color(0.9, 1.0, 0.9),
+        borderColor=GITHUB_GREEN,
+    ))
+    styles.add(ParagraphStyle(
+        name='Closed',
+        parent=styles['CustomHeading2'],
+        backColor=colors.Color(0.95, 0.95, 0.95),
+        borderColor=GITHUB_GRAY,
+    ))
+    return styles
+
+
+def _marcar(paragraph, titulo, nivel):
+    # Los párrafos marcados son entradas del esquema (índice lateral) del PDF
+    paragraph.marcador = (titulo, nivel)
+    return paragraph
+
+
+class _DocumentoReporte(SimpleDocTemplate):
+    def __init__(self, ruta, esquema=True):
+        """
+        Plantilla A4 que anota la página de cada párrafo marcado
+        Args:
+            ruta: Archivo .pdf de salida
+            esquema: Crea el esquema en el propio PDF; las partes en paralelo
+                solo anotan las páginas y el esquema se arma al unirlas
+        """
+        super().__init__(ruta, pagesize=A4, **MARGENES)
+        self.esquema = esquema
+        self.marcadores = []
+
+    def afterFlowable(self, flowable):
+        marcador = getattr(flowable, "marcador", None)
+        if marcador is None:
+            return
+        titulo, nivel = marcador
+        self.marcadores.append((titulo, nivel, self.page))
+        if self.esquema:
+            clave = f"m{len(self.marcadores)}"
+            self.canv.bookmarkPage(clave)
+            self.canv.addOutlineEntry(titulo, clave, level=nivel)
+
+
+def _renderizar_parte(repo, ahora, ruta, parte):
+    """
+    Renderiza una parte del reporte en un proceso aparte
+    Returns:
+        list: Marcadores (título, nivel, página dentro de la parte)
+    """
+    renderizador = RenderizadorPDF(repo, ahora=ahora, numerar=False)
+    if parte[0] == "portada":
+        elementos = renderizador.elementos_portada(*parte[1:])
+    else:
+        elementos = renderizador.elementos_tramo(*parte[1:])
+    return renderizador.construir(ruta, elementos, esquema=False)
+
+
+class RenderizadorPDF:
+    def __init__(self, repo, ahora=None, numerar=True):
+        """
+        Prepara estilos, fecha y encabezado del reporte de un repositorio
+        Args:
+            repo: Repositorio en formato owner/repo
+            ahora: Fecha de generación (la misma en todas las partes)
+            numerar: Dibuja el número de página en el pie; las partes en
+                paralelo lo omiten y se numeran al unirlas
+        """
+        self.repo = repo
+        self.styles = crear_estilos()
+        self.ahora = ahora or datetime.now()
+        self.numerar = numerar
+        self._fecha_pagina = self.ahora.strftime('%d-%m-%Y')
+
+    # === CONTENIDO ===
+
+    def elementos_item(self, fila):
+        """Elementos de un issue o PR: título coloreado, metadatos y bloques de texto"""
+        estilo = SECCIONES[seccion_de(fila)][1]
+        titulo = (f"<link href=\"{escape(fila['URL'])}\">{fila['Tipo']} #{fila['ID']}</link>"
+                  f"<br/><font size='14'>{marcado(fila['Título'])}</font>")
+        if fila["Estado"] == Estado.ABIERTO.value:
+            estado = "<font color='#28a745'><b>OPEN</b></font>"
+        else:
+            estado = "<font color='#cb2431'><b>CLOSED</b></font>"
+        metadatos = (f"<b>Estado:</b> {estado}<br/>"
+                     f"<b>Asignado a:</b> {marcado(fila['Asignado a'])}<br/>"
+                     f"<b>Creado:</b> {marcado(fila['Creado'])}<br/>"
+                     f"<b>Cerrado:</b> {marcado(fila['Cerrado'])}")
+
+        elementos = [
+            _marcar(Paragraph(titulo, self.styles[estilo]),
+                    f"{fila['Tipo']} #{fila['ID']}: {fila['Título']}", 1),
+            Paragraph(metadatos, self.styles['Metadata']),
+        ]
+        for columna, encabezado in BLOQUES:
+            elementos.append(Paragraph(encabezado, self.styles['CustomHeading3']))
+            # Un párrafo por línea, como en el Markdown: evita partir párrafos enormes entre páginas
+            for linea in str(fila[columna] or "").split("\n"):
+                if linea.strip():
+                    elementos.append(Paragraph(marcado(linea), self.styles['CustomNormal']))
+        elementos.append(Spacer(1, 0.35 * inch))
+        return elementos
+
+    def elementos_secciones(self, filas):
+        """
+        Recorre las filas una sola vez y las reparte en las secciones del índice
+        Returns:
+            tuple: ({clave: [elementos]}, {clave: número de items})
+        """
+        elementos = {clave: [] for clave in SECCIONES}
+        conteo = dict.fromkeys(SECCIONES, 0)
+        for fila in filas:
+            clave = seccion_de(fila)
+            elementos[clave].extend(self.elementos_item(fila))
+            conteo[clave] += 1
+        return elementos, conteo
+
+    def titulo_seccion(self, numero, clave):
+        titulo = f"{numero}. {SECCIONES[clave][0]}"
+        return [_marcar(Paragraph(titulo, self.styles['CustomTitle']), titulo, 0),
+                Spacer(1, 0.5 * inch)]
+
+    def elementos_tramo(self, clave, numero, filas):
+        """Elementos de un tramo de una sección; numero es None si continúa la sección"""
+        elementos = self.titulo_seccion(numero, clave) if numero is not None else []
+        for fila in filas:
+            elementos.extend(self.elementos_item(fila))
+        return elementos
+
+    # === PORTADA, RESUMEN E ÍNDICE ===
+
+    def portada(self):
+        org_name, _, repo_name = self.repo.partition('/')
+        return [
+            Spacer(1, 1.5 * inch),
+            Paragraph('<font size="38" color="#333333"><b>GitHub</b></font>', self.styles['Title']),
+            Spacer(1, 0.5 * inch),
+            Paragraph("Reporte de Issues y Pull Requests", self.styles['CustomTitle']),
+            Spacer(1, 0.25 * inch),
+            Paragraph(f"{escape(org_name)}/<b>{escape(repo_name)}</b>", self.styles['CoverSubtitle']),
+            Spacer(1, 0.5 * inch),
+            Paragraph(f"Generado el {self.ahora.strftime('%d de %B de %Y, %H:%M')}",
+                      self.styles['DateStyle']),
+            Spacer(1, 1.5 * inch),
+        ]
+
+    def resumen(self, conteo, estadisticas=None):
+        """Tabla de issues y PRs por estado y, si las hay, estadísticas de analytics"""
+        elementos = [_marcar(Paragraph("Resumen del Repositorio", self.styles['CustomHeading3']),
+                             "Resumen del Repositorio", 0),
+                     Spacer(1, 0.2 * inch)]
+        total = sum(conteo.values())
+        table_data = [
+            ['', 'Abiertos', 'Cerrados', 'Total'],
+            ['Issues', conteo['issue_open'], conteo['issue_closed'],
+             conteo['issue_open'] + conteo['issue_closed']],
+            ['Pull Requests', conteo['pr_open'], conteo['pr_closed'],
+             conteo['pr_open'] + conteo['pr_closed']],
+            ['Total', conteo['issue_open'] + conteo['pr_open'],
+             conteo['issue_closed'] + conteo['pr_closed'], total]
+        ]
+        table = Table(table_data, colWidths=[120, 80, 80, 80])
+        table.setStyle(TableStyle([
+            # Encabezados
+            ('BACKGROUND', (0, 0), (-1, 0), GITHUB_BLUE),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+            ('TOPPADDING', (0, 0), (-1, 0), 10),
+            # Primera columna (tipos)
+            ('BACKGROUND', (0, 1), (0, -1), colors.Color(0.95, 0.95, 0.95)),
+            ('TEXTCOLOR', (0, 1), (0, -1), GITHUB_BLUE),
+            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+            # Contenido - abiertos (verde)
+            ('BACKGROUND', (1, 1), (1, -2), colors.Color(0.9, 1.0, 0.9)),
+            ('TEXTCOLOR', (1, 1), (1, -1), GITHUB_GREEN),
+            # Contenido - cerrados (gris)
+            ('BACKGROUND', (2, 1), (2, -2), colors.Color(0.95, 0.95, 0.95)),
+            ('TEXTCOLOR', (2, 1), (2, -1), GITHUB_GRAY),
+            # Totales
+            ('BACKGROUND', (3, 1), (3, -2), colors.Color(0.95, 0.95, 1.0)),
+            ('BACKGROUND', (0, -1), (-1, -1), GITHUB_BLUE),
+            ('TEXTCOLOR', (0, -1), (-1, -1), colors.white),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            # Bordes
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+            ('BOX', (0, 0), (-1, -1), 1, GITHUB_BLUE),
+        ]))
+        elementos += [table, Spacer(1, 0.3 * inch)]
+
+        if estadisticas and len(estadisticas) > 4:
+            elementos += [Paragraph("Estadísticas Detalladas", self.styles['CustomHeading3']),
+                          Spacer(1, 0.15 * inch)]
+            advanced_stats_data = [
+                ['Métrica', 'Valor'],
+                ['Tiempo promedio de resolución',
+                 f"{estadisticas.get('tiempo_promedio_resolucion', 0)} días"],
+                ['Tiempo mediano de resolución',
+                 f"{estadisticas.get('tiempo_mediano_resolucion', 0)} días"],
+                ['Contribuidores únicos', f"{estadisticas.get('contribuidores_unicos', 0)}"],
+                ['Período de análisis',
+                 f"{estadisticas.get('fecha_min', 'N/A')} a {estadisticas.get('fecha_max', 'N/A')}"]
+            ]
+            advanced_stats_table = Table(advanced_stats_data, colWidths=[200, 160])
+            advanced_stats_table.setStyle(TableStyle([
+                # Encabezados
+                ('BACKGROUND', (0, 0), (-1, 0), GITHUB_BLUE),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 11),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+                ('TOPPADDING', (0, 0), (-1, 0), 8),
+                # Primera columna (métricas)
+                ('BACKGROUND', (0, 1), (0, -1), colors.Color(0.95, 0.95, 0.95)),
+                ('TEXTCOLOR', (0, 1), (0, -1), GITHUB_BLUE),
+                ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+                ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+                ('ALIGN', (1, 1), (1, -1), 'CENTER'),
+                # Bordes
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ]))
+            elementos += [advanced_stats_table, Spacer(1, 0.2 * inch)]
+
+        if total > 0:
+            porcentaje_abiertos = (conteo['issue_open'] + conteo['pr_open']) / total * 100
+            porcentaje_cerrados = (conteo['issue_closed'] + conteo['pr_closed']) / total * 100
+            elementos.append(Paragraph(
+                f"<b>Estado del repositorio:</b> {porcentaje_abiertos:.1f}% abiertos, "
+                f"{porcentaje_cerrados:.1f}% cerrados",
+                self.styles['CustomNormal']))
+        return elementos
+
+    def indice(self, claves):
+        elementos = [_marcar(Paragraph("Índice de Contenido", self.styles['CustomTitle']),
+                             "Índice de Contenido", 0),
+                     Spacer(1, 0.25 * inch)]
+        for numero, clave in enumerate(claves, start=1):
+            elementos.append(Paragraph(f"{numero}. {SECCIONES[clave][0]}", self.styles['CustomHeading3']))
+        return elementos
+
+    def elementos_portada(self, conteo, estadisticas=None):
+        """Portada, resumen e índice: la primera parte del reporte"""
+        claves = [clave for clave in SECCIONES if conteo[clave]]
+        return (self.portada() + self.resumen(conteo, estadisticas)
+                + [PageBreak()] + self.indice(claves))
+
+    # === DOCUMENTO ===
+
+    def dibujar_pagina(self, canvas, doc):
+        """Encabezado con repositorio y fecha, y pie con el número de página"""
+        canvas.saveState()
+        canvas.setFillColor(colors.darkblue)
+        canvas.setFont('Helvetica-Bold', 8)
+        canvas.drawString(doc.leftMargin, doc.height + doc.topMargin - 10,
+                          f"Reporte GitHub: {self.repo}")
+        canvas.setStrokeColor(colors.darkblue)
+        canvas.line(doc.leftMargin, doc.height + doc.topMargin - 15,
+                    doc.width + doc.leftMargin, doc.height + doc.topMargin - 15)
+
+        date_width = canvas.stringWidth(self._fecha_pagina, 'Helvetica', 8)
+        canvas.setFont('Helvetica', 8)
+        canvas.drawString(doc.width + doc.leftMargin - date_width,
+                          doc.height + doc.topMargin - 10, self._fecha_pagina)
+
+        if self.numerar:
+            self.dibujar_numero(canvas, canvas.getPageNumber())
+        canvas.line(doc.leftMargin, doc.bottomMargin - 15,
+                    doc.width + doc.leftMargin, doc.bottomMargin - 15)
+        canvas.restoreState()
+
+    @staticmethod
+    def dibujar_numero(canvas, numero):
+        canvas.setFillColor(colors.darkblue)
+        canvas.setFont('Helvetica', 8)
+        canvas.drawString(MARGENES['leftMargin'], MARGENES['bottomMargin'] - 20, f"Página {numero}")
+
+    def construir(self, ruta, elementos, esquema=True):
+        """Construye un documento con los elementos dados y devuelve sus marcadores"""
+        doc = _DocumentoReporte(ruta, esquema)
+        doc.build(elementos, onFirstPage=self.dibujar_pagina, onLaterPages=self.dibujar_pagina)
+        return doc.marcadores
+
+    def generar(self, ruta, filas, estadisticas=None):
+        """
+        Escribe el PDF completo
+        Args:
+            ruta: Archivo .pdf de salida
+            filas: Dataset, lista o iterador de filas (Fila o diccionarios)
+            estadisticas: Resultado de GitHubAnalytics.obtener_estadisticas_resumen()
+        Returns:
+            dict: Número de items de cada sección
+        """
+        secciones, conteo = self.elementos_secciones(filas)
+        claves = [clave for clave in SECCIONES if conteo[clave]]
+
+        elements = self.elementos_portada(conteo, estadisticas)
+        for numero, clave in enumerate(claves, start=1):
+            elements += [PageBreak()] + self.titulo_seccion(numero, clave)
+            # build descarta cada elemento al dibujarlo si nadie más lo referencia
+            elements += secciones.pop(clave)
+
+        self.construir(ruta, elements)
+        return conteo
+
+    # === RENDERIZADO EN PARALELO ===
+
+    def partes(self, filas, estadisticas=None, items_por_parte=500):
+        """
+        Divide el reporte en partes independientes: portada con resumen e
+        índice, y cada sección en tramos de hasta items_por_parte items
+        Returns:
+            tuple: (lista de partes, conteo por sección)
+        """
+        secciones = {clave: [] for clave in SECCIONES}
+        for fila in filas:
+            # Diccionarios simples: cada parte viaja a otro proceso
+            secciones[seccion_de(fila)].append(dict(fila))
+        conteo = {clave: len(lista) for clave, lista in secciones.items()}
+
+        partes = [("portada", conteo, estadisticas)]
+        numero = 0
+        for clave, lista in secciones.items():
+            if not lista:
+                continue
+            numero += 1
+            for inicio in range(0, len(lista), items_por_parte):
+                partes.append(("items", clave, numero if inicio == 0 else None,
+                               lista[inicio:inicio + items_por_parte]))
+        return partes, conteo
+
+    def generar_en_paralelo(self, ruta, filas, estadisticas=None, procesos=None, items_por_parte=500):
+        """
+        Como generar, pero renderiza las partes en varios procesos y las une
+        Args:
+            procesos: Procesos de renderizado (por defecto, uno por núcleo)
+            items_por_parte: Máximo de issues o PRs por parte
+        Returns:
+            dict: Número de items de cada sección
+        """
+        if not UNION_DISPONIBLE:
+            print("pypdf no está instalado: el PDF se genera en un solo proceso (pip install pypdf)")
+            return self.generar(ruta, filas, estadisticas)
+
+        partes, conteo = self.partes(filas, estadisticas, items_por_parte)
+        os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+        union = _UnionPDF(self)
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(ruta) or ".") as directorio:
+            rutas = [os.path.join(directorio, f"parte_{i:04d}.pdf") for i in range(len(partes))]
+            with ProcessPoolExecutor(max_workers=procesos) as executor:
+                resultados = executor.map(
+                    _renderizar_parte, [self.repo] * len(partes), [self.ahora] * len(partes),
+                    rutas, partes)
+                # map entrega las partes en orden según terminan: cada una se
+                # une mientras las siguientes todavía se renderizan
+                for ruta_parte, marcadores in zip(rutas, resultados):
+                    union.agregar(ruta_parte, marcadores)
+        union.escribir(ruta)
+        return conteo
+
+
+class _UnionPDF:
+    def __init__(self, renderizador):
+        """
+        Une las partes del reporte en orden con numeración de páginas
+        continua y un esquema único
+        """
+        self.renderizador = renderizador
+        self.writer = PdfWriter()
+        self.entradas = []
+        self._recursos_sello = None
+        # Contenido común a todas las páginas: el original entre q/Q y luego
+        # el número, que cada página resuelve con su propio /NumeroPagina
+        self._abrir = self._flujo(b"q\n")
+        self._cerrar = self._flujo(b"\nQ q /NumeroPagina Do Q\n")
+
+    def _flujo(self, datos):
+        flujo = DecodedStreamObject()
+        flujo.set_data(datos)
+        return self.writer._add_object(flujo)
+
+    def agregar(self, ruta, marcadores):
+        """Añade una parte al final, con sus marcadores desplazados a su página real"""
+        desde = len(self.writer.pages)
+        self.writer.append(ruta, import_outline=False)
+        self.entradas += [(titulo, nivel, desde + pagina - 1) for titulo, nivel, pagina in marcadores]
+        self._numerar(desde)
+
+    def _numerar(self, desde):
+        # Los números se dibujan con ReportLab (igual que en dibujar_pagina) en
+        # páginas de sello y cada sello se enlaza como Form XObject: es mucho
+        # más rápido que merge_page, que reinterpreta el contenido de la página
+        paginas = self.writer.pages[desde:]
+        sellos = io.BytesIO()
+        canvas = Canvas(sellos, pagesize=A4)
+        for numero in range(desde + 1, desde + len(paginas) + 1):
+            self.renderizador.dibujar_numero(canvas, numero)
+            canvas.showPage()
+        canvas.save()
+
+        for pagina, sello in zip(paginas, PdfReader(sellos).pages):
+            if self._recursos_sello is None:
+                self._recursos_sello = sello["/Resources"].clone(self.writer)
+            forma = sello["/Contents"].get_object().clone(self.writer)
+            forma[NameObject("/Type")] = NameObject("/XObject")
+            forma[NameObject("/Subtype")] = NameObject("/Form")
+            forma[NameObject("/BBox")] = sello.mediabox
+            forma[NameObject("/Resources")] = self._recursos_sello
+
+            recursos = DictionaryObject(pagina["/Resources"])
+            xobjects = DictionaryObject(recursos.get("/XObject", {}))
+            xobjects[NameObject("/NumeroPagina")] = forma.indirect_reference
+            recursos[NameObject("/XObject")] = xobjects
+            pagina[NameObject("/Resources")] = recursos
+
+            contenido = pagina.raw_get("/Contents")
+            if isinstance(contenido.get_object(), ArrayObject):
+                contenido = list(contenido.get_object())
+            else:
+                contenido = [contenido]
+            pagina[NameObject("/Contents")] = ArrayObject([self._abrir, *contenido, self._cerrar])
+
+    def escribir(self, ruta):
+        padre = None
+        for titulo, nivel, indice in self.entradas:
+            if nivel == 0:
+                padre = self.writer.add_outline_item(titulo, indice)
+            else:
+                self.writer.add_outline_item(titulo, indice, parent=padre)
+        # Cada parte trae sus propias fuentes y recursos: se comparten al unir
+        self.writer.compress_identical_objects(remove_duplicates=True, remove_unreferenced=True)
+        with open(ruta, "wb") as archivo:
+            self.writer.write(archivo)
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Servidor local que imita la API REST de GitHub
+Sirve repositorios sintéticos de tamaño configurable o reproduce
+respuestas grabadas, con paginación, cabeceras Link, ETag y límites de
+peticiones, para probar y medir la descarga sin acceso a api.github.com
+
+Uso:
+    python servidor_simulado.py --issues 2000 --commits 5000 --puerto 8000
+    GITHUB_API_URL=http://127.0.0.1:8000 REPO=demo/repo python reporte_issues.py
+
+    # Grabar las respuestas reales y reproducirlas después sin red
+    python servidor_simulado.py --grabar grabacion.json --upstream https://api.github.com
+    python servidor_simulado.py --reproducir grabacion.json
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import requests
+
+PER_PAGE_DEFECTO = 30
+PER_PAGE_MAXIMO = 100
+CABECERAS_GRABADAS = ("Content-Type", "Link", "ETag", "Last-Modified")
+# Sustituye a la URL de la API real en los enlaces grabados
+MARCA_BASE = "{base}"
+
+
+def _fecha(instante):
+    return instante.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class RepositorioSintetico:
+    def __init__(self, repo="demo/repo", n_issues=500, n_commits=1000,
+                 max_comentarios=5, proporcion_prs=0.3, semilla=42):
+        """
+        Genera un repositorio con datos deterministas
+        Args:
+            repo: Nombre en formato usuario/repositorio
+            n_issues: Issues y PRs a generar
+            n_commits: Commits a generar (algunos referencian issues con #N)
+            max_comentarios: Comentarios máximos por item
+            proporcion_prs: Fracción de items que son pull requests
+            semilla: Semilla aleatoria (mismos parámetros, mismos datos)
+        """
+        self.repo = repo
+        azar = random.Random(semilla)
+        inicio = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        usuarios = [f"usuario{i}" for i in range(12)]
+        html = f"https://github.com/{repo}"
+
+        self.issues = []
+        self.comentarios = []
+        for numero in range(1, n_issues + 1):
+            creado = inicio + timedelta(hours=numero * 3)
+            cerrado = creado + timedelta(days=azar.randint(1, 60)) if azar.random() < 0.6 else None
+            n_comentarios = azar.randint(0, max_comentarios)
+            actualizado = creado
+            for k in range(n_comentarios):
+                fecha = creado + timedelta(hours=k + 1)
+                actualizado = max(actualizado, fecha)
+                self.comentarios.append({
+                    "id": numero * 1000 + k,
+                    "user": {"login": azar.choice(usuarios)},
+                    "body": f"Comentario {k + 1} sobre el item {numero}",
+                    "created_at": _fecha(fecha),
+                    "updated_at": _fecha(fecha),
+                    "issue_url": f"/repos/{repo}/issues/{numero}",
+                    "html_url": f"{html}/issues/{numero}#issuecomment-{numero * 1000 + k}"
+                })
+            if cerrado:
+                actualizado = max(actualizado, cerrado)
+            es_pr = azar.random() < proporcion_prs
+            asignado = azar.choice(usuarios + [None, None])
+            issue = {
+                "number": numero,
+                "title": f"{'PR' if es_pr else 'Issue'} sintético {numero}",
+                "body": f"Descripción del item {numero}",
+                "state": "closed" if cerrado else "open",
+                "created_at": _fecha(creado),
+                "updated_at": _fecha(actualizado),
+                "closed_at": _fecha(cerrado) if cerrado else None,
+                "user": {"login": azar.choice(usuarios)},
+                "assignee": {"login": asignado} if asignado else None,
+                "labels": [{"name": azar.choice(["bug", "mejora", "docs"])}],
+                "comments": n_comentarios,
+                "html_url": f"{html}/{'pull' if es_pr else 'issues'}/{numero}"
+            }
+            if es_pr:
+                issue["pull_request"] = {"html_url": issue["html_url"]}
+            self.issues.append(issue)
+        # Orden por defecto de GitHub: creados más recientemente primero
+        self.issues.reverse()
+
+        self.commits = []
+        for i in range(n_commits):
+            fecha = inicio + timedelta(minutes=i * 90)
+            mensaje = f"Cambio {i}"
+            if n_issues and azar.random() < 0.5:
+                mensaje = f"Corrige #{azar.randint(1, n_issues)}: cambio {i}"
+            sha = hashlib.sha1(f"{semilla}-{i}".encode()).hexdigest()
+            self.commits.append({
+                "sha": sha,
+                "commit": {
+                    "message": f"{mensaje}\n\nDetalle del commit {i}",
+                    "author": {"name": azar.choice(usuarios), "email": "dev@example.com",
+                               "date": _fecha(fecha)}
+                },
+                "html_url": f"{html}/commit/{sha}"
+            })
+        self.commits.reverse()
+
+        self._comentarios_por_numero = {}
+        for comentario in self.comentarios:
+            numero = int(comentario["issue_url"].rsplit("/", 1)[1])
+            self._comentarios_por_numero.setdefault(numero, []).append(comentario)
+
+    def listar(self, ruta, params):
+        """Devuelve la lista completa de un endpoint o None si no existe"""
+        prefijo = f"/repos/{self.repo}"
+        if not ruta.startswith(prefijo):
+            return None
+        ruta = ruta[len(prefijo):]
+        since = params.get("since")
+
+        if ruta == "/issues":
+            elementos = self.issues
+            estado = params.get("state", "open")
+            if estado != "all":
+                elementos = [i for i in elementos if i["state"] == estado]
+            if params.get("direction") == "asc":
+                elementos = list(reversed(elementos))
+            fecha = "updated_at"
+        elif ruta == "/commits":
+            elementos = self.commits
+            until = params.get("until")
+            if since:
+                elementos = [c for c in elementos if c["commit"]["author"]["date"] >= since]
+            if until:
+                elementos = [c for c in elementos if c["commit"]["author"]["date"] <= until]
+            return elementos
+        elif ruta == "/issues/comments":
+            elementos = self.comentarios
+            if params.get("direction") == "desc":
+                elementos = list(reversed(elementos))
+            fecha = "updated_at"
+        else:
+            coincidencia = re.fullmatch(r"/issues/(\d+)/comments", ruta)
+            if not coincidencia:
+                return None
+            elementos = self._comentarios_por_numero.get(int(coincidencia.group(1)), [])
+            fecha = "updated_at"
+
+        if since:
+            elementos = [e for e in elementos if e[fecha] >= since]
+        return elementos
+
+
+class Grabacion:
+    def __init__(self, ruta, upstream=None, token=None):
+        """
+        Respuestas grabadas indexadas por ruta y parámetros
+        Args:
+            ruta: Archivo JSON de la grabación
+            upstream: URL de la API real; si se indica, las peticiones que no
+                      estén grabadas se reenvían y se guardan
+            token: Token para las peticiones reenviadas
+        """
+        self.ruta = ruta
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self._sesion = requests.Session()
+        if token:
+            self._sesion.headers["Authorization"] = f"token {token}"
+        self._bloqueo = threading.Lock()
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                self.respuestas = json.load(f)
+        except FileNotFoundError:
+            self.respuestas = {}
+
+    @staticmethod
+    def clave(ruta, params):
+        return f"{ruta}?{urlencode(sorted(params.items()))}"
+
+    def obtener(self, ruta, params):
+        """Devuelve (estado, cabeceras, cuerpo) grabados o None"""
+        clave = self.clave(ruta, params)
+        with self._bloqueo:
+            entrada = self.respuestas.get(clave)
+        if entrada is None and self.upstream:
+            r = self._sesion.get(f"{self.upstream}{ruta}", params=params, timeout=30)
+            cabeceras = {k: v for k, v in r.headers.items() if k in CABECERAS_GRABADAS}
+            if "Link" in cabeceras:
+                # Los enlaces se reescriben al servir con la URL del servidor local
+                cabeceras["Link"] = cabeceras["Link"].replace(self.upstream, MARCA_BASE)
+            entrada = {"estado": r.status_code, "cabeceras": cabeceras, "cuerpo": r.text}
+            with self._bloqueo:
+                self.respuestas[clave] = entrada
+        if entrada is None:
+            return None
+        return entrada["estado"], dict(entrada["cabeceras"]), entrada["cuerpo"]
+
+    def guardar(self):
+        with self._bloqueo:
+            with open(self.ruta, "w", encoding="utf-8") as f:
+                json.dump(self.respuestas, f)
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, formato, *args):
+        pass
+
+    def do_GET(self):
+        servidor = self.server
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if url.path == "/_estadisticas":
+            return self._responder(200, {}, json.dumps(servidor.estadisticas()))
+
+        if servidor.latencia:
+            time.sleep(servidor.latencia)
+
+        if servidor.cuota_agotada():
+            cuerpo = json.dumps({"message": "API rate limit exceeded",
+                                 "documentation_url": "https://docs.github.com/rest"})
+            return self._responder(403, servidor.registrar(url.path, 403), cuerpo)
+
+        if isinstance(servidor.fuente, Grabacion):
+            grabada = servidor.fuente.obtener(url.path, params)
+            if grabada is None:
+                estado, cabeceras, cuerpo = 404, {}, json.dumps({"message": "Not Found"})
+            else:
+                estado, cabeceras, cuerpo = grabada
+                if "Link" in cabeceras:
+                    cabeceras["Link"] = cabeceras["Link"].replace(MARCA_BASE, self._base())
+        else:
+            estado, cabeceras, cuerpo = self._paginar(url.path, params)
+
+        etag = cabeceras.get("ETag")
+        if estado == 200 and etag is None:
+            etag = f'W/"{hashlib.md5(cuerpo.encode("utf-8")).hexdigest()}"'
+            cabeceras["ETag"] = etag
+        if estado == 200 and self.headers.get("If-None-Match") == etag:
+            estado, cuerpo = 304, ""
+
+        cabeceras.update(servidor.registrar(url.path, estado))
+        self._responder(estado, cabeceras, cuerpo)
+
+    def _base(self):
+        return f"http://{self.headers.get('Host') or '%s:%s' % self.server.server_address[:2]}"
+
+    def _paginar(self, ruta, params):
+        elementos = self.server.fuente.listar(ruta, params)
+        if elementos is None:
+            return 404, {}, json.dumps({"message": "Not Found"})
+
+        per_page = min(int(params.get("per_page", PER_PAGE_DEFECTO)), PER_PAGE_MAXIMO)
+        pagina = max(1, int(params.get("page", 1)))
+        ultima = max(1, -(-len(elementos) // per_page))
+        datos = elementos[(pagina - 1) * per_page:pagina * per_page]
+
+        cabeceras = {"Content-Type": "application/json; charset=utf-8"}
+        enlaces = []
+        for rel, numero in (("prev", pagina - 1), ("next", pagina + 1),
+                            ("first", 1), ("last", ultima)):
+            if ultima > 1 and 1 <= numero <= ultima and numero != pagina:
+                consulta = urlencode({**params, "page": numero})
+                enlaces.append(f'<{self._base()}{ruta}?{consulta}>; rel="{rel}"')
+        if enlaces:
+            cabeceras["Link"] = ", ".join(enlaces)
+        return 200, cabeceras, json.dumps(datos)
+
+    def _responder(self, estado, cabeceras, cuerpo):
+        contenido = cuerpo.encode("utf-8")
+        self.send_response(estado)
+        for nombre, valor in cabeceras.items():
+            self.send_header(nombre, valor)
+        self.send_header("Content-Length", str(len(contenido)))
+        self.end_headers()
+        if contenido:
+            self.wfile.write(contenido)
+
+
+class ServidorSimulado(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fuente, puerto=0, host="127.0.0.1", limite=5000,
+                 ventana=3600, latencia=0.0):
+        """
+        Servidor HTTP de la API simulada
+        Args:
+            fuente: RepositorioSintetico o Grabacion
+            puerto: Puerto de escucha (0 elige uno libre)
+            limite: Peticiones permitidas por ventana (X-RateLimit-Limit)
+            ventana: Segundos hasta el reinicio de la cuota
+            latencia: Segundos de espera añadidos a cada respuesta
+        """
+        super().__init__((host, puerto), _Manejador)
+        self.fuente = fuente
+        self.limite = limite
+        self.ventana = ventana
+        self.latencia = latencia
+        self._bloqueo = threading.Lock()
+        self._reinicio = time.time() + ventana
+        self._usadas = 0
+        self._contadores = {"peticiones": 0, "por_estado": {}, "por_ruta": {}}
+        self._hilo = None
+
+    @property
+    def url(self):
+        host, puerto = self.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def _renovar_ventana(self):
+        ahora = time.time()
+        if ahora >= self._reinicio:
+            self._reinicio = ahora + self.ventana
+            self._usadas = 0
+
+    def cuota_agotada(self):
+        with self._bloqueo:
+            self._renovar_ventana()
+            return self._usadas >= self.limite
+
+    def registrar(self, ruta, estado):
+        """
+        Cuenta una respuesta y devuelve las cabeceras X-RateLimit-*
+        Como en GitHub, las respuestas 304 y los rechazos no gastan cuota
+        """
+        with self._bloqueo:
+            self._renovar_ventana()
+            if estado not in (304, 403):
+                self._usadas = min(self.limite, self._usadas + 1)
+
+            self._contadores["peticiones"] += 1
+            por_estado = self._contadores["por_estado"]
+            por_estado[str(estado)] = por_estado.get(str(estado), 0) + 1
+            # Agrupar los hilos de comentarios para no tener una entrada por issue
+            ruta = re.sub(r"/issues/\d+/", "/issues/{numero}/", ruta)
+            self._contadores["por_ruta"][ruta] = self._contadores["por_ruta"].get(ruta, 0) + 1
+
+            return {
+                "X-RateLimit-Limit": str(self.limite),
+                "X-RateLimit-Remaining": str(self.limite - self._usadas),
+                "X-RateLimit-Used": str(self._usadas),
+                "X-RateLimit-Reset": str(int(self._reinicio)),
+                "X-RateLimit-Resource": "core"
+            }
+
+    def estadisticas(self):
+        """Peticiones atendidas en total, por código de estado y por ruta"""
+        with self._bloqueo:
+            return json.loads(json.dumps(self._contadores))
+
+    def iniciar(self):
+        """Atiende peticiones en un hilo en segundo plano y devuelve la URL base"""
+        self._hilo = threading.Thread(target=self.serve_forever, daemon=True)
+        self._hilo.start()
+        return self.url
+
+    def detener(self):
+        self.shutdown()
+        self.server_close()
+        if isinstance(self.fuente, Grabacion) and self.fuente.upstream:
+            self.fuente.guardar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API de GitHub simulada para pruebas sin red")
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--repo", default="demo/repo")
+    parser.add_argument("--issues", type=int, default=500)
+    parser.add_argument("--commits", type=int, default=1000)
+    parser.add_argument("--comentarios", type=int, default=5, help="Comentarios máximos por item")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--limite", type=int, default=5000, help="Peticiones por ventana")
+    parser.add_argument("--ventana", type=int, default=3600, help="Segundos hasta reiniciar la cuota")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Segundos añadidos por respuesta")
+    parser.add_argument("--reproducir", help="Archivo de grabación a servir")
+    parser.add_argument("--grabar", help="Archivo donde grabar las respuestas reenviadas")
+    parser.add_argument("--upstream", default="https://api.github.com")
+    parser.add_argument("--token", help="Token para las peticiones reenviadas al grabar")
+    args = parser.parse_args()
+
+    if args.grabar:
+        fuente = Grabacion(args.grabar, upstream=args.upstream, token=args.token)
+    elif args.reproducir:
+        fuente = Grabacion(args.reproducir)
+    else:
+        fuente = RepositorioSintetico(
+            args.repo, args.issues, args.commits, args.comentarios, semilla=args.semilla)
+
+    servidor = ServidorSimulado(
+        fuente, args.puerto, limite=args.limite, ventana=args.ventana, latencia=args.latencia)
+    print(f"API simulada en {servidor.url} (GITHUB_API_URL={servidor.url})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        if args.grabar:
+            fuente.guardar()
+        print(json.dumps(servidor.estadisticas(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Estado de sincronización incremental por repositorio
+Recuerda las marcas de agua (última fecha de actualización vista) y el
+conjunto de datos descargado para pedir a la API solo lo que cambió
+"""
+
+import json
+import os
+
+from modelo import parsear_fecha
+
+
+def _nombre_archivo(repo):
+    return repo.replace("/", "__") + ".json"
+
+
+def _fecha_commit(commit):
+    datos = commit.get("commit", {})
+    fecha = (datos.get("committer") or {}).get("date")
+    return fecha or (datos.get("author") or {}).get("date")
+
+
+class EstadoSincronizacion:
+    def __init__(self, directorio, repo):
+        """
+        Inicializa el estado vacío de un repositorio
+        Args:
+            directorio: Carpeta donde se guarda el estado
+            repo: Repositorio en formato usuario/repositorio
+        """
+        self.ruta = os.path.join(directorio, _nombre_archivo(repo))
+        self.repo = repo
+        self.marcas = {'issues': None, 'commits': None, 'comentarios': None}
+        self.issues = {}
+        self.commits = []
+        self.comentarios = {}
+
+    @classmethod
+    def cargar(cls, directorio, repo):
+        """Carga el estado guardado o devuelve uno vacío"""
+        estado = cls(directorio, repo)
+        if os.path.exists(estado.ruta):
+            with open(estado.ruta, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+            estado.marcas.update(datos.get("marcas", {}))
+            estado.issues = {int(n): i for n, i in datos.get("issues", {}).items()}
+            estado.commits = datos.get("commits", [])
+            estado.comentarios = {
+                int(n): c for n, c in datos.get("comentarios", {}).items()}
+        return estado
+
+    def guardar(self):
+        """Escribe el estado en disco de forma atómica"""
+        os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+        temporal = f"{self.ruta}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump({
+                "repo": self.repo,
+                "marcas": self.marcas,
+                "issues": self.issues,
+                "commits": self.commits,
+                "comentarios": self.comentarios
+            }, f)
+        os.replace(temporal, self.ruta)
+
+    def fusionar_issues(self, nuevos):
+        """Reemplaza o añade los issues/PRs actualizados"""
+        for issue in nuevos:
+            self.issues[issue["number"]] = issue
+        fechas = [i["updated_at"] for i in nuevos if i.get("updated_at")]
+        self._avanzar_marca('issues', fechas)
+
+    def fusionar_commits(self, nuevos):
+        """Antepone los commits nuevos conservando el orden de la API"""
+        vistos = {c["sha"] for c in nuevos}
+        self.commits = list(nuevos) + [
+            c for c in self.commits if c["sha"] not in vistos]
+        self._avanzar_marca('commits', [_fecha_commit(c) for c in nuevos])
+
+    def fusionar_comentarios(self, nuevos):
+        """Reemplaza o añade comentarios agrupados por número de issue"""
+        fechas = []
+        for numero, lista in nuevos.items():
+            por_id = {c["id"]: c for c in self.comentarios.get(numero, [])}
+            for comentario in lista:
+                por_id[comentario["id"]] = comentario
+                fechas.append(comentario.get("updated_at"))
+            self.comentarios[numero] = sorted(
+                por_id.values(), key=lambda c: (c.get("created_at") or "", c["id"]))
+        self._avanzar_marca('comentarios', fechas)
+
+    def _avanzar_marca(self, clave, fechas):
+        # Se compara el instante y no el texto: las fechas con zona horaria
+        # (+02:00) o fracciones de segundo no se ordenan bien como texto.
+        # La marca conserva el texto original para enviarlo como since
+        fechas = [f for f in fechas if f]
+        if self.marcas[clave]:
+            fechas.append(self.marcas[clave])
+        if fechas:
+            self.marcas[clave] = max(fechas, key=parsear_fecha)
+
+    def issues_ordenados(self):
+        """Issues y PRs en el orden del listado de la API (por fecha de creación)"""
+        return sorted(
+            self.issues.values(),
+            key=lambda i: (i.get("created_at") or "", i["number"]))
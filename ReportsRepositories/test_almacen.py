@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar el almacén local SQLite
+"""
+
+import os
+import sys
+import tempfile
+import reporte_issues
+from almacen import AlmacenLocal
+from servidor_simulado import RepositorioSintetico, ServidorSimulado
+
+ISSUE = {
+    "number": 5,
+    "title": "Fallo al exportar",
+    "body": "Detalle",
+    "state": "closed",
+    "user": {"login": "ana"},
+    "assignee": None,
+    "created_at": "2024-01-01T10:00:00Z",
+    "updated_at": "2024-01-04T10:00:00Z",
+    "closed_at": "2024-01-03T10:00:00Z",
+    "html_url": "https://github.com/demo/repo/pull/5",
+    "comments": 2,
+    "pull_request": {}
+}
+
+COMMIT = {
+    "sha": "abc123",
+    "commit": {
+        "message": "Fixes #5",
+        "author": {"name": "Luis", "email": "luis@example.com", "date": "2024-01-02T09:00:00Z"},
+        "committer": {"name": "Luis", "email": "luis@example.com", "date": "2024-01-02T09:30:00Z"}
+    },
+    "html_url": "https://github.com/demo/repo/commit/abc123",
+    "stats": {"additions": 3, "deletions": 1, "total": 4}
+}
+
+
+def comentario(id_, autor, fecha):
+    return {"id": id_, "user": {"login": autor}, "body": f"Comentario {id_}",
+            "created_at": fecha, "updated_at": fecha}
+
+
+def test_tablas_normalizadas():
+    with tempfile.TemporaryDirectory() as directorio:
+        almacen = AlmacenLocal(os.path.join(directorio, "almacen.sqlite3"))
+        almacen.guardar_issues("demo/repo", [ISSUE, {**ISSUE, "number": 6, "state": "open",
+                                                     "user": {"login": "eva"}}])
+        almacen.guardar_issues("otro/repo", [ISSUE])
+        almacen.guardar_commits("demo/repo", [COMMIT])
+        almacen.guardar_comentarios("demo/repo", 5, [
+            comentario(2, "eva", "2024-01-02T00:00:00Z"), comentario(1, "ana", "2024-01-01T00:00:00Z")])
+
+        assert almacen.issues("demo/repo", estado="closed") == [ISSUE]
+        assert [i["number"] for i in almacen.issues("demo/repo", autor="eva")] == [6]
+        assert almacen.commits("demo/repo") == [COMMIT]
+        hilo = almacen.comentarios("demo/repo")[5]
+        assert [c["id"] for c in hilo] == [1, 2]
+        assert almacen.issues("otro/repo") == [ISSUE] and not almacen.issues("nada/repo")
+        almacen.cerrar()
+    print("✅ Issues, comentarios y commits guardados como filas y leídos con forma de la API")
+
+
+def test_hilos_y_marcas():
+    with tempfile.TemporaryDirectory() as directorio:
+        almacen = AlmacenLocal(os.path.join(directorio, "almacen.sqlite3"))
+        almacen.guardar_issues("demo/repo", [ISSUE])
+        almacen.guardar_commits("demo/repo", [COMMIT])
+        almacen.guardar_comentarios("demo/repo", 5, [
+            comentario(1, "ana", "2024-01-01T00:00:00Z"), comentario(2, "eva", "2024-01-02T00:00:00Z")])
+
+        # Un hilo completo reemplaza al guardado (el comentario 1 se borró en GitHub)
+        almacen.guardar_comentarios("demo/repo", 5, [comentario(2, "eva", "2024-01-02T00:00:00Z")])
+        assert [c["id"] for c in almacen.comentarios("demo/repo", 5)[5]] == [2]
+        # Los cambios de una descarga con since se añaden
+        almacen.guardar_comentarios("demo/repo", 5, [comentario(3, "ana", "2024-01-05T00:00:00Z")],
+                                    completo=False)
+        assert [c["id"] for c in almacen.comentarios("demo/repo")[5]] == [2, 3]
+
+        assert almacen.marcas("demo/repo") == {
+            "issues": "2024-01-04T10:00:00Z",
+            "commits": "2024-01-02T09:30:00Z",
+            "comentarios": "2024-01-05T00:00:00Z"
+        }
+        almacen.cerrar()
+    print("✅ Hilos completos reemplazados y marcas de agua por tabla")
+
+
+def test_marcas_con_desfases():
+    with tempfile.TemporaryDirectory() as directorio:
+        almacen = AlmacenLocal(os.path.join(directorio, "almacen.sqlite3"))
+        # 12:00+02:00 son las 10:00 UTC: como texto parecería la más reciente
+        almacen.guardar_commits("demo/repo", [
+            {**COMMIT, "sha": "a", "commit": {**COMMIT["commit"], "committer": {"date": "2024-01-02T12:00:00+02:00"}}},
+            {**COMMIT, "sha": "b", "commit": {**COMMIT["commit"], "committer": {"date": "2024-01-02T10:30:00Z"}}}])
+        almacen.guardar_issues("demo/repo", [
+            {**ISSUE, "number": 1, "updated_at": "2024-01-04T23:00:00-05:00"},
+            {**ISSUE, "number": 2, "updated_at": "2024-01-05T03:00:00Z"}])
+        almacen.registrar_ejecucion("demo/repo")
+
+        marcas = almacen.marcas("demo/repo")
+        assert marcas["commits"] == "2024-01-02T10:30:00Z", marcas
+        assert marcas["issues"] == "2024-01-05T04:00:00Z", marcas
+        assert almacen.ultima_ejecucion("demo/repo") == "2024-01-05T04:00:00Z"
+        assert [c["sha"] for c in almacen.commits("demo/repo")] == ["b", "a"]
+        almacen.cerrar()
+    print("✅ Fechas guardadas en UTC: marcas y orden por instantes, no por texto")
+
+
+def test_reporte_sin_conexion():
+    repositorio = RepositorioSintetico("demo/repo", n_issues=120, n_commits=150)
+    servidor = ServidorSimulado(repositorio)
+    url = servidor.iniciar()
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            reporte_issues.GITHUB_API_URL = url
+            reporte_issues.CACHE_DIR = directorio
+            reporte_issues.CHECKPOINT = False
+            reporte_issues.ALMACEN_LOCAL = True
+            reporte_issues.ALMACEN_RUTA = os.path.join(directorio, "almacen.sqlite3")
+            reporte_issues.configurar_cliente("token-de-prueba", "demo/repo")
+
+            # Las descargas quedan guardadas en el almacén al pasar
+            filas = reporte_issues.procesar_reporte(
+                reporte_issues.obtener_issues_y_prs(), reporte_issues.obtener_commits())
+            peticiones = servidor.estadisticas()["peticiones"]
+
+            issues, commits, comentarios = reporte_issues.leer_almacen()
+            locales = reporte_issues.procesar_reporte(issues, commits, comentarios=comentarios)
+            assert [f.como_tupla() for f in locales] == [f.como_tupla() for f in filas]
+            assert servidor.estadisticas()["peticiones"] == peticiones
+            reporte_issues.obtener_cliente().cerrar()
+            reporte_issues.obtener_almacen().cerrar()
+    finally:
+        reporte_issues.ALMACEN_LOCAL = False
+        reporte_issues._almacen = None
+        servidor.detener()
+    print("✅ Reporte regenerado desde el almacén local sin peticiones a la API")
+
+
+def test_reutiliza_hilos_de_la_ejecucion_anterior():
+    repositorio = RepositorioSintetico("demo/repo", n_issues=120, n_commits=150)
+    servidor = ServidorSimulado(repositorio)
+    url = servidor.iniciar()
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            reporte_issues.GITHUB_API_URL = url
+            reporte_issues.CACHE_DIR = directorio
+            reporte_issues.CACHE_HTTP = False
+            reporte_issues.CHECKPOINT = False
+            reporte_issues.ALMACEN_LOCAL = True
+            reporte_issues.ALMACEN_RUTA = os.path.join(directorio, "almacen.sqlite3")
+            reporte_issues.configurar_cliente("token-de-prueba", "demo/repo")
+
+            def ejecutar():
+                antes = servidor.estadisticas()["peticiones"]
+                filas = reporte_issues.procesar_reporte(
+                    reporte_issues.obtener_issues_y_prs(), reporte_issues.obtener_commits())
+                reporte_issues.finalizar_punto_control()
+                return filas, servidor.estadisticas()["peticiones"] - antes
+
+            primeras, _ = ejecutar()
+            # Un item recibe un comentario nuevo después de la primera ejecución
+            issue = next(i for i in repositorio.issues if i["comments"])
+            nuevo = {**repositorio._comentarios_por_numero[issue["number"]][0],
+                     "id": 999999, "body": "Comentario nuevo"}
+            repositorio._comentarios_por_numero[issue["number"]].append(nuevo)
+            issue["comments"] += 1
+            issue["updated_at"] = "2030-01-01T00:00:00Z"
+
+            segundas, peticiones = ejecutar()
+            # 2 páginas de issues + 2 de commits + solo el hilo que cambió
+            assert peticiones == 2 + 2 + 1, peticiones
+            cambiadas = [f["ID"] for f, g in zip(primeras, segundas) if f.como_tupla() != g.como_tupla()]
+            assert cambiadas == [issue["number"]]
+            fila = next(f for f in segundas if f["ID"] == issue["number"])
+            assert fila["Comentarios"].endswith("- " + nuevo["user"]["login"] + ": Comentario nuevo")
+            reporte_issues.obtener_cliente().cerrar()
+            reporte_issues.obtener_almacen().cerrar()
+    finally:
+        reporte_issues.ALMACEN_LOCAL = False
+        reporte_issues.CACHE_HTTP = True
+        reporte_issues._almacen = None
+        servidor.detener()
+    print("✅ Hilos de los items sin cambios reutilizados de la última ejecución completada")
+
+
+def test_hilos_del_planificador_para_excel_normalizado():
+    repositorio = RepositorioSintetico("demo/repo", n_issues=120, n_commits=20)
+    servidor = ServidorSimulado(repositorio)
+    url = servidor.iniciar()
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            reporte_issues.GITHUB_API_URL = url
+            reporte_issues.CACHE_DIR = directorio
+            reporte_issues.CACHE_HTTP = False
+            reporte_issues.CHECKPOINT = False
+            reporte_issues.ALMACEN_LOCAL = True
+            reporte_issues.COMENTARIOS_TIPOS = ("Issue",)
+            reporte_issues.ALMACEN_RUTA = os.path.join(directorio, "almacen.sqlite3")
+            reporte_issues.configurar_cliente("token-de-prueba", "demo/repo")
+            issues = reporte_issues.obtener_issues_y_prs()
+
+            primeros = {}
+            reporte_issues.procesar_reporte(issues, [], hilos=primeros)
+            reporte_issues.finalizar_punto_control()
+            # Segunda ejecución: los hilos sin cambios salen del almacén, no de la API
+            antes = servidor.estadisticas()["peticiones"]
+            segundos = {}
+            reporte_issues.procesar_reporte(issues, [], hilos=segundos)
+            peticiones = servidor.estadisticas()["peticiones"] - antes
+            reporte_issues.obtener_cliente().cerrar()
+            reporte_issues.obtener_almacen().cerrar()
+    finally:
+        reporte_issues.ALMACEN_LOCAL = False
+        reporte_issues.CACHE_HTTP = True
+        reporte_issues.COMENTARIOS_TIPOS = reporte_issues.TIPOS_TODOS
+        reporte_issues._almacen = None
+        servidor.detener()
+    esperados = {i["number"]: [c["id"] for c in repositorio._comentarios_por_numero[i["number"]]]
+                 for i in repositorio.issues if i["comments"] and "pull_request" not in i}
+    assert peticiones == 0, peticiones
+    for hilos in (primeros, segundos):
+        assert {n: [c["id"] for c in lista] for n, lista in hilos.items()} == esperados
+    print("✅ Comentarios del Excel normalizado tomados del planificador (tipos y reutilización)")
+
+
+def test_hilos_reanudados_llegan_al_almacen():
+    repositorio = RepositorioSintetico("demo/repo", n_issues=30, n_commits=5)
+    servidor = ServidorSimulado(repositorio)
+    url = servidor.iniciar()
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            reporte_issues.GITHUB_API_URL = url
+            reporte_issues.CACHE_DIR = directorio
+            reporte_issues.CHECKPOINT = True
+            reporte_issues.ALMACEN_RUTA = os.path.join(directorio, "almacen.sqlite3")
+            reporte_issues.configurar_cliente("token-de-prueba", "demo/repo")
+            numeros = [i["number"] for i in repositorio.issues if i["comments"]]
+
+            # La ejecución interrumpida dejó hilos solo en el punto de control
+            reporte_issues.obtener_comentarios_concurrente(numeros[:5])
+            reporte_issues.ALMACEN_LOCAL = True
+            reporte_issues.configurar_cliente("token-de-prueba", "demo/repo")
+            reporte_issues.obtener_comentarios_concurrente(numeros)
+            reporte_issues.finalizar_punto_control()
+
+            guardados = reporte_issues.obtener_almacen().comentarios("demo/repo")
+            reporte_issues.obtener_cliente().cerrar()
+            reporte_issues.obtener_almacen().cerrar()
+    finally:
+        reporte_issues.ALMACEN_LOCAL = False
+        reporte_issues.CHECKPOINT = False
+        reporte_issues._almacen = None
+        servidor.detener()
+    assert sorted(guardados) == sorted(numeros)
+    assert all(len(guardados[i["number"]]) == i["comments"] for i in repositorio.issues if i["comments"])
+    print("✅ Hilos leídos del punto de control guardados también en el almacén")
+
+
+if __name__ == "__main__":
+    try:
+        test_tablas_normalizadas()
+        test_hilos_y_marcas()
+        test_marcas_con_desfases()
+        test_reporte_sin_conexion()
+        test_reutiliza_hilos_de_la_ejecucion_anterior()
+        test_hilos_del_planificador_para_excel_normalizado()
+        test_hilos_reanudados_llegan_al_almacen()
+        print("\n🎉 Todas las pruebas del almacén local pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar la caché HTTP en disco contra la API simulada
+"""
+
+import os
+import sys
+import tempfile
+import time
+from cache_http import CacheHTTP
+from github_client import GitHubClient
+from servidor_simulado import RepositorioSintetico, ServidorSimulado
+
+PARAMS = {"state": "all", "per_page": 10}
+
+
+def test_304_servido_desde_disco():
+    servidor = ServidorSimulado(RepositorioSintetico("demo/repo", n_issues=50, n_commits=5), limite=100)
+    url = servidor.iniciar()
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            cliente = GitHubClient("token-de-prueba", "demo/repo", api_url=url,
+                                   cache=CacheHTTP(directorio))
+            primera = cliente.obtener(cliente.url_repo("/issues"), params=PARAMS)
+            # Una petición que sí gasta cuota entre las dos lecturas
+            cliente.obtener(cliente.url_repo("/commits"))
+            segunda = cliente.obtener(cliente.url_repo("/issues"), params=PARAMS)
+            cliente.cerrar()
+        estadisticas = servidor.estadisticas()
+    finally:
+        servidor.detener()
+    assert estadisticas["por_estado"] == {"200": 2, "304": 1}, estadisticas
+    assert getattr(segunda, "from_cache", False) and segunda.status_code == 200
+    assert segunda.json() == primera.json()
+    for cabecera in ("Link", "ETag", "Content-Type"):
+        assert segunda.headers[cabecera] == primera.headers[cabecera], cabecera
+    assert segunda.links["next"]["url"].endswith("page=2")
+    # Cuota del 304 y no la guardada con la primera respuesta
+    assert primera.headers["X-RateLimit-Remaining"] == "99"
+    assert segunda.headers["X-RateLimit-Remaining"] == "98"
+    print("✅ Respuesta 304 servida desde disco con Link guardado y cuota actualizada")
+
+
+def test_expulsion_lru_hasta_el_90_por_ciento():
+    servidor = ServidorSimulado(RepositorioSintetico("demo/repo", n_issues=50, n_commits=5))
+    url = servidor.iniciar()
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            cache = CacheHTTP(directorio)
+            cliente = GitHubClient("token-de-prueba", "demo/repo", api_url=url, cache=cache)
+            rutas = {}
+
+            def pedir(pagina, antiguedad):
+                params = {**PARAMS, "page": pagina}
+                cliente.obtener(cliente.url_repo("/issues"), params=params)
+                rutas[pagina] = cache._ruta(cliente._url_completa(cliente.url_repo("/issues"), params))
+                # Fechas de uso separadas para un orden LRU determinista
+                instante = time.time() - antiguedad
+                os.utime(rutas[pagina], (instante, instante))
+
+            for pagina, antiguedad in ((1, 300), (2, 200), (3, 100)):
+                pedir(pagina, antiguedad)
+            tamano = os.path.getsize(rutas[1])
+            # Caben tres entradas pero no cuatro; tres quedan por debajo del 90%
+            cache.max_bytes = int(tamano * 3.6)
+            # Leer la página 1 la convierte en la usada más recientemente
+            assert cache.leer(cliente._url_completa(cliente.url_repo("/issues"), {**PARAMS, "page": 1}))
+            pedir(4, 0)
+
+            presentes = {pagina for pagina, ruta in rutas.items() if os.path.exists(ruta)}
+            en_disco = sum(e.stat().st_size for e in os.scandir(directorio) if e.name.endswith(".json"))
+            total, limite = cache._total, cache.max_bytes
+            reabierta = CacheHTTP(directorio)._total
+            cliente.cerrar()
+    finally:
+        servidor.detener()
+    assert presentes == {1, 3, 4}, presentes
+    assert total == en_disco == reabierta
+    assert total <= limite * 0.9 < total + tamano
+    print("✅ Entradas menos usadas expulsadas hasta bajar del 90% del tamaño máximo")
+
+
+if __name__ == "__main__":
+    try:
+        test_304_servido_desde_disco()
+        test_expulsion_lru_hasta_el_90_por_ciento()
+        print("\n🎉 Todas las pruebas de la caché HTTP pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
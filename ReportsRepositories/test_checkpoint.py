@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar los puntos de control de descargas interrumpidas
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import reporte_issues
+from checkpoint import PuntoControl
+from github_client import GitHubClient
+from servidor_simulado import RepositorioSintetico, ServidorSimulado
+
+
+def test_reanuda_paginas_interrumpidas():
+    servidor = ServidorSimulado(RepositorioSintetico("demo/repo", n_issues=95, n_commits=5))
+    url = servidor.iniciar()
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            cliente = GitHubClient("token-de-prueba", "demo/repo", api_url=url)
+            endpoint = cliente.url_repo("/issues")
+            params = {"state": "all"}
+
+            # Primera ejecución: se detiene tras recibir dos páginas
+            punto_control = PuntoControl(directorio, "demo/repo")
+            paginas = cliente.iterar_paginas(endpoint, params, max_workers=1, per_page=10,
+                                             checkpoint=punto_control)
+            recibidas = [next(paginas), next(paginas)]
+            paginas.close()
+            guardadas = len(os.listdir(os.path.join(punto_control.directorio, "paginas")))
+
+            # Ejecución reanudada: solo se piden las páginas que faltan
+            antes = servidor.estadisticas()["peticiones"]
+            reanudada = list(cliente.iterar_paginas(endpoint, params, max_workers=1, per_page=10,
+                                                    checkpoint=PuntoControl(directorio, "demo/repo")))
+            peticiones = servidor.estadisticas()["peticiones"] - antes
+            cliente.cerrar()
+    finally:
+        servidor.detener()
+    assert 2 <= guardadas < 10, guardadas
+    assert peticiones == 10 - guardadas, peticiones
+    assert reanudada[:2] == recibidas
+    assert [i["number"] for p in reanudada for i in p] == list(range(95, 0, -1))
+    print("✅ Páginas completadas leídas del punto de control al reanudar")
+
+
+def test_reanuda_hilos_de_comentarios():
+    repositorio = RepositorioSintetico("demo/repo", n_issues=30, n_commits=5)
+    servidor = ServidorSimulado(repositorio)
+    url = servidor.iniciar()
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            reporte_issues.GITHUB_API_URL = url
+            reporte_issues.CACHE_DIR = directorio
+            reporte_issues.CACHE_HTTP = False
+            reporte_issues.CHECKPOINT = True
+            reporte_issues.configurar_cliente("token-de-prueba", "demo/repo")
+            numeros = [i["number"] for i in repositorio.issues if i["comments"]]
+
+            # La ejecución interrumpida llegó a descargar los primeros hilos
+            primeros = reporte_issues.obtener_comentarios_concurrente(numeros[:5], max_workers=2)
+            reporte_issues.configurar_cliente("token-de-prueba", "demo/repo")
+            antes = servidor.estadisticas()["peticiones"]
+            todos = reporte_issues.obtener_comentarios_concurrente(numeros, max_workers=2)
+            peticiones = servidor.estadisticas()["peticiones"] - antes
+
+            reporte_issues.finalizar_punto_control()
+            quedan = os.path.exists(os.path.join(directorio, "checkpoint", "demo__repo"))
+            reporte_issues.obtener_cliente().cerrar()
+    finally:
+        reporte_issues.CHECKPOINT = False
+        reporte_issues.CACHE_HTTP = True
+        servidor.detener()
+    assert peticiones == len(numeros) - 5, peticiones
+    assert all(todos[n] == texto for n, texto in primeros.items())
+    assert not quedan
+    print("✅ Hilos de comentarios ya descargados reutilizados al reanudar")
+
+
+def test_reanuda_con_items_nuevos():
+    repositorio = RepositorioSintetico("demo/repo", n_issues=450, n_commits=250)
+    servidor = ServidorSimulado(repositorio)
+    url = servidor.iniciar()
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            reporte_issues.GITHUB_API_URL = url
+            reporte_issues.CACHE_DIR = directorio
+            reporte_issues.CACHE_HTTP = False
+            reporte_issues.CHECKPOINT = True
+            reporte_issues.configurar_cliente("token-de-prueba", "demo/repo")
+            originales = [c["sha"] for c in repositorio.commits]
+
+            # La ejecución interrumpida guardó las primeras páginas de cada endpoint
+            paginas = reporte_issues.iterar_issues_y_prs()
+            next(paginas), next(paginas)
+            paginas.close()
+            paginas = reporte_issues.iterar_commits()
+            next(paginas)
+            paginas.close()
+
+            # Antes de reanudar se crean issues y commits nuevos
+            for numero in range(451, 458):
+                repositorio.issues.insert(0, {**repositorio.issues[0], "number": numero,
+                                              "created_at": "2030-01-01T00:00:00Z"})
+            for i in range(5):
+                repositorio.commits.insert(0, {**repositorio.commits[0], "sha": f"nuevo{i}", "commit": {
+                    "message": f"Cambio nuevo {i}", "author": {"date": "2099-01-01T00:00:00Z"}}})
+
+            reporte_issues.configurar_cliente("token-de-prueba", "demo/repo")
+            numeros = [i["number"] for i in reporte_issues.obtener_issues_y_prs()]
+            commits = [c["sha"] for c in reporte_issues.obtener_commits()]
+            reporte_issues.finalizar_punto_control()
+            reporte_issues.obtener_cliente().cerrar()
+    finally:
+        reporte_issues.CHECKPOINT = False
+        reporte_issues.CACHE_HTTP = True
+        servidor.detener()
+    # Sin filas repetidas ni items antiguos perdidos
+    assert len(numeros) == len(set(numeros)), (len(numeros), len(set(numeros)))
+    assert set(range(1, 451)) <= set(numeros)
+    assert numeros == sorted(numeros)
+    # Los commits posteriores al inicio quedan fuera y las páginas no se desplazan
+    assert commits == originales, len(commits)
+    print("✅ Reanudación sin duplicados ni pérdidas aunque aparezcan items nuevos")
+
+
+def test_caducidad_y_limpieza():
+    with tempfile.TemporaryDirectory() as directorio:
+        punto_control = PuntoControl(directorio, "demo/repo")
+        punto_control.guardar_pagina("issues", 1, [{"number": 1}], ultima=3)
+        punto_control.guardar_comentarios(1, [{"id": 10}])
+
+        # Dentro de las 24 horas se reanuda
+        ruta_meta = os.path.join(punto_control.directorio, "meta.json")
+        with open(ruta_meta, encoding="utf-8") as f:
+            meta = json.load(f)
+        meta["creado"] = time.time() - 23 * 3600
+        with open(ruta_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        reabierto = PuntoControl(directorio, "demo/repo")
+        assert reabierto.leer_pagina("issues", 1) == {"datos": [{"number": 1}], "ultima": 3}
+        assert reabierto.leer_comentarios(1) == [{"id": 10}]
+        assert reabierto.leer_pagina("issues", 2) is None
+
+        # Pasadas 24 horas se descarta y empieza de cero
+        meta["creado"] = time.time() - 25 * 3600
+        with open(ruta_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        caducado = PuntoControl(directorio, "demo/repo")
+        assert caducado.leer_pagina("issues", 1) is None
+        assert caducado.leer_comentarios(1) is None
+
+        # limpiar elimina todo lo guardado tras una ejecución completada
+        caducado.guardar_comentarios(2, [])
+        caducado.limpiar()
+        assert not os.path.exists(caducado.directorio)
+        assert PuntoControl(directorio, "demo/repo").leer_comentarios(2) is None
+    print("✅ Punto de control caducado a las 24 horas y eliminado con limpiar")
+
+
+if __name__ == "__main__":
+    try:
+        test_reanuda_paginas_interrumpidas()
+        test_reanuda_hilos_de_comentarios()
+        test_reanuda_con_items_nuevos()
+        test_caducidad_y_limpieza()
+        print("\n🎉 Todas las pruebas del punto de control pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
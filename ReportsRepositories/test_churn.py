@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar las tablas de churn (líneas cambiadas) de los commits
+"""
+
+import sys
+from analytics import GitHubAnalytics
+
+
+def commit(sha, autor, fecha, mensaje="Cambio", agregadas=None, eliminadas=0):
+    datos = {"sha": sha, "commit": {"message": mensaje, "author": {"name": autor, "date": fecha}}}
+    if agregadas is not None:
+        datos["stats"] = {"additions": agregadas, "deletions": eliminadas, "total": agregadas + eliminadas}
+    return datos
+
+
+def test_commits_sin_estadisticas():
+    analytics = GitHubAnalytics(commits=[
+        commit("a", "luis", "2024-01-10T10:00:00Z", agregadas=10, eliminadas=2),
+        commit("b", "eva", "2024-01-11T10:00:00Z", agregadas=1, eliminadas=1),
+        # Sin stats (p. ej. /commits sin pedir cada commit): no cuenta como 0 líneas
+        commit("c", "eva", "2024-01-12T10:00:00Z"),
+    ])
+    por_autor = analytics.churn_por_autor()
+    assert list(por_autor.index) == ["luis", "eva"]
+    assert por_autor.loc["eva"].to_dict() == {"Commits": 1, "Agregadas": 1, "Eliminadas": 1, "Cambios": 2}
+    assert por_autor.loc["luis", "Cambios"] == 12
+
+    solo_sin_stats = GitHubAnalytics(commits=[commit("c", "eva", "2024-01-12T10:00:00Z")])
+    assert solo_sin_stats.churn_por_autor().empty
+    assert solo_sin_stats.churn_por_mes().empty and solo_sin_stats.churn_por_issue().empty
+    print("✅ Commits sin stats fuera del churn en lugar de sumar cero líneas")
+
+
+def test_meses_con_desfases():
+    analytics = GitHubAnalytics(commits=[
+        # 01:00+02:00 del 1 de febrero es el 31 de enero en UTC
+        commit("a", "luis", "2024-02-01T01:00:00+02:00", agregadas=4),
+        commit("b", "luis", "2024-01-31T20:00:00-05:00", agregadas=8),
+        commit("c", "eva", "2024-02-15T10:00:00Z", agregadas=1),
+    ])
+    por_mes = analytics.churn_por_mes()
+    assert [str(mes) for mes in por_mes.index] == ["2024-01", "2024-02"]
+    assert list(por_mes["Commits"]) == [1, 2]
+    assert list(por_mes["Agregadas"]) == [4, 9]
+    print("✅ Churn por mes agrupado por el instante en UTC")
+
+
+def test_commit_que_cierra_varios_issues():
+    analytics = GitHubAnalytics(commits=[
+        commit("a", "luis", "2024-01-10T10:00:00Z", "Fixes #1, closes #2", agregadas=10, eliminadas=5),
+        commit("b", "eva", "2024-01-11T10:00:00Z", "Ver #2", agregadas=3),
+        commit("c", "eva", "2024-01-12T10:00:00Z", "Sin referencias", agregadas=100),
+    ], repo="demo/repo")
+    por_issue = analytics.churn_por_issue()
+    # Cada issue cerrado por el commit cuenta todas sus líneas
+    assert list(por_issue.index) == [2, 1]
+    assert por_issue.loc[1].to_dict() == {"Commits": 1, "Agregadas": 10, "Eliminadas": 5, "Cambios": 15}
+    assert por_issue.loc[2].to_dict() == {"Commits": 2, "Agregadas": 13, "Eliminadas": 5, "Cambios": 18}
+    print("✅ Churn por issue con un commit que cierra varios issues")
+
+
+if __name__ == "__main__":
+    try:
+        test_commits_sin_estadisticas()
+        test_meses_con_desfases()
+        test_commit_que_cierra_varios_issues()
+        print("\n🎉 Todas las pruebas del churn pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
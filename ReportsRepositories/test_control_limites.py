@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar el control de límites de peticiones
+"""
+
+import sys
+import time
+from control_limites import ControlLimites
+
+
+class RespuestaFalsa:
+    """Respuesta mínima con código, cabeceras y cuerpo"""
+
+    def __init__(self, status_code=200, headers=None, text=""):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = text
+
+
+def test_reduce_concurrencia_con_poca_cuota():
+    control = ControlLimites(max_concurrencia=16, reserva=0)
+    control.adquirir()
+    control.liberar(RespuestaFalsa(headers={
+        "X-RateLimit-Remaining": "300",
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Reset": str(int(time.time()) + 600)}))
+    assert control.concurrencia == 1
+    assert control.restantes == 300
+    print("✅ Concurrencia reducida con cuota baja")
+
+
+def test_reserva_proporcional_a_la_cuota():
+    reinicio = str(int(time.time()) + 3000)
+
+    def cuota(restantes, limite):
+        return RespuestaFalsa(headers={"X-RateLimit-Remaining": str(restantes),
+                                       "X-RateLimit-Limit": str(limite), "X-RateLimit-Reset": reinicio})
+
+    # Sin token (60 por hora) no se pausa tras solo 10 peticiones
+    control = ControlLimites()
+    for restantes in (59, 50, 10, 2):
+        control.adquirir()
+        control.liberar(cuota(restantes, 60))
+        assert control._pausa_hasta == 0.0, restantes
+    assert control.reserva_actual() == 1
+    control.adquirir()
+    control.liberar(cuota(1, 60))
+    assert control._pausa_hasta > time.time()
+
+    # Con token (5000 por hora) la reserva sigue limitada a 50
+    control = ControlLimites()
+    control.adquirir()
+    control.liberar(cuota(51, 5000))
+    assert control.reserva_actual() == 50 and control._pausa_hasta == 0.0
+    control.adquirir()
+    control.liberar(cuota(50, 5000))
+    assert control._pausa_hasta > time.time()
+    print("✅ Reserva de cuota proporcional al límite, como mucho 50")
+
+
+def test_detecta_limite_secundario():
+    control = ControlLimites()
+    secundario = RespuestaFalsa(403, {"Retry-After": "7"})
+    permisos = RespuestaFalsa(403, text='{"message": "Resource not accessible"}')
+    assert control.es_limite_superado(secundario)
+    assert not control.es_limite_superado(permisos)
+    assert control.debe_reintentar(secundario, 0)
+    assert not control.debe_reintentar(permisos, 0)
+    assert control.espera_reintento(secundario, 0) == 7
+    print("✅ Límite secundario detectado y errores de permisos sin reintento")
+
+
+def test_reintenta_errores_de_servidor_con_backoff():
+    control = ControlLimites(max_reintentos=3, espera_base=1.0)
+    error = RespuestaFalsa(502)
+    assert control.debe_reintentar(error, 2)
+    assert not control.debe_reintentar(error, 3)
+    assert 4.0 <= control.espera_reintento(error, 2) <= 5.0
+    print("✅ Backoff exponencial para errores 5xx")
+
+
+if __name__ == "__main__":
+    try:
+        test_reduce_concurrencia_con_poca_cuota()
+        test_reserva_proporcional_a_la_cuota()
+        test_detecta_limite_secundario()
+        test_reintenta_errores_de_servidor_con_backoff()
+        print("\n🎉 Todas las pruebas del control de límites pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar los escritores de reportes en streaming
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+import openpyxl
+from escritores import (ENCABEZADO_MARKDOWN, EscritorExcel, EscritorExcelNormalizado,
+                        EscritorMarkdown, HOJA_DESBORDAMIENTO, LIMITE_CELDA, MARCA_DESBORDAMIENTO,
+                        abrir_markdown, formatear_seccion_markdown)
+from modelo import COLUMNAS, DatasetReporte, Fila
+
+
+def issue(numero, **cambios):
+    return {
+        "number": numero,
+        "title": f"Item {numero}",
+        "body": "Detalle",
+        "state": "open",
+        "created_at": "2024-01-01T10:00:00Z",
+        "html_url": f"https://github.com/demo/repo/issues/{numero}",
+        **cambios
+    }
+
+
+def test_excel_fila_a_fila():
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "reporte.xlsx")
+        escritor = EscritorExcel(ruta)
+        escritor.escribir(Fila.desde_issue(issue(1, title="Con\x07control")))
+        escritor.escribir(Fila.desde_issue(issue(2)).como_dict())
+        escritor.cerrar()
+
+        hoja = openpyxl.load_workbook(ruta)["Sheet1"]
+        filas = list(hoja.iter_rows(values_only=True))
+    assert filas[0] == COLUMNAS
+    assert filas[1][0] == 1 and filas[1][2] == "Concontrol"
+    assert filas[1][6] == datetime(2024, 1, 1, 10)
+    assert filas[2][6] == "2024-01-01T10:00:00Z"
+    print("✅ Filas escritas en streaming, fechas sin zona y sin caracteres de control")
+
+
+def test_textos_que_superan_la_celda():
+    largo = "abc" * 30000
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "reporte.xlsx")
+        escritor = EscritorExcel(ruta)
+        escritor.escribir(Fila.desde_issue(issue(7, body=largo)))
+        escritor.cerrar()
+
+        libro = openpyxl.load_workbook(ruta)
+        descripcion = libro["Sheet1"]["D2"].value
+        partes = list(libro[HOJA_DESBORDAMIENTO].iter_rows(min_row=2, values_only=True))
+    assert len(descripcion) == LIMITE_CELDA and descripcion.endswith(MARCA_DESBORDAMIENTO)
+    assert [p[:4] for p in partes] == [("Sheet1", 7, "Descripción", n) for n in (1, 2, 3)]
+    assert "".join(p[4] for p in partes) == largo
+    print("✅ Textos largos truncados con marca y completos en la hoja de desbordamiento")
+
+
+def test_excel_desde_dataset():
+    filas = [Fila.desde_issue(issue(1)), Fila.desde_issue(issue(2, state="closed", closed_at="2024-01-02T00:00:00Z"))]
+    dataset = DatasetReporte(filas)
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "reporte.xlsx")
+        escritor = EscritorExcel(ruta, columnas=dataset.df.columns)
+        for valores in dataset.iterar_valores():
+            escritor.escribir_valores(valores)
+        escritor.cerrar()
+        filas_excel = list(openpyxl.load_workbook(ruta)["Sheet1"].iter_rows(min_row=2, values_only=True))
+    assert [f[:7] for f in filas_excel] == [f.como_valores()[:6] + (datetime(2024, 1, 1, 10),) for f in filas]
+    assert filas_excel[0][7] is None and filas_excel[1][7] == datetime(2024, 1, 2)
+    print("✅ Dataset volcado con tipos de Excel (fechas vacías como celdas vacías)")
+
+
+def test_markdown_en_streaming():
+    filas = [Fila.desde_issue(issue(n)) for n in range(1, 4)]
+    with tempfile.TemporaryDirectory() as directorio:
+        rutas = [os.path.join(directorio, "reporte.md"), os.path.join(directorio, "reporte.md.gz")]
+        for ruta in rutas:
+            escritor = EscritorMarkdown(ruta)
+            # Un generador: el escritor no necesita la lista completa
+            escritor.escribir_todas(fila for fila in filas)
+            escritor.cerrar()
+        textos = []
+        for ruta in rutas:
+            with abrir_markdown(ruta) as archivo:
+                textos.append(archivo.read())
+        with open(rutas[1], "rb") as archivo:
+            assert archivo.read(2) == b"\x1f\x8b"
+    esperado = ENCABEZADO_MARKDOWN + "".join(formatear_seccion_markdown(f) for f in filas)
+    assert textos == [esperado, esperado]
+    print("✅ Markdown escrito sección a sección, plano y comprimido con gzip")
+
+
+def test_libro_normalizado():
+    commit = {
+        "sha": "abc",
+        "commit": {"message": "Fixes #1\n\nDetalle",
+                   "author": {"name": "luis", "date": "2024-01-02T09:00:00Z"}},
+        "html_url": "https://github.com/demo/repo/commit/abc"
+    }
+    comentario = {"id": 90, "user": {"login": "ana"}, "body": "Hecho",
+                  "created_at": "2024-01-03T08:00:00Z", "updated_at": "2024-01-03T08:00:00Z"}
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "reporte.xlsx")
+        escritor = EscritorExcelNormalizado(ruta)
+        escritor.escribir_item(Fila.desde_issue(issue(1)), 1, 1)
+        escritor.escribir_comentario(1, comentario)
+        escritor.escribir_commit(commit)
+        escritor.escribir_enlace(1, "abc", "cierra")
+        escritor.cerrar()
+
+        libro = openpyxl.load_workbook(ruta)
+        hojas = {h.title: list(h.iter_rows(values_only=True)) for h in libro.worksheets}
+        filtros = {h.title: h.auto_filter.ref for h in libro.worksheets}
+    assert list(hojas) == ["Items", "Comentarios", "Commits", "Enlaces"]
+    assert hojas["Items"][1][-3:] == (1, 1, "https://github.com/demo/repo/issues/1")
+    assert hojas["Comentarios"][1] == (90, 1, "ana", datetime(2024, 1, 3, 8), "Hecho")
+    assert hojas["Commits"][1][:4] == ("abc", "luis", datetime(2024, 1, 2, 9), "Fixes #1\n\nDetalle")
+    assert hojas["Enlaces"][1] == (1, "abc", "cierra")
+    assert filtros == {"Items": "A1:K2", "Comentarios": "A1:E2", "Commits": "A1:G2", "Enlaces": "A1:C2"}
+    print("✅ Libro normalizado con una fila por item, comentario, commit y enlace, con autofiltro")
+
+
+if __name__ == "__main__":
+    try:
+        test_excel_fila_a_fila()
+        test_textos_que_superan_la_celda()
+        test_excel_desde_dataset()
+        test_markdown_en_streaming()
+        test_libro_normalizado()
+        print("\n🎉 Todas las pruebas de los escritores pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
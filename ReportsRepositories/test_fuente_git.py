@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar la lectura de commits desde un clon local
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from fuente_git import iterar_commits_locales, obtener_commits_locales
+from referencias import indexar_referencias
+
+
+def git(ruta, *args, fecha="2024-03-01T10:00:00+02:00"):
+    entorno = {**os.environ, "GIT_AUTHOR_NAME": "Ana", "GIT_AUTHOR_EMAIL": "ana@example.com",
+               "GIT_COMMITTER_NAME": "Luis", "GIT_COMMITTER_EMAIL": "luis@example.com",
+               "GIT_AUTHOR_DATE": fecha, "GIT_COMMITTER_DATE": fecha}
+    subprocess.run(["git", "-C", ruta, *args], check=True, capture_output=True, env=entorno)
+
+
+def crear_repositorio(ruta):
+    git(ruta, "init", "-q", "-b", "main")
+    with open(os.path.join(ruta, "a.txt"), "w") as f:
+        f.write("uno\ndos\n")
+    git(ruta, "add", "a.txt")
+    git(ruta, "commit", "-q", "-m", "Fixes #3: primera versión\n\nDetalle", fecha="2024-03-01T10:00:00+02:00")
+    git(ruta, "checkout", "-q", "-b", "rama")
+    with open(os.path.join(ruta, "a.txt"), "w") as f:
+        f.write("uno\n")
+    git(ruta, "commit", "-q", "-am", "Cambio en otra rama, ver #4", fecha="2024-03-05T10:00:00+00:00")
+    git(ruta, "checkout", "-q", "main")
+
+
+def test_formato_de_la_api_y_todas_las_ramas():
+    with tempfile.TemporaryDirectory() as ruta:
+        crear_repositorio(ruta)
+        commits = obtener_commits_locales(ruta, numstat=True, url_base="https://github.com/demo/repo")
+        assert len(commits) == 2, commits
+        reciente, primero = commits
+        assert reciente["commit"]["message"] == "Cambio en otra rama, ver #4"
+        assert primero["commit"]["message"] == "Fixes #3: primera versión\n\nDetalle"
+        assert primero["commit"]["author"] == {
+            "name": "Ana", "email": "ana@example.com", "date": "2024-03-01T08:00:00Z"}
+        assert primero["commit"]["committer"]["name"] == "Luis"
+        assert primero["html_url"] == f"https://github.com/demo/repo/commit/{primero['sha']}"
+        assert primero["stats"] == {"additions": 2, "deletions": 0, "total": 2}
+        assert reciente["files"] == [
+            {"filename": "a.txt", "additions": 0, "deletions": 1, "changes": 1}]
+
+        indice = indexar_referencias(commits, "demo/repo")
+        assert set(indice) == {"3", "4"}
+    print("✅ Commits de todas las ramas con la forma del endpoint /commits")
+
+
+def test_since_y_paginas():
+    with tempfile.TemporaryDirectory() as ruta:
+        crear_repositorio(ruta)
+        recientes = obtener_commits_locales(ruta, since="2024-03-03T00:00:00Z")
+        assert [c["commit"]["message"] for c in recientes] == ["Cambio en otra rama, ver #4"]
+        paginas = list(iterar_commits_locales(ruta, tam_pagina=1))
+        assert [len(p) for p in paginas] == [1, 1], paginas
+    print("✅ Filtro since y páginas de tamaño fijo")
+
+
+def test_error_si_no_es_un_repositorio():
+    with tempfile.TemporaryDirectory() as ruta:
+        try:
+            obtener_commits_locales(ruta)
+        except RuntimeError as e:
+            assert "git log falló" in str(e)
+        else:
+            raise AssertionError("una carpeta sin repositorio debería fallar")
+    print("✅ Error claro cuando la ruta no es un clon de git")
+
+
+if __name__ == "__main__":
+    try:
+        test_formato_de_la_api_y_todas_las_ramas()
+        test_since_y_paginas()
+        test_error_si_no_es_un_repositorio()
+        print("\n🎉 Todas las pruebas de la fuente git pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
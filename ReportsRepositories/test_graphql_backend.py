@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar que el backend GraphQL devuelve los mismos datos que REST
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+import reporte_issues
+from graphql_backend import BackendGraphQL, _comentario_rest, _issue_rest
+from servidor_simulado import RepositorioSintetico
+
+NODO_PR = {
+    "id": "PR_1", "number": 7, "title": "Arreglo", "body": "Detalle", "state": "MERGED",
+    "url": "https://github.com/demo/repo/pull/7", "createdAt": "2024-01-01T10:00:00Z",
+    "updatedAt": "2024-01-03T10:00:00Z", "closedAt": "2024-01-02T10:00:00Z",
+    "assignees": {"nodes": [{"login": "ana"}]}, "labels": {"nodes": [{"name": "bug"}]},
+    "comments": {"totalCount": 0, "pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": []}
+}
+
+
+def _con_desfase(fecha):
+    """La misma fecha expresada en +02:00, como puede devolverla GraphQL"""
+    instante = datetime.fromisoformat(fecha.replace("Z", "+00:00"))
+    return instante.astimezone(timezone(timedelta(hours=2))).isoformat()
+
+
+class ClienteFalso:
+    """Responde las consultas GraphQL con los datos de un RepositorioSintetico"""
+
+    def __init__(self, repositorio, por_pagina=40):
+        self.repositorio = repositorio
+        self.repo = repositorio.repo
+        self.por_pagina = por_pagina
+        self.consultas = {"items": 0, "comentarios": 0, "historial": 0}
+
+    def url_repo(self, ruta=""):
+        return f"/repos/{self.repo}{ruta}"
+
+    @staticmethod
+    def _pagina(elementos, cursor, tamano):
+        inicio = int(cursor or 0)
+        fin = inicio + tamano
+        return elementos[inicio:fin], {"hasNextPage": fin < len(elementos), "endCursor": str(fin)}
+
+    def _comentarios(self, numero, cursor, tamano):
+        lista = self.repositorio._comentarios_por_numero.get(numero, [])
+        nodos, info = self._pagina(lista, cursor, tamano)
+        return {"totalCount": len(lista), "pageInfo": info, "nodes": [
+            {"databaseId": c["id"], "body": c["body"], "createdAt": c["created_at"],
+             "updatedAt": c["updated_at"], "author": c["user"]} for c in nodos]}
+
+    def _item(self, issue, max_comentarios):
+        estado = "OPEN" if issue["state"] == "open" else "CLOSED"
+        if estado == "CLOSED" and "pull_request" in issue:
+            estado = "MERGED"
+        return {
+            "id": f"I_{issue['number']}", "number": issue["number"], "title": issue["title"],
+            "body": issue["body"], "state": estado, "url": issue["html_url"],
+            "createdAt": issue["created_at"], "updatedAt": issue["updated_at"],
+            "closedAt": issue["closed_at"],
+            "assignees": {"nodes": [issue["assignee"]] if issue["assignee"] else []},
+            "labels": {"nodes": issue["labels"]},
+            "comments": self._comentarios(issue["number"], None, max_comentarios)
+        }
+
+    def _commit(self, commit):
+        autor = commit["commit"]["author"]
+        persona = {"name": autor["name"], "email": autor["email"], "date": _con_desfase(autor["date"])}
+        return {"oid": commit["sha"], "message": commit["commit"]["message"], "url": commit["html_url"],
+                "additions": 3, "deletions": 1, "author": persona, "committer": persona}
+
+    def consultar_graphql(self, consulta, variables=None):
+        if "history(" in consulta:
+            self.consultas["historial"] += 1
+            nodos, info = self._pagina(self.repositorio.commits, variables["cursor"], self.por_pagina)
+            return {"repository": {"defaultBranchRef": {"target": {"history": {
+                "pageInfo": info, "nodes": [self._commit(c) for c in nodos]}}}}}
+        if "node(id:" in consulta:
+            self.consultas["comentarios"] += 1
+            numero = int(variables["id"].split("_")[1])
+            return {"node": {"comments": self._comentarios(numero, variables["cursor"], 100)}}
+
+        self.consultas["items"] += 1
+        conexion = "pullRequests" if "pullRequests(" in consulta else "issues"
+        elegidos = [i for i in self.repositorio.issues
+                    if ("pull_request" in i) == (conexion == "pullRequests")]
+        nodos, info = self._pagina(elegidos, variables["cursor"], self.por_pagina)
+        return {"repository": {conexion: {"pageInfo": info, "nodes": [
+            self._item(i, variables["maxComentarios"]) for i in nodos]}}}
+
+
+def test_conversion_a_forma_rest():
+    issue = _issue_rest(NODO_PR, es_pr=True)
+    assert issue["state"] == "closed"
+    assert issue["pull_request"] == {"html_url": NODO_PR["url"]}
+    assert issue["assignee"] == {"login": "ana"} and issue["labels"] == [{"name": "bug"}]
+    assert "pull_request" not in _issue_rest({**NODO_PR, "state": "OPEN"}, es_pr=False)
+
+    comentario = _comentario_rest({"databaseId": 3, "body": "Hola", "createdAt": "2024-01-01T00:00:00Z",
+                                   "updatedAt": "2024-01-01T00:00:00Z", "author": None}, "/repos/demo/repo/issues/7")
+    assert comentario == {"id": 3, "user": {"login": "ghost"}, "body": "Hola",
+                          "created_at": "2024-01-01T00:00:00Z", "updated_at": "2024-01-01T00:00:00Z",
+                          "issue_url": "/repos/demo/repo/issues/7"}
+    print("✅ Issues, PRs fusionados y comentarios de autores eliminados con la forma de REST")
+
+
+def test_completa_hilos_y_fechas_utc():
+    repositorio = RepositorioSintetico("demo/repo", n_issues=90, n_commits=100)
+    cliente = ClienteFalso(repositorio)
+    issues, comentarios = BackendGraphQL(cliente, max_comentarios=2).obtener_issues_y_comentarios()
+
+    # Los hilos de más de 2 comentarios se completan con consultas adicionales
+    largos = [n for n, lista in repositorio._comentarios_por_numero.items() if len(lista) > 2]
+    assert largos and cliente.consultas["comentarios"] == len(largos)
+    assert {n: [c["id"] for c in lista] for n, lista in comentarios.items()} == {
+        n: [c["id"] for c in lista] for n, lista in repositorio._comentarios_por_numero.items()}
+    assert [i["number"] for i in issues] == list(range(1, 91))
+
+    paginas = list(BackendGraphQL(cliente).iterar_historial_commits())
+    assert len(paginas) == 3
+    commits = [c for pagina in paginas for c in pagina]
+    assert [c["commit"]["author"]["date"] for c in commits] == [
+        c["commit"]["author"]["date"] for c in repositorio.commits]
+    assert all(c["commit"]["committer"]["date"].endswith("Z") for c in commits)
+    assert commits[0]["stats"] == {"additions": 3, "deletions": 1, "total": 4}
+    print("✅ Hilos completados por páginas y fechas de commits en UTC")
+
+
+def test_mismo_reporte_que_rest():
+    repositorio = RepositorioSintetico("demo/repo", n_issues=150, n_commits=200)
+    cliente = ClienteFalso(repositorio)
+    backend = BackendGraphQL(cliente, max_comentarios=2)
+    issues, comentarios = backend.obtener_issues_y_comentarios()
+    commits = [c for pagina in backend.iterar_historial_commits() for c in pagina]
+
+    repo = reporte_issues.REPO
+    reporte_issues.REPO = "demo/repo"
+    try:
+        graphql = reporte_issues.procesar_reporte(issues, commits, comentarios=comentarios)
+        # REST lista los items por fecha de creación (sort=created&direction=asc)
+        rest = reporte_issues.procesar_reporte(
+            list(reversed(repositorio.issues)), repositorio.commits,
+            comentarios=repositorio._comentarios_por_numero)
+    finally:
+        reporte_issues.REPO = repo
+    assert [f.como_tupla() for f in graphql] == [f.como_tupla() for f in rest]
+    assert any(f["Commits Vinculados"] != "Ninguno" for f in graphql)
+    print("✅ procesar_reporte da las mismas filas con datos de GraphQL y de REST")
+
+
+if __name__ == "__main__":
+    try:
+        test_conversion_a_forma_rest()
+        test_completa_hilos_y_fechas_utc()
+        test_mismo_reporte_que_rest()
+        print("\n🎉 Todas las pruebas del backend GraphQL pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar el modelo compacto de filas del reporte
+"""
+
+import sys
+from datetime import datetime, timezone
+from modelo import COLUMNAS, DatasetReporte, Estado, Fila, Tipo
+
+ISSUE = {
+    "number": 7,
+    "title": "Error al exportar",
+    "body": "  Descripción con espacios  ",
+    "state": "closed",
+    "created_at": "2024-01-01T10:00:00Z",
+    "closed_at": "2024-01-03T12:30:00Z",
+    "assignee": {"login": "ana"},
+    "html_url": "https://github.com/demo/repo/pull/7",
+    "pull_request": {}
+}
+
+
+def test_campos_tipados():
+    fila = Fila.desde_issue(ISSUE, commits="Fix #7", autores="luis")
+    assert fila.tipo is Tipo.PULL_REQUEST
+    assert fila.estado is Estado.CERRADO
+    assert fila.creado == datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+    assert not hasattr(fila, "__dict__")
+    print("✅ Tipo y estado enumerados, fechas interpretadas y sin __dict__")
+
+
+def test_adaptador_de_columnas():
+    fila = Fila.desde_issue(ISSUE, commits="Fix #7", autores="luis")
+    assert fila.como_dict() == {
+        "ID": 7,
+        "Tipo": "Pull Request",
+        "Título": "Error al exportar",
+        "Descripción": "Descripción con espacios",
+        "Estado": "closed",
+        "Asignado a": "ana",
+        "Creado": "2024-01-01T10:00:00Z",
+        "Cerrado": "2024-01-03T12:30:00Z",
+        "Comentarios": "Sin comentarios",
+        "Commits Vinculados": "Fix #7",
+        "Autores Commits": "luis",
+        "Commits de Cierre": "Ninguno",
+        "URL": "https://github.com/demo/repo/pull/7"
+    }
+    abierto = Fila.desde_issue({**ISSUE, "state": "open", "closed_at": None, "assignee": None})
+    assert abierto["Cerrado"] is None
+    assert abierto.get("Asignado a") == "No asignado"
+    assert abierto.get("Inexistente", "-") == "-"
+    print("✅ Columnas del reporte con los mismos textos que antes")
+
+
+def test_dataset_columnar():
+    filas = [Fila.desde_issue(ISSUE), Fila.desde_issue(
+        {**ISSUE, "number": 8, "state": "open", "closed_at": None, "assignee": None})]
+    dataset = DatasetReporte(filas)
+    df = dataset.df
+    assert tuple(df.columns) == COLUMNAS
+    assert df["ID"].tolist() == [7, 8]
+    assert str(df["Creado"].dtype).startswith("datetime64")
+    assert df["Cerrado"].isna().tolist() == [False, True]
+    assert all(df[c].dtype == "category" for c in ("Tipo", "Estado", "Asignado a"))
+    assert DatasetReporte.desde(dataset) is dataset
+    assert list(dataset) == [f.como_dict() for f in filas]
+    print("✅ Dataset con fechas datetime, columnas categóricas y mismos textos")
+
+
+def test_dataset_desde_diccionarios():
+    filas = [Fila.desde_issue(ISSUE), Fila.desde_issue({**ISSUE, "number": 8})]
+    desde_dicts = DatasetReporte([f.como_dict() for f in filas])
+    assert desde_dicts.df.equals(DatasetReporte(filas).df)
+    print("✅ Dataset idéntico desde filas o desde diccionarios")
+
+
+if __name__ == "__main__":
+    try:
+        test_campos_tipados()
+        test_adaptador_de_columnas()
+        test_dataset_columnar()
+        test_dataset_desde_diccionarios()
+        print("\n🎉 Todas las pruebas del modelo pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar el pipeline por etapas con colas acotadas
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import reporte_issues
+from modelo import DatasetReporte, FilasEnDisco
+from pipeline import ejecutar_pipeline
+from servidor_simulado import RepositorioSintetico, ServidorSimulado
+
+
+def test_conserva_orden_y_resultados():
+    resultados = []
+    ejecutar_pipeline(
+        ([i, i + 1] for i in range(0, 20, 2)),
+        [lambda pagina: [x * 10 for x in pagina]],
+        resultados.append,
+        profundidad=2)
+    assert resultados == [x * 10 for x in range(20)]
+    print("✅ Resultados completos y en orden")
+
+
+def test_memoria_acotada_por_profundidad():
+    producidos = []
+    consumidos = []
+    maximo = {"pendientes": 0}
+    liberar = threading.Event()
+
+    def fuente():
+        for i in range(50):
+            producidos.append(i)
+            yield i
+
+    def destino(elemento):
+        liberar.wait(0.01)
+        consumidos.append(elemento)
+        maximo["pendientes"] = max(maximo["pendientes"], len(producidos) - len(consumidos))
+
+    ejecutar_pipeline(fuente(), [lambda x: [x]], destino, profundidad=2)
+    # Como mucho: dos colas llenas más un elemento en cada hilo
+    assert maximo["pendientes"] <= 2 * 2 + 3, maximo
+    assert consumidos == list(range(50))
+    print("✅ Elementos en vuelo limitados por la profundidad de las colas")
+
+
+def test_propaga_error_y_detiene_fuente():
+    producidos = []
+
+    def fuente():
+        for i in range(10000):
+            producidos.append(i)
+            yield i
+
+    def etapa(x):
+        if x == 5:
+            raise ValueError("fallo en la etapa")
+        return [x]
+
+    try:
+        ejecutar_pipeline(fuente(), [etapa], lambda x: None, profundidad=2)
+    except ValueError as e:
+        assert str(e) == "fallo en la etapa"
+    else:
+        raise AssertionError("el error de la etapa no se propagó")
+    assert len(producidos) < 100, len(producidos)
+    print("✅ Un error detiene todas las etapas y se relanza")
+
+
+def test_reportes_en_pipeline_con_filas_en_disco():
+    servidor = ServidorSimulado(RepositorioSintetico("demo/repo", n_issues=230, n_commits=120))
+    url = servidor.iniciar()
+    original = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            os.chdir(directorio)
+            reporte_issues.GITHUB_API_URL = url
+            reporte_issues.CACHE_DIR = directorio
+            reporte_issues.CHECKPOINT = False
+            reporte_issues.configurar_cliente("token-de-prueba", "demo/repo")
+            salida = io.StringIO()
+            with contextlib.redirect_stdout(salida):
+                filas, commits = reporte_issues.generar_reportes_pipeline(max_workers=4)
+            esperadas = reporte_issues.procesar_reporte(
+                reporte_issues.obtener_issues_y_prs(), reporte_issues.obtener_commits())
+            try:
+                assert isinstance(filas, FilasEnDisco) and len(filas) == 230
+                # Los commits vuelven para la tabla de churn de la instantánea
+                assert commits == reporte_issues.obtener_commits()
+                # Dos recorridos dan las mismas filas que el proceso en memoria
+                assert list(filas) == list(filas) == [f.como_dict() for f in esperadas]
+                assert DatasetReporte(filas).df.equals(DatasetReporte(esperadas).df)
+            finally:
+                filas.cerrar()
+            reporte_issues.obtener_cliente().cerrar()
+            os.chdir(original)
+    finally:
+        os.chdir(original)
+        servidor.detener()
+    # Un solo resumen del plan de comentarios para las tres páginas
+    assert salida.getvalue().count("Comentarios:") == 1, salida.getvalue()
+    print("✅ Pipeline de reportes con las filas en disco y un único resumen del plan")
+
+
+def test_pipeline_masivo_usa_el_planificador():
+    repositorio = RepositorioSintetico("demo/repo", n_issues=230, n_commits=20)
+    servidor = ServidorSimulado(repositorio)
+    url = servidor.iniciar()
+    original = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            os.chdir(directorio)
+            reporte_issues.GITHUB_API_URL = url
+            reporte_issues.CACHE_DIR = directorio
+            reporte_issues.CHECKPOINT = False
+            reporte_issues.COMENTARIOS_TIPOS = ("Issue",)
+            reporte_issues.configurar_cliente("token-de-prueba", "demo/repo")
+            salida = io.StringIO()
+            with contextlib.redirect_stdout(salida):
+                filas, _ = reporte_issues.generar_reportes_pipeline(max_workers=4, modo_comentarios="masivo")
+                esperadas = reporte_issues.procesar_reporte(
+                    reporte_issues.obtener_issues_y_prs(), reporte_issues.obtener_commits(),
+                    modo_comentarios="por_issue")
+            try:
+                assert list(filas) == [f.como_dict() for f in esperadas]
+                assert any(f["Comentarios"] != "Sin comentarios" for f in filas)
+                # Los PRs quedan fuera por COMENTARIOS_TIPOS, igual que sin pipeline
+                assert all(f["Comentarios"] == "Sin comentarios" for f in filas if f["Tipo"] == "Pull Request")
+            finally:
+                filas.cerrar()
+            reporte_issues.obtener_cliente().cerrar()
+            os.chdir(original)
+    finally:
+        reporte_issues.COMENTARIOS_TIPOS = reporte_issues.TIPOS_TODOS
+        os.chdir(original)
+        servidor.detener()
+    # Resumen del pipeline y de procesar_reporte; la descarga en bloque se hizo una vez
+    assert salida.getvalue().count("Comentarios:") == 2, salida.getvalue()
+    paginas_masivas = -(-len(repositorio.comentarios) // 100)
+    assert servidor.estadisticas()["por_ruta"]["/repos/demo/repo/issues/comments"] == paginas_masivas
+    print("✅ Pipeline en modo masivo con COMENTARIOS_TIPOS y el planificador")
+
+
+if __name__ == "__main__":
+    try:
+        test_conserva_orden_y_resultados()
+        test_memoria_acotada_por_profundidad()
+        test_propaga_error_y_detiene_fuente()
+        test_reportes_en_pipeline_con_filas_en_disco()
+        test_pipeline_masivo_usa_el_planificador()
+        print("\n🎉 Todas las pruebas del pipeline pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
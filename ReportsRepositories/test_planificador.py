@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar el planificador de peticiones de comentarios
+"""
+
+import sys
+from datetime import datetime
+from planificador import planificar_comentarios
+
+
+def crear_issues():
+    """Items de prueba con distintos conteos de comentarios"""
+    return [
+        {"number": 1, "comments": 0, "updated_at": "2024-01-01T00:00:00Z"},
+        {"number": 2, "comments": 3, "updated_at": "2024-01-01T00:00:00Z"},
+        {"number": 3, "comments": 1, "updated_at": "2024-03-01T00:00:00Z"},
+        {"number": 4, "comments": 2, "updated_at": "2024-01-01T00:00:00Z",
+         "pull_request": {}},
+    ]
+
+
+def test_omite_items_sin_comentarios():
+    plan = planificar_comentarios(crear_issues())
+    assert plan.descargar == [2, 3, 4]
+    assert plan.resueltos == {1: ""}
+    assert plan.omitidos['sin_comentarios'] == 1
+    print("✅ Items sin comentarios omitidos")
+
+
+def test_reutiliza_items_sin_cambios():
+    previos = {2: "- user1: hola", 3: "- user2: viejo"}
+    plan = planificar_comentarios(
+        crear_issues(), ultima_ejecucion="2024-02-01T00:00:00Z",
+        comentarios_previos=previos)
+    # El 3 se actualizó después del corte y el 4 no estaba en caché
+    assert plan.descargar == [3, 4]
+    assert plan.resueltos[2] == "- user1: hola"
+    assert plan.omitidos['sin_cambios'] == 1
+    assert plan.total_omitidos == 2
+    print("✅ Items sin cambios reutilizados")
+
+
+def test_corte_como_datetime_o_con_desfase():
+    previos = {2: "- user1: hola", 3: "- user2: viejo"}
+    # El mismo instante: datetime sin zona (UTC), texto con desfase y texto en UTC
+    for corte in (datetime(2024, 2, 1), "2024-02-01T02:00:00+02:00", "2024-02-01T00:00:00Z"):
+        plan = planificar_comentarios(crear_issues(), corte, previos)
+        assert plan.descargar == [3, 4], corte
+    print("✅ Fecha de corte interpretada con modelo.parsear_fecha")
+
+
+def test_filtra_por_tipo():
+    plan = planificar_comentarios(crear_issues(), tipos=("Issue",))
+    assert plan.descargar == [2, 3]
+    assert plan.omitidos['tipo_excluido'] == 1
+    print("✅ Filtro por tipo aplicado")
+
+
+if __name__ == "__main__":
+    try:
+        test_omite_items_sin_comentarios()
+        test_reutiliza_items_sin_cambios()
+        test_corte_como_datetime_o_con_desfase()
+        test_filtra_por_tipo()
+        print("\n🎉 Todas las pruebas del planificador pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
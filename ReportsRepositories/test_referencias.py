@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar la extracción de referencias a issues en commits
+"""
+
+import sys
+from referencias import CIERRA, MENCIONA, OTRO_REPO, extraer_referencias, indexar_referencias
+
+
+def commit(mensaje, autor="dev"):
+    return {"commit": {"message": mensaje, "author": {"name": autor}}}
+
+
+def test_formatos_reconocidos():
+    referencias = extraer_referencias(
+        "Fixes #12, ver GH-7 y https://github.com/demo/repo/issues/30\n"
+        "Closes: otro/proyecto#4, resolved demo/repo#5", "demo/repo")
+    assert referencias == {
+        "12": CIERRA,
+        "7": MENCIONA,
+        "30": MENCIONA,
+        "otro/proyecto#4": OTRO_REPO,
+        "5": CIERRA
+    }, referencias
+    print("✅ #N, GH-N, URLs y usuario/repo#N reconocidos y clasificados")
+
+
+def test_limites_de_numero():
+    referencias = extraer_referencias("#123 #12a #0012 a#7 ##8 (#9).", "demo/repo")
+    assert referencias == {"123": MENCIONA, "0012": MENCIONA, "7": MENCIONA,
+                           "8": MENCIONA, "9": MENCIONA}, referencias
+    assert "12" not in referencias
+    print("✅ #12 no coincide dentro de #123 ni de #12a")
+
+
+def test_palabra_clave_solo_afecta_a_la_siguiente():
+    referencias = extraer_referencias("fixes #1, #2 and prefix #3 unfixed #4", "demo/repo")
+    assert referencias == {"1": CIERRA, "2": MENCIONA, "3": MENCIONA, "4": MENCIONA}, referencias
+    print("✅ La palabra clave solo cierra la referencia que le sigue")
+
+
+def test_indice_en_una_pasada():
+    indice = indexar_referencias([
+        commit("Mención de #5 y luego fixes #5", "ana"),
+        commit("Refactor relacionado con #5", "luis"),
+        commit("Sin referencias"),
+    ], "demo/repo")
+    assert indice == {"5": [
+        ("Mención de #5 y luego fixes #5", "ana", CIERRA),
+        ("Refactor relacionado con #5", "luis", MENCIONA)
+    ]}, indice
+    print("✅ Un commit aparece una vez por issue y el cierre prevalece")
+
+
+if __name__ == "__main__":
+    try:
+        test_formatos_reconocidos()
+        test_limites_de_numero()
+        test_palabra_clave_solo_afecta_a_la_siguiente()
+        test_indice_en_una_pasada()
+        print("\n🎉 Todas las pruebas de referencias pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar el PDF generado directamente desde las filas
+"""
+
+import os
+import sys
+import tempfile
+from modelo import DatasetReporte, Fila
+
+try:
+    from reporte_pdf import RenderizadorPDF, UNION_DISPONIBLE, marcado
+    PDF_DISPONIBLE = True
+except ImportError:
+    PDF_DISPONIBLE = False
+
+
+def issue(numero, estado, pr=False, **cambios):
+    datos = {
+        "number": numero,
+        "title": f"Item {numero}",
+        "body": "Detalle",
+        "state": estado,
+        "created_at": "2024-01-01T10:00:00Z",
+        "closed_at": "2024-01-02T10:00:00Z" if estado == "closed" else None,
+        "html_url": f"https://github.com/demo/repo/issues/{numero}",
+        **cambios
+    }
+    if pr:
+        datos["pull_request"] = {}
+    return datos
+
+
+FILAS = [
+    Fila.desde_issue(issue(1, "open", title="Falla <script> & ✅")),
+    Fila.desde_issue(issue(2, "closed", pr=True), comentarios="- ana: ver https://example.com/a?b=1&c=2"),
+    Fila.desde_issue(issue(3, "open", pr=True)),
+    Fila.desde_issue(issue(4, "closed")),
+    Fila.desde_issue(issue(5, "open")),
+]
+
+
+def test_marcado():
+    assert marcado("a < b & c ✅") == "a &lt; b &amp; c (Correcto)"
+    assert marcado("ver https://x.org/?a=1&b=2.") == (
+        'ver <link href="https://x.org/?a=1&amp;b=2.">https://x.org/?a=1&amp;b=2.</link>')
+    assert marcado(None) == "N/A"
+    print("✅ Textos escapados para ReportLab con las URL como enlaces")
+
+
+def test_pdf_desde_filas():
+    with tempfile.TemporaryDirectory() as directorio:
+        rutas = [os.path.join(directorio, f"reporte_{n}.pdf") for n in range(2)]
+        renderizador = RenderizadorPDF("demo/repo")
+        # Un iterador de Fila y el dataset tipado dan el mismo conteo
+        conteos = [renderizador.generar(rutas[0], iter(FILAS), {"issues_abiertos": 2}),
+                   renderizador.generar(rutas[1], DatasetReporte(FILAS))]
+        for ruta in rutas:
+            with open(ruta, "rb") as archivo:
+                assert archivo.read(5) == b"%PDF-"
+    esperado = {"issue_open": 2, "issue_closed": 1, "pr_open": 1, "pr_closed": 1}
+    assert conteos == [esperado, esperado]
+    print("✅ PDF generado en una pasada con las filas repartidas por sección")
+
+
+def esquema(lector):
+    return [(e.title, lector.get_destination_page_number(e)) if not isinstance(e, list)
+            else [(h.title, lector.get_destination_page_number(h)) for h in e]
+            for e in lector.outline]
+
+
+def test_pdf_en_paralelo():
+    from pypdf import PdfReader
+    with tempfile.TemporaryDirectory() as directorio:
+        secuencial = os.path.join(directorio, "secuencial.pdf")
+        paralelo = os.path.join(directorio, "paralelo.pdf")
+        renderizador = RenderizadorPDF("demo/repo")
+        renderizador.generar(secuencial, FILAS)
+        # Tramos de un item: la sección de issues abiertos ocupa dos partes
+        conteo = renderizador.generar_en_paralelo(paralelo, FILAS, procesos=2, items_por_parte=1)
+        lectores = [PdfReader(secuencial), PdfReader(paralelo)]
+        paginas = [pagina.extract_text() for pagina in lectores[1].pages]
+        esquemas = [esquema(lector) for lector in lectores]
+    assert conteo["issue_open"] == 2
+    assert all(f"Página {n}" in texto for n, texto in enumerate(paginas, start=1))
+    assert [e[0] for e in esquemas[1] if isinstance(e, tuple)] == [
+        e[0] for e in esquemas[0] if isinstance(e, tuple)]
+    items = [h for e in esquemas[1] if isinstance(e, list) for h in e]
+    assert [titulo for titulo, _ in items] == [
+        "Issue #1: Falla <script> & ✅", "Issue #5: Item 5", "Issue #4: Item 4",
+        "Pull Request #3: Item 3", "Pull Request #2: Item 2"]
+    # Cada item apunta a la página donde aparece su título
+    assert all(f"#{titulo.split('#')[1].split(':')[0]}" in paginas[pagina] for titulo, pagina in items)
+    print("✅ Partes renderizadas en varios procesos y unidas con numeración y esquema continuos")
+
+
+if __name__ == "__main__":
+    if not PDF_DISPONIBLE:
+        print("⚠️ ReportLab no está instalado: se omiten las pruebas del PDF")
+        sys.exit(0)
+    try:
+        test_marcado()
+        test_pdf_desde_filas()
+        if UNION_DISPONIBLE:
+            test_pdf_en_paralelo()
+        else:
+            print("⚠️ pypdf no está instalado: se omite la prueba del PDF en paralelo")
+        print("\n🎉 Todas las pruebas del PDF pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
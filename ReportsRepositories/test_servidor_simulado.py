@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar la descarga contra la API simulada (sin red)
+"""
+
+import os
+import sys
+import tempfile
+import requests
+import reporte_issues
+from servidor_simulado import Grabacion, RepositorioSintetico, ServidorSimulado
+
+
+def configurar_contra(url, directorio_cache):
+    reporte_issues.GITHUB_API_URL = url
+    reporte_issues.CACHE_DIR = directorio_cache
+    reporte_issues.CHECKPOINT = False
+    reporte_issues.configurar_cliente("token-de-prueba", "demo/repo")
+
+
+def test_reporte_completo_y_revalidacion():
+    repositorio = RepositorioSintetico("demo/repo", n_issues=230, n_commits=310)
+    servidor = ServidorSimulado(repositorio)
+    url = servidor.iniciar()
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            configurar_contra(url, directorio)
+            issues = reporte_issues.obtener_issues_y_prs()
+            commits = reporte_issues.obtener_commits()
+            filas = reporte_issues.procesar_reporte(issues, commits)
+            assert len(filas) == 230
+            assert len(commits) == 310
+            esperados = sum(1 for i in repositorio.issues if i["comments"])
+            con_comentarios = sum(1 for f in filas if f["Comentarios"] != "Sin comentarios")
+            assert con_comentarios == esperados
+
+            primera = servidor.estadisticas()
+            # 3 páginas de issues + 4 de commits + un hilo por item con comentarios
+            assert primera["por_estado"] == {"200": 3 + 4 + esperados}, primera
+
+            # Segunda ejecución: todo se revalida con ETag y no gasta cuota
+            reporte_issues.procesar_reporte(
+                reporte_issues.obtener_issues_y_prs(), reporte_issues.obtener_commits())
+            segunda = servidor.estadisticas()
+            assert segunda["por_estado"]["304"] == primera["peticiones"], segunda
+            reporte_issues.obtener_cliente().cerrar()
+    finally:
+        servidor.detener()
+    print("✅ Reporte completo contra la API simulada y revalidación con ETag")
+
+
+def test_cabeceras_de_paginacion_y_limite():
+    servidor = ServidorSimulado(RepositorioSintetico("demo/repo", n_issues=50), limite=3)
+    url = servidor.iniciar()
+    try:
+        r = requests.get(f"{url}/repos/demo/repo/issues",
+                         params={"state": "all", "per_page": 20, "page": 2})
+        assert r.status_code == 200
+        assert set(r.links) == {"prev", "next", "first", "last"}
+        assert r.links["last"]["url"].endswith("page=3")
+        assert r.headers["X-RateLimit-Remaining"] == "2"
+
+        requests.get(f"{url}/repos/demo/repo/commits")
+        requests.get(f"{url}/repos/demo/repo/commits")
+        agotada = requests.get(f"{url}/repos/demo/repo/commits")
+        assert agotada.status_code == 403
+        assert agotada.headers["X-RateLimit-Remaining"] == "0"
+        assert "rate limit" in agotada.text
+    finally:
+        servidor.detener()
+    print("✅ Cabeceras Link y límite de peticiones como en GitHub")
+
+
+def test_grabar_y_reproducir():
+    original = ServidorSimulado(RepositorioSintetico("demo/repo", n_issues=45))
+    url_original = original.iniciar()
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "grabacion.json")
+        grabador = ServidorSimulado(Grabacion(ruta, upstream=url_original))
+        url_grabador = grabador.iniciar()
+        params = {"state": "all", "per_page": 20}
+        grabadas = requests.get(f"{url_grabador}/repos/demo/repo/issues", params=params)
+        for pagina in (2, 3):
+            requests.get(f"{url_grabador}/repos/demo/repo/issues", params={**params, "page": pagina})
+        grabador.detener()
+        original.detener()
+
+        reproductor = ServidorSimulado(Grabacion(ruta))
+        url_reproductor = reproductor.iniciar()
+        try:
+            reproducidas = requests.get(f"{url_reproductor}/repos/demo/repo/issues", params=params)
+            assert reproducidas.json() == grabadas.json()
+            assert reproducidas.links["last"]["url"].startswith(url_reproductor)
+            faltante = requests.get(f"{url_reproductor}/repos/demo/repo/commits")
+            assert faltante.status_code == 404
+        finally:
+            reproductor.detener()
+    print("✅ Respuestas grabadas reproducidas sin acceso a la API original")
+
+
+if __name__ == "__main__":
+    try:
+        test_reporte_completo_y_revalidacion()
+        test_cabeceras_de_paginacion_y_limite()
+        test_grabar_y_reproducir()
+        print("\n🎉 Todas las pruebas de la API simulada pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar el estado de la sincronización incremental
+"""
+
+import sys
+import tempfile
+from sincronizacion import EstadoSincronizacion
+
+
+def issue(numero, actualizado, titulo="Original"):
+    return {"number": numero, "title": titulo, "created_at": f"2024-01-0{numero}T00:00:00Z",
+            "updated_at": actualizado}
+
+
+def commit(sha, fecha, mensaje="Cambio"):
+    return {"sha": sha, "commit": {"message": mensaje, "author": {"date": fecha}}}
+
+
+def comentario(id_, creado, cuerpo="Hola"):
+    return {"id": id_, "body": cuerpo, "created_at": creado, "updated_at": creado}
+
+
+def test_fusiona_cambios_y_guarda():
+    with tempfile.TemporaryDirectory() as directorio:
+        estado = EstadoSincronizacion.cargar(directorio, "demo/repo")
+        estado.fusionar_issues([issue(1, "2024-02-01T00:00:00Z"), issue(2, "2024-02-02T00:00:00Z")])
+        estado.fusionar_commits([commit("b", "2024-02-02T00:00:00Z"), commit("a", "2024-02-01T00:00:00Z")])
+        estado.fusionar_comentarios({1: [comentario(10, "2024-02-01T00:00:00Z"),
+                                         comentario(11, "2024-02-03T00:00:00Z")]})
+        estado.guardar()
+
+        # Segunda ejecución: llegan solo los cambios
+        estado = EstadoSincronizacion.cargar(directorio, "demo/repo")
+        estado.fusionar_issues([issue(1, "2024-03-01T00:00:00Z", "Editado"), issue(3, "2024-03-02T00:00:00Z")])
+        estado.fusionar_commits([commit("c", "2024-03-01T00:00:00Z"), commit("a", "2024-02-01T00:00:00Z", "Reescrito")])
+        estado.fusionar_comentarios({1: [comentario(11, "2024-02-03T00:00:00Z", "Editado"),
+                                         comentario(12, "2024-01-15T00:00:00Z")],
+                                     3: [comentario(30, "2024-03-02T00:00:00Z")]})
+        estado.guardar()
+        estado = EstadoSincronizacion.cargar(directorio, "demo/repo")
+
+    assert [i["number"] for i in estado.issues_ordenados()] == [1, 2, 3]
+    assert estado.issues[1]["title"] == "Editado"
+    # Los commits nuevos van delante y un sha repetido se reemplaza
+    assert [c["sha"] for c in estado.commits] == ["c", "a", "b"]
+    assert estado.commits[1]["commit"]["message"] == "Reescrito"
+    # Hilos fusionados por id y ordenados por fecha de creación
+    assert [(c["id"], c["body"]) for c in estado.comentarios[1]] == [
+        (12, "Hola"), (10, "Hola"), (11, "Editado")]
+    assert list(estado.comentarios) == [1, 3]
+    assert estado.marcas == {"issues": "2024-03-02T00:00:00Z", "commits": "2024-03-01T00:00:00Z",
+                             "comentarios": "2024-03-02T00:00:00Z"}
+    print("✅ Issues, commits y comentarios fusionados y recuperados del disco")
+
+
+def test_marca_compara_instantes():
+    with tempfile.TemporaryDirectory() as directorio:
+        estado = EstadoSincronizacion(directorio, "demo/repo")
+        # 12:00+02:00 son las 10:00 UTC: como texto parecería posterior
+        estado.fusionar_commits([commit("a", "2024-01-01T12:00:00+02:00"),
+                                 commit("b", "2024-01-01T10:30:00Z")])
+        assert estado.marcas["commits"] == "2024-01-01T10:30:00Z", estado.marcas
+        # Con fracciones de segundo: "." va antes que "Z" como texto
+        estado.fusionar_commits([commit("c", "2024-01-01T10:30:00.500Z")])
+        assert estado.marcas["commits"] == "2024-01-01T10:30:00.500Z", estado.marcas
+        # Una fecha anterior no hace retroceder la marca
+        estado.fusionar_issues([issue(1, "2024-05-01T00:00:00Z")])
+        estado.fusionar_issues([issue(2, "2024-04-01T00:00:00+00:00"), issue(3, None)])
+        assert estado.marcas["issues"] == "2024-05-01T00:00:00Z", estado.marcas
+        # Sin fechas la marca no cambia
+        estado.fusionar_comentarios({})
+        assert estado.marcas["comentarios"] is None
+    print("✅ Marcas de agua avanzadas comparando instantes, no textos")
+
+
+if __name__ == "__main__":
+    try:
+        test_fusiona_cambios_y_guarda()
+        test_marca_compara_instantes()
+        print("\n🎉 Todas las pruebas de la sincronización incremental pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script para verificar las instantáneas Parquet del reporte procesado
+"""
+
+import sys
+import tempfile
+import pytest
+import reporte_issues
+from analytics import GitHubAnalytics, PARQUET_DISPONIBLE
+from modelo import DatasetReporte, Fila
+
+
+def issue(numero, estado, cerrado=None, pr=False):
+    datos = {
+        "number": numero,
+        "title": f"Item {numero}",
+        "body": "Detalle",
+        "state": estado,
+        "created_at": f"2024-0{1 + numero % 3}-01T10:00:00Z",
+        "closed_at": cerrado,
+        "assignee": {"login": "ana"} if numero % 2 else None,
+        "html_url": f"https://github.com/demo/repo/issues/{numero}"
+    }
+    if pr:
+        datos["pull_request"] = {}
+    return datos
+
+
+FILAS = [
+    Fila.desde_issue(issue(1, "closed", "2024-02-10T10:00:00Z"), autores="luis, eva"),
+    Fila.desde_issue(issue(2, "open"), comentarios="- ana: hola"),
+    Fila.desde_issue(issue(3, "closed", "2024-01-05T10:00:00Z", pr=True), autores="luis"),
+]
+
+COMMITS = [{
+    "sha": "abc",
+    "commit": {"message": "Fixes #1", "author": {"name": "luis", "date": "2024-02-09T10:00:00Z"}},
+    "stats": {"additions": 5, "deletions": 2, "total": 7}
+}]
+
+
+def test_guardar_y_cargar():
+    original = GitHubAnalytics(DatasetReporte(FILAS), commits=COMMITS, repo="demo/repo")
+    with tempfile.TemporaryDirectory() as directorio:
+        original.save_snapshot(directorio)
+        cargado = GitHubAnalytics.load_snapshot(directorio)
+
+    assert list(cargado.df.columns) == list(original.df.columns)
+    for columna in original.df.columns:
+        assert cargado.df[columna].equals(original.df[columna]), columna
+    assert cargado.df['Autores_Lista'].iloc[0] == ["luis", "eva"]
+    assert cargado.df_commits['Issues'].iloc[0] == [1]
+    assert cargado.obtener_estadisticas_resumen() == original.obtener_estadisticas_resumen()
+    filtrados = cargado.filter_data(None, {'author': 'eva', 'state': 'closed'})
+    assert [f['ID'] for f in filtrados] == [1]
+    print("✅ DataFrames preparados idénticos tras guardar y cargar, sin prepare_data")
+
+
+def test_dataset_desde_instantanea():
+    # MonkeyPatch devuelve CACHE_DIR a su valor al salir, también al ejecutar el script
+    with tempfile.TemporaryDirectory() as directorio, pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(reporte_issues, "CACHE_DIR", directorio)
+        assert reporte_issues.cargar_snapshot("demo/repo") is None
+        reporte_issues.guardar_snapshot(DatasetReporte(FILAS), COMMITS, "demo/repo")
+        dataset, analytics = reporte_issues.cargar_snapshot("demo/repo")
+    assert list(dataset) == [f.como_dict() for f in FILAS]
+    assert not analytics.df_commits.empty
+    print("✅ Reporte y analytics reabiertos desde la última instantánea del repositorio")
+
+
+if __name__ == "__main__":
+    if not PARQUET_DISPONIBLE:
+        print("⚠️ pyarrow no está instalado: se omiten las pruebas de instantáneas")
+        sys.exit(0)
+    try:
+        test_guardar_y_cargar()
+        test_dataset_desde_instantanea()
+        print("\n🎉 Todas las pruebas de instantáneas pasaron")
+    except AssertionError as e:
+        print(f"❌ Prueba fallida: {e}")
+        sys.exit(1)